@@ -5,20 +5,155 @@ Tests all endpoints mentioned in the review request with comprehensive error han
 """
 
 import requests
+import requests.adapters
+import urllib3
+import urllib3.connection
 import json
 import time
 import websocket
 import threading
-from typing import Dict, Any, Optional
+import argparse
+import asyncio
+import atexit
+import base64
+import collections
+import csv
+import datetime
+import gzip
+import hashlib
+import hmac
+import http.cookiejar
+import io
+import math
+import multiprocessing
+import os
+import random
+import re
+import shlex
+import signal
+import ssl
+import string
+import struct
+import subprocess
+import urllib.parse
+from array import array
+from queue import Empty
+from typing import Dict, Any, Optional, List
 import sys
 
+try:
+    import aiohttp
+except ImportError:  # only needed for the load-generation modes
+    aiohttp = None
+
+try:
+    import yaml
+except ImportError:  # scenario files can also be JSON
+    yaml = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # only needed for --records *.parquet
+    pyarrow = None
+
+try:
+    import ijson
+except ImportError:  # optional (pip install ijson): --list-bench and item counts of large list responses
+    ijson = None
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def count_json_items(content: bytes, prefix: str) -> tuple:
+    """(top-level scalar fields, item count of the array at `prefix` or None) without decoding the array; needs ijson"""
+    fields, count = {}, None
+    item = f"{prefix}.item"
+    try:
+        for path, event, value in ijson.parse(io.BytesIO(content)):
+            if path == prefix and event == "start_array":
+                count = 0
+            elif path == item and event in ("start_map", "start_array", "string", "number", "boolean", "null"):
+                count += 1
+            elif path and "." not in path and event in ("string", "number", "boolean", "null"):
+                fields[path] = value
+    except ijson.JSONError:
+        return {}, None
+    return fields, count
+
+
+CONNECT_TRACE = threading.local()  # .events: connect list of the TracedHTTPAdapter sending on this thread
+
+
+class TracedConnectionMixin:
+    """Times new sockets and appends (connect seconds, TLS seconds or None) to the sending adapter's events"""
+    def _new_conn(self):
+        start = time.perf_counter()
+        sock = super()._new_conn()
+        self.tcp_seconds = time.perf_counter() - start
+        return sock
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        elapsed = time.perf_counter() - start
+        events = getattr(CONNECT_TRACE, "events", None)
+        if events is not None:
+            tls = isinstance(self, urllib3.connection.HTTPSConnection)
+            events.append((elapsed, elapsed - getattr(self, "tcp_seconds", elapsed) if tls else None))
+
+
+class TracedHTTPConnection(TracedConnectionMixin, urllib3.connection.HTTPConnection):
+    pass
+
+
+class TracedHTTPSConnection(TracedConnectionMixin, urllib3.connection.HTTPSConnection):
+    pass
+
+
+class TracedHTTPConnectionPool(urllib3.HTTPConnectionPool):
+    ConnectionCls = TracedHTTPConnection
+
+
+class TracedHTTPSConnectionPool(urllib3.HTTPSConnectionPool):
+    ConnectionCls = TracedHTTPSConnection
+
+
+class TracedHTTPAdapter(requests.adapters.HTTPAdapter):
+    """HTTPAdapter for the synchronous tester: its pools open traced connections that fill `connect_events`"""
+    def __init__(self, *args, **kwargs):
+        self.connect_events = []
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TracedHTTPConnectionPool,
+                                                   "https": TracedHTTPSConnectionPool}
+
+    def send(self, request, **kwargs):
+        CONNECT_TRACE.events = self.connect_events
+        try:
+            return super().send(request, **kwargs)
+        finally:
+            CONNECT_TRACE.events = None
+
+
 class BackendTester:
-    def __init__(self, base_url: str = "http://localhost:3000"):
+    def __init__(self, base_url: str = "http://localhost:3000", keep_alive: bool = True):
         self.base_url = base_url
         self.api_base = f"{base_url}/api"
         self.session = requests.Session()
+        self.session.headers.update(JSON_HEADERS)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+        adapter = TracedHTTPAdapter()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.connect_events = adapter.connect_events  # one entry per socket opened
         self.test_results = []
         self.websocket_messages = []
+        self.metrics = RequestMetrics()
+        self.authenticated = False  # admin checks stop accepting 401/403 once a session is attached
         
     def log_result(self, test_name: str, success: bool, message: str, response_data: Any = None):
         """Log test result"""
@@ -28,17 +163,15 @@ class BackendTester:
         self.test_results.append({
             "test": test_name,
             "success": success,
-            "message": message,
-            "response_data": response_data
+            "message": message
         })
     
     def make_request(self, method: str, endpoint: str, data: Dict = None, headers: Dict = None) -> tuple:
         """Make HTTP request and return (success, response, error_message)"""
+        start = time.perf_counter()
         try:
             url = f"{self.api_base}{endpoint}"
-            
-            if headers is None:
-                headers = {"Content-Type": "application/json"}
+            opened = len(self.connect_events)
             
             if method.upper() == "GET":
                 response = self.session.get(url, headers=headers)
@@ -51,13 +184,30 @@ class BackendTester:
             else:
                 return False, None, f"Unsupported method: {method}"
             
+            # requests reads the body eagerly, so `elapsed` (send -> headers parsed) is the time to first byte
+            self.metrics.record(method, endpoint, response.status_code, time.perf_counter() - start,
+                                response.elapsed.total_seconds(), len(response.content))
+            self.metrics.record_connection(method, endpoint, self.connection_trace(opened))
             return True, response, None
             
         except requests.exceptions.ConnectionError:
+            self.metrics.record(method, endpoint, 0, time.perf_counter() - start, 0, 0)
             return False, None, "Connection failed - server may not be running"
         except Exception as e:
+            self.metrics.record(method, endpoint, 0, time.perf_counter() - start, 0, 0)
             return False, None, f"Request error: {str(e)}"
     
+    def connection_trace(self, opened: int) -> Dict:
+        """Connection trace of the last request, given how many sockets had been opened before it"""
+        new = self.connect_events[opened:]
+        del self.connect_events[:]
+        if not new:
+            return {"reused": True}
+        trace = {"reused": False, "connect": sum(connect for connect, _ in new)}
+        if new[-1][1] is not None:
+            trace["tls"] = sum(tls for _, tls in new)
+        return trace
+    
     def test_server_health(self):
         """Test basic server health"""
         success, response, error = self.make_request("GET", "/chat/unread-count")
@@ -199,15 +349,20 @@ class BackendTester:
             return
             
         if response.status_code == 200:
-            data = response.json()
-            if data.get("success") and "conversations" in data:
-                count = len(data.get("conversations", []))
+            if ijson is not None:
+                fields, count = count_json_items(response.content, "conversations")
+                valid = fields.get("success") and count is not None
+            else:
+                data = response.json()
+                valid = data.get("success") and "conversations" in data
+                count = len(data.get("conversations", [])) if valid else None
+            if valid:
                 self.log_result("Chat Admin Conversations", True, f"Retrieved {count} conversations")
             else:
-                self.log_result("Chat Admin Conversations", False, f"Invalid response structure: {data}")
-        elif response.status_code == 401:
+                self.log_result("Chat Admin Conversations", False, f"Invalid response structure: {response.text[:200]}")
+        elif response.status_code == 401 and not self.authenticated:
             self.log_result("Chat Admin Conversations", True, "Correctly requires authentication")
-        elif response.status_code == 403:
+        elif response.status_code == 403 and not self.authenticated:
             self.log_result("Chat Admin Conversations", True, "Correctly requires admin role")
         else:
             self.log_result("Chat Admin Conversations", False, f"HTTP {response.status_code}: {response.text}")
@@ -235,7 +390,7 @@ class BackendTester:
                 self.log_result("Chat Admin Update Status", True, "Status updated successfully")
             else:
                 self.log_result("Chat Admin Update Status", False, f"Invalid response structure: {data}")
-        elif response.status_code in [401, 403]:
+        elif response.status_code in [401, 403] and not self.authenticated:
             self.log_result("Chat Admin Update Status", True, "Correctly requires admin authentication")
         else:
             self.log_result("Chat Admin Update Status", False, f"HTTP {response.status_code}: {response.text}")
@@ -258,11 +413,41 @@ class BackendTester:
                 self.log_result("Chat Admin Archive", True, "Conversation archived successfully")
             else:
                 self.log_result("Chat Admin Archive", False, f"Invalid response structure: {data}")
-        elif response.status_code in [401, 403]:
+        elif response.status_code in [401, 403] and not self.authenticated:
             self.log_result("Chat Admin Archive", True, "Correctly requires admin authentication")
         else:
             self.log_result("Chat Admin Archive", False, f"HTTP {response.status_code}: {response.text}")
     
+    def test_admin_dashboard(self):
+        """Test admin dashboard endpoint"""
+        success, response, error = self.make_request("GET", "/admin/dashboard")
+        
+        if not success:
+            self.log_result("Admin Dashboard", False, error)
+            return
+            
+        if response.status_code == 200:
+            self.log_result("Admin Dashboard", True, "Dashboard loaded")
+        elif response.status_code in [401, 403] and not self.authenticated:
+            self.log_result("Admin Dashboard", True, "Correctly requires admin authentication")
+        else:
+            self.log_result("Admin Dashboard", False, f"HTTP {response.status_code}: {response.text}")
+    
+    def test_analytics(self):
+        """Test analytics endpoint used by the admin dashboard"""
+        success, response, error = self.make_request("GET", "/analytics")
+        
+        if not success:
+            self.log_result("Analytics", False, error)
+            return
+            
+        if response.status_code == 200:
+            self.log_result("Analytics", True, "Analytics loaded")
+        elif response.status_code in [401, 403] and not self.authenticated:
+            self.log_result("Analytics", True, "Correctly requires authentication")
+        else:
+            self.log_result("Analytics", False, f"HTTP {response.status_code}: {response.text}")
+    
     def test_booking_lookup_find_real(self, confirmation_code: str, email: str):
         """Test finding reservation with real booking data"""
         test_data = {
@@ -399,7 +584,7 @@ class BackendTester:
     def test_websocket_connection(self):
         """Test WebSocket connection for real-time messaging"""
         try:
-            ws_url = f"ws://localhost:3000/ws/chat?userId=test123&isAdmin=false"
+            ws_url = self.base_url.replace("http", "ws", 1) + "/ws/chat?userId=test123&isAdmin=false"
             
             def on_message(ws, message):
                 self.websocket_messages.append(json.loads(message))
@@ -576,6 +761,11 @@ class BackendTester:
         print(f"❌ Failed: {failed_tests}")
         print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
         
+        if self.metrics.endpoints:
+            print(f"\n⏱️ Latency by route:")
+            print_latency_table(self.metrics)
+            print_connection_table(self.metrics)
+        
         if failed_tests > 0:
             print(f"\n❌ Failed Tests:")
             for result in self.test_results:
@@ -587,16 +777,5264 @@ class BackendTester:
         # Return success status
         return failed_tests == 0
 
-def main():
-    """Main function to run tests"""
-    tester = BackendTester()
+
+MULTIPROCESS_FLUSH_INTERVAL = 1.0  # seconds between metric snapshots sent by load worker processes
+
+ROUTE_TEMPLATES = [
+    (re.compile(r"^/bookings/calendar/\d+/\d+$"), "/bookings/calendar/:year/:month"),
+    (re.compile(r"^/bookings/confirmation/[^/]+$"), "/bookings/confirmation/:code"),
+    (re.compile(r"^/reviews/check/\d+$"), "/reviews/check/:bookingId"),
+]
+
+
+def route_template(endpoint: str) -> str:
+    """Collapse a concrete API path into its Express route, e.g. /chat/conversation/42 -> /chat/conversation/:id"""
+    path = endpoint.split("?", 1)[0]
+    for pattern, template in ROUTE_TEMPLATES:
+        if pattern.match(path):
+            return template
+    return re.sub(r"/\d+(?=/|$)", "/:id", path)
+
+
+class Histogram:
+    """HDR-style log-linear histogram of non-negative integers.
+
+    Counts live in a fixed array: values below 2 * SUB_BUCKETS are exact, above that
+    every power of two is split into SUB_BUCKETS linear buckets, so any recorded value
+    is reported within 1/SUB_BUCKETS (about 3%) of its true value.
+    """
+    SUB_BUCKET_BITS = 5
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    MAX_BITS = 40  # microseconds up to ~12 days, bytes up to 1 TiB
+
+    def __init__(self):
+        size = (self.MAX_BITS - self.SUB_BUCKET_BITS + 1) * self.SUB_BUCKETS
+        self.counts = array("Q", bytes(8 * size))
+        self.total = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        shift = value.bit_length() - self.SUB_BUCKET_BITS - 1
+        if shift <= 0:
+            return value
+        return shift * self.SUB_BUCKETS + (value >> shift)
+
+    def _upper_bound(self, index: int) -> int:
+        if index < 2 * self.SUB_BUCKETS:
+            return index
+        shift = index // self.SUB_BUCKETS - 1
+        top = index - shift * self.SUB_BUCKETS
+        return ((top + 1) << shift) - 1
+
+    def record(self, value: int):
+        value = min(max(int(value), 0), (1 << self.MAX_BITS) - 1)
+        self.counts[self._index(value)] += 1
+        self.total += 1
+        if value > self.max:
+            self.max = value
+
+    def to_sparse(self) -> tuple:
+        """Compact (max, indexes, counts) form holding only the non-empty buckets"""
+        indexes = array("I", (i for i, count in enumerate(self.counts) if count))
+        return self.max, indexes.tobytes(), array("Q", (self.counts[i] for i in indexes)).tobytes()
+
+    def merge_sparse(self, sparse: tuple):
+        maximum, indexes, counts = sparse
+        for index, count in zip(array("I", indexes), array("Q", counts)):
+            self.counts[index] += count
+            self.total += count
+        self.max = max(self.max, maximum)
+
+    def percentile(self, percent: float) -> int:
+        """Smallest bucket bound that covers `percent` of the recorded values"""
+        if self.total == 0:
+            return 0
+        target = max(1, math.ceil(self.total * percent / 100.0))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                seen += count
+                if seen >= target:
+                    return min(self._upper_bound(index), self.max)
+        return self.max
+
+
+class EndpointMetrics:
+    """Wall time, time-to-first-byte and response size histograms for one route"""
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.wall_us = Histogram()
+        self.ttfb_us = Histogram()
+        self.size_bytes = Histogram()
+
+    def record(self, status: int, wall: float, ttfb: float, size: int):
+        self.count += 1
+        if status >= 500 or status == 0:
+            self.errors += 1
+        self.wall_us.record(wall * 1_000_000)
+        self.ttfb_us.record(ttfb * 1_000_000)
+        self.size_bytes.record(size)
+
+    def snapshot(self) -> tuple:
+        return self.count, self.errors, self.wall_us.to_sparse(), self.ttfb_us.to_sparse(), self.size_bytes.to_sparse()
+
+    def merge_snapshot(self, snapshot: tuple):
+        count, errors, wall, ttfb, size = snapshot
+        self.count += count
+        self.errors += errors
+        self.wall_us.merge_sparse(wall)
+        self.ttfb_us.merge_sparse(ttfb)
+        self.size_bytes.merge_sparse(size)
+
+
+class ConnectionMetrics:
+    """New vs reused connections for one route, with connect and pool-wait time of the requests that waited"""
+    def __init__(self):
+        self.new = 0
+        self.reused = 0
+        self.connect_us = Histogram()  # DNS + TCP + TLS handshake of newly opened connections
+        self.tls_us = Histogram()  # TLS handshake alone, where the client can time it separately
+        self.queued_us = Histogram()  # time spent waiting for a free slot in a full pool
+
+    def record(self, trace: Dict):
+        if trace.get("reused"):
+            self.reused += 1
+        elif "connect" in trace or "reused" in trace:
+            self.new += 1
+        if "connect" in trace:
+            self.connect_us.record(trace["connect"] * 1_000_000)
+        if "tls" in trace:
+            self.tls_us.record(trace["tls"] * 1_000_000)
+        if "queued" in trace:
+            self.queued_us.record(trace["queued"] * 1_000_000)
+
+    def snapshot(self) -> tuple:
+        return self.new, self.reused, self.connect_us.to_sparse(), self.tls_us.to_sparse(), self.queued_us.to_sparse()
+
+    def merge_snapshot(self, snapshot: tuple):
+        new, reused, connect, tls, queued = snapshot
+        self.new += new
+        self.reused += reused
+        self.connect_us.merge_sparse(connect)
+        self.tls_us.merge_sparse(tls)
+        self.queued_us.merge_sparse(queued)
+
+
+class RequestMetrics:
+    """Per-route request metrics plus scenario check counts"""
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+        self.connections: Dict[str, ConnectionMetrics] = {}
+        self.checks: Dict[str, list] = {}
+        self.lock = threading.Lock()
+        self.sink = None  # optional RecordWriter receiving every request
+        self.window = None  # optional Histogram of wall times since the last resource sample
+
+    def record(self, method: str, endpoint: str, status: int, wall: float, ttfb: float, size: int):
+        route = route_template(endpoint)
+        key = f"{method.upper()} {route}"
+        metrics = self.endpoints.get(key)
+        if metrics is None:
+            metrics = self.endpoints.setdefault(key, EndpointMetrics())
+        metrics.record(status, wall, ttfb, size)
+        if self.window is not None:
+            self.window.record(wall * 1_000_000)
+        if self.sink is not None:
+            self.sink.write((round(time.time(), 6), method.upper(), route, endpoint, status,
+                             round(wall * 1000, 3), round(ttfb * 1000, 3), size))
+
+    def record_connection(self, method: str, endpoint: str, trace: Dict):
+        """Count whether the request opened a connection or reused a pooled one (see AsyncHttpClient's tracing)"""
+        if not trace:
+            return
+        key = f"{method.upper()} {route_template(endpoint)}"
+        metrics = self.connections.get(key)
+        if metrics is None:
+            metrics = self.connections.setdefault(key, ConnectionMetrics())
+        metrics.record(trace)
+
+    def record_check(self, test_name: str, success: bool):
+        with self.lock:
+            counts = self.checks.setdefault(test_name, [0, 0])
+            counts[0 if success else 1] += 1
+
+    def drain(self) -> Dict:
+        """Return everything recorded since the last drain as a compact snapshot and start afresh"""
+        endpoints, self.endpoints = self.endpoints, {}
+        connections, self.connections = self.connections, {}
+        with self.lock:
+            checks, self.checks = self.checks, {}
+        return {
+            "endpoints": {key: metrics.snapshot() for key, metrics in endpoints.items()},
+            "connections": {key: metrics.snapshot() for key, metrics in connections.items()},
+            "checks": checks
+        }
+
+    def merge_snapshot(self, snapshot: Dict):
+        for key, endpoint in snapshot["endpoints"].items():
+            self.endpoints.setdefault(key, EndpointMetrics()).merge_snapshot(endpoint)
+        for key, connection in snapshot.get("connections", {}).items():
+            self.connections.setdefault(key, ConnectionMetrics()).merge_snapshot(connection)
+        for name, (passed, failed) in snapshot["checks"].items():
+            counts = self.checks.setdefault(name, [0, 0])
+            counts[0] += passed
+            counts[1] += failed
+
+    def total_requests(self) -> int:
+        return sum(metrics.count for metrics in self.endpoints.values())
+
+    def total_errors(self) -> int:
+        return sum(metrics.errors for metrics in self.endpoints.values())
+
+
+def print_latency_table(metrics: RequestMetrics, elapsed: float = None):
+    """Print p50/p90/p99/max wall time per route, with req/s when the run duration is known"""
+    rate_header = f" {'Req/s':>8}" if elapsed else ""
+    print(f"\n{'Route':<44} {'Count':>6}{rate_header} {'p50':>8} {'p90':>8} {'p99':>8} {'Max':>8} "
+          f"{'TTFB p99':>9} {'Size p50':>9} {'Err':>4}")
+    for key in sorted(metrics.endpoints):
+        m = metrics.endpoints[key]
+        wall = [m.wall_us.percentile(p) / 1000 for p in (50, 90, 99)] + [m.wall_us.max / 1000]
+        rate = f" {m.count / elapsed:>8.1f}" if elapsed else ""
+        print(f"{key:<44} {m.count:>6}{rate} " + " ".join(f"{ms:>6.1f}ms" for ms in wall) +
+              f" {m.ttfb_us.percentile(99) / 1000:>7.1f}ms {m.size_bytes.percentile(50):>8}B {m.errors:>4}")
+
+
+def print_connection_table(metrics: RequestMetrics):
+    """Print new vs reused connections per route with connect, TLS and pool-wait times"""
+    if not metrics.connections:
+        return
+
+    def p(histogram: Histogram, percent: float, width: int) -> str:
+        return f"{histogram.percentile(percent) / 1000:>{width - 2}.1f}ms" if histogram.total else f"{'-':>{width}}"
+
+    print(f"\n{'Connections':<44} {'New':>6} {'Reused':>7} {'Reuse':>6} {'Connect p50':>12} {'Connect p99':>12} "
+          f"{'TLS p50':>8} {'Pool wait p99':>14}")
+    for key in sorted(metrics.connections):
+        c = metrics.connections[key]
+        print(f"{key:<44} {c.new:>6} {c.reused:>7} {c.reused / max(c.new + c.reused, 1):>6.0%} "
+              f"{p(c.connect_us, 50, 12)} {p(c.connect_us, 99, 12)} {p(c.tls_us, 50, 8)} {p(c.queued_us, 99, 14)}")
+
+
+RECORD_FIELDS = ("timestamp", "method", "route", "path", "status", "wall_ms", "ttfb_ms", "size")
+
+
+class RecordWriter:
+    """Streams one row per request to disk instead of keeping samples in memory.
+
+    The format follows the file name: .csv or .ndjson/.jsonl, either optionally .gz,
+    or .parquet (written in row groups of PARQUET_BATCH rows, requires pyarrow).
+    """
+    PARQUET_BATCH = 10000
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self.file = self.csv = self.parquet = None
+        name = path[:-3] if path.endswith(".gz") else path
+        if name.endswith(".parquet"):
+            if pyarrow is None:
+                raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)")
+            self.format = "parquet"
+            self.batch = []
+        else:
+            self.format = "ndjson" if name.endswith((".ndjson", ".jsonl")) else "csv"
+            self.file = gzip.open(path, "wt", newline="") if path.endswith(".gz") else open(path, "w", newline="")
+            if self.format == "csv":
+                self.csv = csv.writer(self.file)
+                self.csv.writerow(RECORD_FIELDS)
+
+    def write(self, row: tuple):
+        self.rows += 1
+        if self.format == "parquet":
+            self.batch.append(row)
+            if len(self.batch) >= self.PARQUET_BATCH:
+                self.flush_batch()
+        elif self.format == "ndjson":
+            self.file.write(json.dumps(dict(zip(RECORD_FIELDS, row)), separators=(",", ":")) + "\n")
+        else:
+            self.csv.writerow(row)
+
+    def flush_batch(self):
+        table = pyarrow.table({name: list(column) for name, column in zip(RECORD_FIELDS, zip(*self.batch))})
+        if self.parquet is None:
+            self.parquet = pyarrow.parquet.ParquetWriter(self.path, table.schema, compression="zstd")
+        self.parquet.write_table(table)
+        self.batch = []
+
+    def close(self):
+        if self.format == "parquet":
+            if self.batch:
+                self.flush_batch()
+            if self.parquet is not None:
+                self.parquet.close()
+        else:
+            self.file.close()
+
+
+def metrics_summary(metrics: RequestMetrics, elapsed: float) -> Dict:
+    """Machine-readable run summary: totals plus throughput and latency percentiles (ms) per route"""
+    endpoints = {}
+    for key in sorted(metrics.endpoints):
+        m = metrics.endpoints[key]
+        endpoints[key] = {
+            "count": m.count,
+            "errors": m.errors,
+            "throughput": round(m.count / elapsed, 3) if elapsed else None,
+            **{f"p{p}_ms": round(m.wall_us.percentile(p) / 1000, 3) for p in (50, 90, 95, 99)},
+            "max_ms": round(m.wall_us.max / 1000, 3),
+            "ttfb_p95_ms": round(m.ttfb_us.percentile(95) / 1000, 3),
+            "size_p50_bytes": m.size_bytes.percentile(50)
+        }
+    total = metrics.total_requests()
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "elapsed": round(elapsed, 3),
+        "requests": total,
+        "errors": metrics.total_errors(),
+        "throughput": round(total / elapsed, 3) if elapsed else None,
+        "checks": {name: {"passed": passed, "failed": failed} for name, (passed, failed) in metrics.checks.items()},
+        "endpoints": endpoints,
+        "connections": {key: {"new": c.new, "reused": c.reused,
+                              "connect_p50_ms": round(c.connect_us.percentile(50) / 1000, 3)}
+                        for key, c in sorted(metrics.connections.items())}
+    }
+
+
+def compare_to_baseline(summary: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Print a per-route diff against a stored summary and return the regressions beyond `tolerance`.
+
+    A route regresses when its p95 grows, or its throughput drops, by more than
+    `tolerance` (0.1 = 10%); the overall throughput is checked the same way.
+    """
+    def change(current, previous):
+        return (current - previous) / previous if previous else 0.0
+
+    regressions = []
+    print(f"\n📐 Baseline comparison (tolerance {tolerance:.0%}):")
+    print(f"{'Route':<44} {'p95 base':>9} {'p95 now':>9} {'Δ':>7} {'Req/s base':>11} {'Req/s now':>10} {'Δ':>7}")
+    for key in sorted(set(summary["endpoints"]) | set(baseline.get("endpoints", {}))):
+        current = summary["endpoints"].get(key)
+        previous = baseline.get("endpoints", {}).get(key)
+        if current is None or previous is None:
+            print(f"{key:<44} {'(only in ' + ('baseline' if current is None else 'this run') + ')':>30}")
+            continue
+        p95_change = change(current["p95_ms"], previous["p95_ms"])
+        rate_change = change(current["throughput"] or 0, previous["throughput"] or 0)
+        flag = ""
+        if p95_change > tolerance:
+            regressions.append(f"{key}: p95 {previous['p95_ms']:.1f}ms -> {current['p95_ms']:.1f}ms ({p95_change:+.0%})")
+            flag = " ❌"
+        if rate_change < -tolerance:
+            regressions.append(f"{key}: throughput {previous['throughput']:.1f} -> {current['throughput']:.1f} req/s "
+                               f"({rate_change:+.0%})")
+            flag = " ❌"
+        print(f"{key:<44} {previous['p95_ms']:>7.1f}ms {current['p95_ms']:>7.1f}ms {p95_change:>+7.0%} "
+              f"{previous['throughput'] or 0:>11.1f} {current['throughput'] or 0:>10.1f} {rate_change:>+7.0%}{flag}")
+
+    overall = change(summary["throughput"] or 0, baseline.get("throughput") or 0)
+    if overall < -tolerance:
+        regressions.append(f"overall throughput {baseline['throughput']:.1f} -> {summary['throughput']:.1f} req/s "
+                           f"({overall:+.0%})")
+    return regressions
+
+
+class ResultsExport:
+    """Handles --records, --summary and --baseline for the functional run and the load modes"""
+    def __init__(self, records: str = None, summary: str = None, baseline: str = None, tolerance: float = 0.1):
+        self.records = records
+        self.summary = summary
+        self.baseline = baseline
+        self.tolerance = tolerance
+
+    @classmethod
+    def from_options(cls, options: Dict) -> "ResultsExport":
+        return cls(options.get("records"), options.get("summary"), options.get("baseline"), options.get("tolerance", 0.1))
+
+    def attach(self, metrics: RequestMetrics, worker: int = None):
+        """Start streaming `metrics`' requests to the records file (one file per worker process)"""
+        if not self.records:
+            return
+        path = self.records
+        if worker is not None:
+            stem, dot, rest = os.path.basename(path).partition(".")
+            path = os.path.join(os.path.dirname(path), f"{stem}-{worker}{dot}{rest}")
+        metrics.sink = RecordWriter(path)
+
+    def detach(self, metrics: RequestMetrics):
+        if metrics.sink is not None:
+            metrics.sink.close()
+            print(f"📝 Wrote {metrics.sink.rows} request records to {metrics.sink.path}")
+            metrics.sink = None
+
+    def finish(self, metrics: RequestMetrics, elapsed: float) -> bool:
+        """Close the records file, write the summary JSON and gate on the baseline; False on regression"""
+        self.detach(metrics)
+        summary = metrics_summary(metrics, elapsed)
+        if self.summary:
+            with open(self.summary, "w") as f:
+                json.dump(summary, f, indent=2)
+            print(f"📝 Wrote run summary to {self.summary}")
+        if not self.baseline:
+            return True
+
+        with open(self.baseline) as f:
+            regressions = compare_to_baseline(summary, json.load(f), self.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} performance regressions against {self.baseline}:")
+            for regression in regressions:
+                print(f"  • {regression}")
+            return False
+        print(f"\n✅ Within {self.tolerance:.0%} of {self.baseline}")
+        return True
+
+
+class LoadResponse:
+    """Buffered response from the async client, shaped like requests.Response"""
+    def __init__(self, status_code: int, headers: Dict, content: bytes, cookies: Dict = None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.cookies = cookies or {}
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class StreamResult:
+    """Outcome of a streamed download: status, headers and byte timings, without the body"""
+    def __init__(self, status_code: int, headers: Dict, size: int, ttfb: float,
+                 first_byte: Optional[float], last_byte: Optional[float]):
+        self.status_code = status_code
+        self.headers = headers
+        self.size = size
+        self.ttfb = ttfb
+        self.first_byte = first_byte
+        self.last_byte = last_byte
+
+
+class AsyncHttpClient:
+    """Pooled aiohttp client shared by every virtual user of a load run.
+
+    A trace config follows each request through the connector, so the metrics count
+    per route whether it opened a new connection (and how long DNS + TCP + TLS took)
+    or reused a pooled one, and how long it queued for a free slot in a full pool.
+    `keepalive_timeout` is how long idle connections stay pooled; `force_close`
+    disables keep-alive altogether and opens one connection per request.
+    """
+    def __init__(self, base_url: str = "http://localhost:3000", pool_size: int = 100, timeout: float = 30.0,
+                 keepalive_timeout: float = 15.0, force_close: bool = False):
+        self.base_url = base_url
+        self.api_base = f"{base_url}/api"
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.force_close = force_close
+        self.session = None
+        self.metrics = RequestMetrics()
+
+    @staticmethod
+    def trace_config() -> "aiohttp.TraceConfig":
+        """Trace hooks filling the per-request dict passed as trace_request_ctx.
+
+        Requests made straight on the session (ws_connect, for one) carry no dict and are skipped.
+        """
+        async def queued_start(session, context, params):
+            if context.trace_request_ctx is not None:
+                context.trace_request_ctx["queued_at"] = time.perf_counter()
+
+        async def queued_end(session, context, params):
+            if context.trace_request_ctx is not None:
+                context.trace_request_ctx["queued"] = time.perf_counter() - context.trace_request_ctx.pop("queued_at")
+
+        async def create_start(session, context, params):
+            if context.trace_request_ctx is not None:
+                context.trace_request_ctx["connect_at"] = time.perf_counter()
+
+        async def create_end(session, context, params):
+            if context.trace_request_ctx is not None:
+                context.trace_request_ctx["connect"] = time.perf_counter() - context.trace_request_ctx.pop("connect_at")
+
+        async def reuse(session, context, params):
+            if context.trace_request_ctx is not None:
+                context.trace_request_ctx["reused"] = True
+
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_queued_start.append(queued_start)
+        trace.on_connection_queued_end.append(queued_end)
+        trace.on_connection_create_start.append(create_start)
+        trace.on_connection_create_end.append(create_end)
+        trace.on_connection_reuseconn.append(reuse)
+        return trace
+
+    async def start(self):
+        if self.force_close:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, force_close=True)
+        else:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=self.keepalive_timeout)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            cookie_jar=aiohttp.DummyCookieJar(),
+            trace_configs=[self.trace_config()]
+        )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+
+    async def request(self, method: str, endpoint: str, data: Dict = None, headers: Dict = None,
+                      cookies: Dict = None, intended: float = None) -> LoadResponse:
+        """Send one request through the pool, recording its latency against the endpoint.
+
+        `data` is sent as JSON, or byte for byte when it is already bytes (e.g. a signed webhook body)
+        or an async iterable of bytes, which goes out chunked (e.g. a streamed multipart upload).
+        With `intended`, the perf_counter time the request was scheduled for, latency is recorded
+        from that instant instead of the actual send, so time spent held back counts too;
+        time to first byte is still measured from the actual send.
+        """
+        url = f"{self.api_base}{endpoint}"
+        headers = headers or JSON_HEADERS
+        if cookies:
+            headers = {**headers, "Cookie": "; ".join(f"{name}={value}" for name, value in cookies.items())}
+        body = {"data": data} if isinstance(data, bytes) or hasattr(data, "__aiter__") else {"json": data}
+        trace = {}
+
+        sent = time.perf_counter()
+        start = sent if intended is None else intended
+        try:
+            async with self.session.request(method.upper(), url, **body, headers=headers,
+                                            trace_request_ctx=trace) as resp:
+                ttfb = time.perf_counter() - sent
+                content = await resp.read()
+                cookies = {name: morsel.value for name, morsel in resp.cookies.items()}
+                response = LoadResponse(resp.status, resp.headers, content, cookies)
+        except Exception:
+            self.metrics.record(method, endpoint, 0, time.perf_counter() - start, 0, 0)
+            self.metrics.record_connection(method, endpoint, trace)
+            raise
+
+        self.metrics.record(method, endpoint, response.status_code, time.perf_counter() - start, ttfb, len(content))
+        self.metrics.record_connection(method, endpoint, trace)
+        return response
+
+    async def stream(self, method: str, endpoint: str, data: Dict = None, chunk_size: int = 16384,
+                     headers: Dict = None, cookies: Dict = None, on_chunk=None) -> StreamResult:
+        """Send one request and consume the body chunk by chunk, keeping only its size and timings.
+
+        `on_chunk`, if given, is called with every chunk of a 2xx body as it arrives.
+        """
+        url = f"{self.api_base}{endpoint}"
+        headers = headers or JSON_HEADERS
+        if cookies:
+            headers = {**headers, "Cookie": "; ".join(f"{name}={value}" for name, value in cookies.items())}
+        first_byte = last_byte = None
+        size = 0
+        trace = {}
+
+        start = time.perf_counter()
+        try:
+            async with self.session.request(method.upper(), url, json=data, headers=headers,
+                                            trace_request_ctx=trace) as resp:
+                ttfb = time.perf_counter() - start
+                if resp.status >= 300:
+                    on_chunk = None
+                async for chunk in resp.content.iter_chunked(chunk_size):
+                    last_byte = time.perf_counter()
+                    if first_byte is None:
+                        first_byte = last_byte
+                    size += len(chunk)
+                    if on_chunk is not None:
+                        on_chunk(chunk)
+                result = StreamResult(resp.status, resp.headers, size, ttfb, first_byte, last_byte)
+        except Exception:
+            self.metrics.record(method, endpoint, 0, time.perf_counter() - start, 0, size)
+            self.metrics.record_connection(method, endpoint, trace)
+            raise
+
+        self.metrics.record(method, endpoint, result.status_code, time.perf_counter() - start, ttfb, size)
+        self.metrics.record_connection(method, endpoint, trace)
+        return result
+
+
+def totp_code(secret: str, at: float = None, step: int = 30, digits: int = 6) -> str:
+    """RFC 6238 code for a base32 secret, matching speakeasy's defaults used by the server"""
+    secret = secret.replace(" ", "").upper()
+    key = base64.b32decode(secret + "=" * (-len(secret) % 8))
+    counter = int((time.time() if at is None else at) // step)
+    digest = hmac.new(key, struct.pack(">Q", counter), hashlib.sha1).digest()
+    offset = digest[-1] & 0x0F
+    value = struct.unpack(">I", digest[offset:offset + 4])[0] & 0x7FFFFFFF
+    return str(value % 10 ** digits).zfill(digits)
+
+
+class SessionPool:
+    """Logged-in admin and team-member sessions handed out to load workers.
+
+    The credentials file is a JSON list of {"email", "password", "totpSecret"?, "flow"?}.
+    Accounts with a TOTP secret log in through /api/admin/auth/login + verify-totp,
+    the others through /api/auth/login (team members skip TOTP). Cookies are cached in
+    `cache_file` so repeated runs and worker processes reuse the same sessions, and a
+    session is logged in again once it is older than `max_age` or answers 401.
+    """
+    def __init__(self, credentials_file: str, cache_file: str = "session_cache.json", max_age: float = 3600.0):
+        with open(credentials_file) as f:
+            self.accounts = json.load(f)
+        if not self.accounts:
+            raise ValueError(f"No accounts in {credentials_file}")
+        self.cache_file = cache_file
+        self.max_age = max_age
+        self.sessions: List[Optional[Dict]] = [None] * len(self.accounts)
+        self.locks: List[Optional[asyncio.Lock]] = [None] * len(self.accounts)
+        self.next_index = 0
+        self.logins = 0
+        self.refreshes = 0
+
+    def load_cache(self) -> Dict:
+        try:
+            with open(self.cache_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_cache(self):
+        cache = self.load_cache()
+        for account, session in zip(self.accounts, self.sessions):
+            if session:
+                cache[account["email"]] = session
+        tmp = f"{self.cache_file}.{os.getpid()}.tmp"
+        with os.fdopen(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp, self.cache_file)
+
+    def fresh(self, session: Optional[Dict]) -> bool:
+        return bool(session and session.get("cookies") and time.time() - session.get("created", 0) < self.max_age)
+
+    async def login(self, client: AsyncHttpClient, account: Dict) -> Dict:
+        """Run the login flow for one account and return the resulting cookies"""
+        flow = account.get("flow") or ("admin" if account.get("totpSecret") else "team")
+        credentials = {"email": account["email"], "password": account["password"]}
+        response = await client.request("POST", "/admin/auth/login" if flow == "admin" else "/auth/login", credentials)
+        if response.status_code != 200:
+            raise RuntimeError(f"Login failed for {account['email']}: HTTP {response.status_code}")
+        cookies = dict(response.cookies)
+        data = response.json()
+
+        if data.get("requiresTOTPSetup"):
+            raise RuntimeError(f"{account['email']} has no TOTP set up yet")
+        if data.get("requiresTOTP") or data.get("requiresTOTPVerification"):
+            if not account.get("totpSecret"):
+                raise RuntimeError(f"{account['email']} requires TOTP but no totpSecret is configured")
+            response = await client.request("POST", "/admin/auth/verify-totp",
+                                            {"code": totp_code(account["totpSecret"])}, cookies=cookies)
+            if response.status_code != 200:
+                raise RuntimeError(f"TOTP verification failed for {account['email']}: HTTP {response.status_code}")
+            cookies.update(response.cookies)
+
+        self.logins += 1
+        return {"cookies": cookies, "created": time.time()}
+
+    async def start(self, client: AsyncHttpClient):
+        """Reuse cached sessions where still fresh and log in the rest"""
+        cache = self.load_cache()
+        for i, account in enumerate(self.accounts):
+            self.locks[i] = asyncio.Lock()
+            session = cache.get(account["email"])
+            self.sessions[i] = session if self.fresh(session) else await self.login(client, account)
+        self.save_cache()
+        print(f"🔑 Session pool: {len(self.accounts)} accounts ({self.logins} fresh logins)")
+
+    def acquire(self) -> tuple:
+        """Hand out (index, cookies) round-robin over the logged-in accounts"""
+        index = self.next_index % len(self.accounts)
+        self.next_index += 1
+        return index, dict(self.sessions[index]["cookies"])
+
+    async def refresh(self, client: AsyncHttpClient, index: int, stale: Dict) -> Dict:
+        """Log account `index` in again unless another worker already replaced the `stale` cookies"""
+        async with self.locks[index]:
+            if self.sessions[index]["cookies"] == stale:
+                self.sessions[index] = await self.login(client, self.accounts[index])
+                self.refreshes += 1
+                self.save_cache()
+            return dict(self.sessions[index]["cookies"])
+
+
+class LoadTester:
+    """Virtual user that replays the BackendTester journeys as a coroutine on the shared async client.
+
+    Each check carries the name and pass criteria of the BackendTester scenario it mirrors
+    and is counted in the client's metrics instead of printed.
+    """
+    GUEST_CHAT = {"message": "Hello, I need help with booking", "guestName": "John Doe",
+                  "guestEmail": "john@example.com"}
+    LOOKUP = {"confirmationCode": "ARCO123456", "email": "marco.rossi@email.it"}
+
+    def __init__(self, client: AsyncHttpClient, sessions: SessionPool = None):
+        self.client = client
+        self.sessions = sessions
+        self.cookies = {}
+        if sessions:
+            self.session_index, self.cookies = sessions.acquire()
+
+    async def make_request(self, method: str, endpoint: str, data: Dict = None, retry: bool = True) -> tuple:
+        """Send one request with the user's cookies and return (success, response, error_message)"""
+        try:
+            response = await self.client.request(method, endpoint, data, cookies=self.cookies)
+        except aiohttp.ClientConnectionError:
+            return False, None, "Connection failed - server may not be running"
+        except Exception as e:
+            return False, None, f"Request error: {str(e)}"
+
+        if response.status_code == 401 and self.sessions and retry:
+            await self.refresh_session()
+            if self.cookies:
+                return await self.make_request(method, endpoint, data, retry=False)
+
+        self.cookies.update(response.cookies)
+        return True, response, None
+
+    async def refresh_session(self):
+        """Swap the pooled session for a newly logged-in one (expired cookie or 401)"""
+        stale, self.cookies = self.cookies, {}
+        try:
+            self.cookies = await self.sessions.refresh(self.client, self.session_index, stale)
+        except Exception as e:
+            self.client.metrics.record_check("Admin Session Refresh", False)
+            print(f"⚠️ Session refresh failed: {e}")
+
+    async def check(self, name: str, method: str, endpoint: str, data: Dict = None, valid=None,
+                    not_found_ok: bool = False) -> Optional[Dict]:
+        """Send one request and count check `name`; returns the JSON body when it passed.
+
+        A 200 passes when `valid(body)` holds (any 200 when `valid` is None); with
+        `not_found_ok` a 404 whose body says success=false passes too.
+        """
+        success, response, error = await self.make_request(method, endpoint, data)
+        body = None
+        if success and response.status_code == 200 and valid is None:
+            body = {}
+        elif success and (response.status_code == 200 or not_found_ok and response.status_code == 404):
+            try:
+                data = response.json()
+            except ValueError:
+                data = None
+            if isinstance(data, dict) and (valid(data) if response.status_code == 200 else not data.get("success")):
+                body = data
+        self.client.metrics.record_check(name, body is not None)
+        return body
+
+    async def check_admin_conversations(self):
+        """The admin conversation list, counted with ijson when available so the array is never decoded"""
+        success, response, error = await self.make_request("GET", "/chat/admin/conversations")
+        passed = success and response.status_code == 200
+        if passed and ijson is not None:
+            fields, count = count_json_items(response.content, "conversations")
+            passed = bool(fields.get("success")) and count is not None
+        elif passed:
+            try:
+                data = response.json()
+            except ValueError:
+                data = {}
+            passed = isinstance(data, dict) and bool(data.get("success")) and "conversations" in data
+        self.client.metrics.record_check("Chat Admin Conversations", passed)
+
+    async def run_iteration(self):
+        """One pass through the guest journey exercised by run_all_tests"""
+        if self.sessions:
+            if not self.sessions.fresh(self.sessions.sessions[self.session_index]):
+                await self.refresh_session()
+            await self.run_admin_iteration()
+            return
+
+        started = await self.check("Chat Start (Guest)", "POST", "/chat/start", self.GUEST_CHAT,
+                                   lambda data: data.get("success") and data.get("conversationId"))
+        if started:
+            conversation_id = started["conversationId"]
+            await self.check("Chat Send Message", "POST", "/chat/send",
+                             {"conversationId": conversation_id, "content": "Thank you for your help"},
+                             lambda data: data.get("success") and data.get("message"))
+            await self.check("Chat Get Conversation", "GET", f"/chat/conversation/{conversation_id}",
+                             valid=lambda data: data.get("success") and data.get("conversation"))
+        await self.check("Chat Unread Count", "GET", "/chat/unread-count",
+                         valid=lambda data: data.get("success") and "count" in data)
+        await self.check("Booking Lookup Find", "POST", "/booking-lookup/find", self.LOOKUP,
+                         lambda data: data.get("success") and data.get("booking"), not_found_ok=True)
+
+    async def run_admin_iteration(self):
+        """One pass through the admin dashboard hot paths with an authenticated session"""
+        await self.check_admin_conversations()
+        await self.check("Admin Dashboard", "GET", "/admin/dashboard")
+        await self.check("Analytics", "GET", "/analytics")
+
+
+async def drive_virtual_users(client: AsyncHttpClient, users: int, duration: float, ramp_up: float = 0.0,
+                              sessions: SessionPool = None) -> float:
+    """Run `users` virtual users through a started client for `duration` seconds, return the elapsed time.
+
+    Every virtual user is a task on the client's event loop. With a session pool they are
+    logged-in admins exercising the admin endpoints.
+    """
+    stop = asyncio.Event()
+
+    async def user_loop(index: int):
+        if ramp_up:
+            await asyncio.sleep(ramp_up * index / users)
+        tester = LoadTester(client, sessions)
+        while not stop.is_set():
+            await tester.run_iteration()
+
+    started = time.perf_counter()
+    workers = [asyncio.create_task(user_loop(i)) for i in range(users)]
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        stop.set()
+        await asyncio.gather(*workers, return_exceptions=True)
+    return time.perf_counter() - started
+
+
+async def run_load_test(base_url: str, users: int, duration: float, pool_size: int, ramp_up: float = 0.0,
+                        sessions: SessionPool = None, export: ResultsExport = None,
+                        sampler: "ResourceSampler" = None, keepalive_timeout: float = 15.0,
+                        force_close: bool = False) -> bool:
+    """Run `users` concurrent virtual users for `duration` seconds and print throughput per endpoint"""
+    client = AsyncHttpClient(base_url, pool_size=pool_size, keepalive_timeout=keepalive_timeout,
+                             force_close=force_close)
+    await client.start()
+    try:
+        if sessions:
+            await sessions.start(client)
+            client.metrics = RequestMetrics()
+        if export:
+            export.attach(client.metrics)
+        keep_alive = "off" if force_close else f"{keepalive_timeout:g}s"
+        print(f"🚀 Load test: {users} virtual users for {duration:.0f}s (pool size {pool_size}, keep-alive {keep_alive})")
+        sampling_done = asyncio.Event()
+        sampling = asyncio.create_task(sampler.run(client.metrics, sampling_done)) if sampler else None
+        elapsed = await drive_virtual_users(client, users, duration, ramp_up, sessions)
+    finally:
+        if sampling:
+            sampling_done.set()
+            await sampling
+        await client.close()
+    if sessions and sessions.refreshes:
+        print(f"🔑 {sessions.refreshes} sessions refreshed during the run")
+
+    success = print_load_report(client.metrics, elapsed)
+    if sampler:
+        sampler.print_report()
+    return export.finish(client.metrics, elapsed) and success if export else success
+
+
+def print_load_report(metrics: RequestMetrics, elapsed: float) -> bool:
+    """Print requests/sec and latency per route, return False if any request errored"""
+    print("\n" + "=" * 80)
+    print("📈 LOAD TEST SUMMARY")
+    print("=" * 80)
+
+    total = metrics.total_requests()
+    errors = metrics.total_errors()
+    print(f"Duration: {elapsed:.1f}s")
+    print(f"Requests: {total} ({total / elapsed:.1f} req/s)")
+    print(f"Errors: {errors}")
+
+    print_latency_table(metrics, elapsed)
+    print_connection_table(metrics)
+
+    if metrics.checks:
+        print(f"\nScenario checks:")
+        for name in sorted(metrics.checks):
+            passed, failed = metrics.checks[name]
+            print(f"  • {name}: {passed} passed, {failed} failed")
+
+    print("\n" + "=" * 80)
+    return errors == 0
+
+def process_rss_kb(pid="self") -> Optional[int]:
+    """Resident set size of a local process in kB, read from /proc; None when unavailable"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def chat_connections(ws_health: Dict) -> Optional[int]:
+    """Size of WebSocketManager's /ws/chat connection map from an /api/ws/health body; None on servers without it"""
+    stats = ws_health.get("chatConnections") if isinstance(ws_health, dict) else None
+    return stats.get("totalConnections") if isinstance(stats, dict) else None
+
+
+def process_tree(pid: int) -> List[int]:
+    """`pid` and all of its descendants, found by walking the parent links in /proc"""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return tree
+
+
+def process_usage(pids: List[int]) -> Dict:
+    """Summed RSS (kB), CPU time (s), open file descriptors and threads of the given processes"""
+    usage = {"rss_kb": 0, "cpu_seconds": 0.0, "fds": 0, "threads": 0}
+    ticks = os.sysconf("SC_CLK_TCK")
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            usage["cpu_seconds"] += (int(fields[11]) + int(fields[12])) / ticks
+            usage["threads"] += int(fields[17])
+            usage["rss_kb"] += process_rss_kb(pid) or 0
+            usage["fds"] += len(os.listdir(f"/proc/{pid}/fd"))
+        except (OSError, IndexError, ValueError):
+            continue
+    return usage
+
+
+class ResourceSampler:
+    """Samples the target server next to the latency timeline of a run.
+
+    Every `interval` seconds it reads RSS, CPU, open FDs and threads of the server's
+    process tree from /proc (when a local pid is known), polls /api/health,
+    /api/ws/health and /api/admin/system/health (the last one needs admin cookies),
+    and closes a latency window on the run's RequestMetrics, so each row of the time
+    series pairs the server's resource usage with the requests completed in that window.
+    """
+    HEALTH_ENDPOINTS = ("/health", "/ws/health", "/admin/system/health")
+
+    def __init__(self, base_url: str, interval: float = 1.0, pid: int = None, cookies: Dict = None,
+                 log_path: str = None):
+        self.client = AsyncHttpClient(base_url, pool_size=len(self.HEALTH_ENDPOINTS), timeout=max(interval, 1.0))
+        self.interval = interval
+        self.pid = pid
+        self.cookies = cookies or {}
+        self.log_path = log_path
+        self.samples: List[Dict] = []
+        self.skipped: Dict[str, int] = {}  # endpoint -> status that stopped it being polled
+
+    async def probe(self, endpoint: str, sample: Dict):
+        start = time.perf_counter()
+        try:
+            response = await self.client.request("GET", endpoint, cookies=self.cookies)
+        except Exception:
+            sample[f"{endpoint} ms"] = None
+            return
+        sample[f"{endpoint} ms"] = round((time.perf_counter() - start) * 1000, 2)
+        if response.status_code in (401, 403, 404):
+            self.skipped[endpoint] = response.status_code
+            return
+        try:
+            data = response.json()
+        except ValueError:
+            return
+        if endpoint == "/ws/health":
+            sample["ws_connections"] = chat_connections(data)
+        elif endpoint == "/admin/system/health":
+            sample["uptime_s"] = data.get("uptime")
+            sample["admin_ws_connections"] = data.get("websocket", {}).get("connections")
+
+    async def sample(self, metrics: RequestMetrics, started: float, previous: Dict) -> Dict:
+        window, metrics.window = metrics.window, Histogram()
+        now = time.perf_counter()
+        sample = {
+            "t": round(now - started, 2),
+            "requests": window.total,
+            "req_s": round(window.total / max(now - previous.get("at", started), 1e-6), 1),
+            "p50_ms": round(window.percentile(50) / 1000, 2),
+            "p99_ms": round(window.percentile(99) / 1000, 2),
+            "max_ms": round(window.max / 1000, 2)
+        }
+        if self.pid:
+            usage = process_usage(process_tree(self.pid))
+            cpu_delta = usage["cpu_seconds"] - previous.get("cpu_seconds", usage["cpu_seconds"])
+            sample.update(rss_mb=round(usage["rss_kb"] / 1024, 1), fds=usage["fds"], threads=usage["threads"],
+                          cpu_pct=round(100 * cpu_delta / max(now - previous.get("at", now), 1e-6), 1)
+                          if previous else None)
+            previous["cpu_seconds"] = usage["cpu_seconds"]
+        previous["at"] = now
+        await asyncio.gather(*(self.probe(endpoint, sample) for endpoint in self.HEALTH_ENDPOINTS
+                               if endpoint not in self.skipped))
+        return sample
+
+    async def run(self, metrics: RequestMetrics, stop: asyncio.Event):
+        """Sample until `stop` is set; start this alongside the load"""
+        await self.client.start()
+        metrics.window = Histogram()
+        started = time.perf_counter()
+        previous: Dict = {}
+        try:
+            while not stop.is_set():
+                try:
+                    await asyncio.wait_for(stop.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+                self.samples.append(await self.sample(metrics, started, previous))
+        finally:
+            metrics.window = None
+            await self.client.close()
+        if self.log_path:
+            self.write_log()
+
+    def write_log(self):
+        columns = list(dict.fromkeys(key for sample in self.samples for key in sample))
+        with open(self.log_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(self.samples)
+        print(f"📝 Wrote {len(self.samples)} resource samples to {self.log_path}")
+
+    def print_report(self):
+        if not self.samples:
+            return
+        print(f"\n🖥️ Server resources every {self.interval:g}s:")
+        print(f"{'t':>7} {'req/s':>8} {'p50':>8} {'p99':>8} {'RSS':>9} {'CPU':>7} {'FDs':>6} {'WS':>6}")
+        p99s = sorted(sample["p99_ms"] for sample in self.samples if sample["requests"])
+        typical = p99s[len(p99s) // 2] if p99s else 0
+        stride = math.ceil(len(self.samples) / 60)  # long runs: every n-th row plus all spikes
+        for i, sample in enumerate(self.samples):
+            spike = typical and sample["p99_ms"] > 2 * typical
+            if i % stride and not spike:
+                continue
+            rss = f"{sample['rss_mb']:.1f}MB" if sample.get("rss_mb") is not None else "-"
+            cpu = f"{sample['cpu_pct']:.0f}%" if sample.get("cpu_pct") is not None else "-"
+            ws = sample["ws_connections"] if sample.get("ws_connections") is not None else "-"
+            print(f"{sample['t']:>6.1f}s {sample['req_s']:>8.1f} {sample['p50_ms']:>6.1f}ms {sample['p99_ms']:>6.1f}ms "
+                  f"{rss:>9} {cpu:>7} {sample.get('fds', '-'):>6} {ws:>6}"
+                  + ("  ⚠️ p99 spike" if spike else ""))
+        if self.pid and len(self.samples) > 1:
+            first, last = self.samples[0], self.samples[-1]
+            print(f"RSS {first['rss_mb']:.1f} -> {last['rss_mb']:.1f}MB, FDs {first['fds']} -> {last['fds']}")
+        for endpoint, status in sorted(self.skipped.items()):
+            hint = " (needs admin --cookies)" if status in (401, 403) else ""
+            print(f"ℹ️ {endpoint} answered HTTP {status}{hint}, not sampled")
+
+
+def launch_server(command: str, base_url: str, timeout: float = 60.0) -> "subprocess.Popen":
+    """Start the server under test in its own process group and wait until /api/health answers"""
+    process = subprocess.Popen(shlex.split(command), start_new_session=True)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode} before becoming ready")
+        try:
+            if requests.get(f"{base_url}/api/health", timeout=1).status_code < 500:
+                print(f"🚀 Launched server (pid {process.pid}): {command}")
+                return process
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.25)
+    stop_server(process)
+    raise RuntimeError(f"Server did not answer {base_url}/api/health within {timeout:.0f}s")
+
+
+def stop_server(process: "subprocess.Popen"):
+    """Terminate a launched server and everything it spawned"""
+    if process.poll() is not None:
+        return
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+def raise_open_file_limit() -> Optional[int]:
+    """Lift the soft file-descriptor limit to the hard limit so thousands of sockets can be opened"""
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft < hard:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        return hard
+    except (ImportError, ValueError, OSError):
+        return None
+
+
+async def run_at_rate(rate: float, action, stop: asyncio.Event):
+    """Call `action` `rate` times per second on a fixed timeline until `stop` is set"""
+    if rate <= 0:
+        return
+    interval = 1.0 / rate
+    next_at = time.perf_counter()
+    while not stop.is_set():
+        await action()
+        next_at += interval
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class StormConnection:
+    """One simulated /ws/chat client"""
+    __slots__ = ("ws", "user_id", "is_admin", "conversation_id", "ping_sent")
+
+    def __init__(self, ws, user_id: str, is_admin: bool, conversation_id: int):
+        self.ws = ws
+        self.user_id = user_id
+        self.is_admin = is_admin
+        self.conversation_id = conversation_id
+        self.ping_sent = None
+
+
+class WebSocketStorm:
+    """Opens thousands of /ws/chat clients and measures fan-out delivery latency.
+
+    Guests connect as guest_<email> so WebSocketManager.notifyUser reaches them, admins
+    connect with isAdmin=true to receive notifyAdmins, and every client sees the typing
+    and message_status broadcasts. Latency is measured from the moment the harness
+    triggered an event to the moment each subscriber receives it.
+
+    Admin->guest messages are posted to /chat/send without sender details, which the
+    server only attributes to an admin when NODE_ENV=development (chatRoutes.ts). Against
+    a production build they are stored as guest messages and never reach guest sockets,
+    so run the storm against a development server.
+    """
+    EVENT_TYPES = ("pong", "typing", "new_message", "message_status")
+
+    def __init__(self, base_url: str, clients: int = 1000, admin_ratio: float = 0.05, connect_rate: float = 200.0,
+                 duration: float = 30.0, conversations: int = 50, typing_rate: float = 2.0, message_rate: float = 5.0,
+                 ping_interval: float = 10.0, storm_rates: List[int] = None, server_pid: int = None):
+        self.ws_url = base_url.replace("http", "ws", 1) + "/ws/chat"
+        self.client = AsyncHttpClient(base_url, pool_size=0)
+        self.clients = clients
+        self.admin_ratio = admin_ratio
+        self.connect_rate = connect_rate
+        self.duration = duration
+        self.conversations = conversations
+        self.typing_rate = typing_rate
+        self.message_rate = message_rate
+        self.ping_interval = ping_interval
+        self.storm_rates = storm_rates or []
+        self.server_pid = server_pid
+
+        self.connections: List[StormConnection] = []
+        self.conversation_emails: Dict[int, str] = {}
+        self.readers = []
+        self.posts = set()
+        self.stopping = False
+        self.connect_us = Histogram()
+        self.connect_failures = 0
+        self.disconnects = 0
+        self.latency_us = {event: Histogram() for event in self.EVENT_TYPES}
+        self.sent_at: Dict[tuple, float] = {}
+        self.message_seq = 0
+        self.ping_cursor = 0
+        self.ramp_seconds = 0.0
+        self.storm_results = []
+        self.memory = {}
+
+    def _is_admin(self, index: int) -> bool:
+        if self.admin_ratio <= 0:
+            return False
+        return index % max(1, round(1 / self.admin_ratio)) == 0
+
+    async def setup_conversations(self):
+        """Start one guest conversation per simulated guest mailbox"""
+        async def start(index: int):
+            email = f"ws-storm-{index}@loadtest.local"
+            response = await self.client.request("POST", "/chat/start", {
+                "message": "Load test conversation",
+                "guestName": f"Storm Guest {index}",
+                "guestEmail": email
+            })
+            if response.status_code == 200:
+                self.conversation_emails[response.json()["conversationId"]] = email
+
+        await asyncio.gather(*(start(i) for i in range(self.conversations)), return_exceptions=True)
+
+    async def connect(self, index: int, keep: bool = True) -> Optional[StormConnection]:
+        """Open one client and wait for the server's `connected` frame"""
+        conversation_ids = list(self.conversation_emails) or [0]
+        conversation_id = conversation_ids[index % len(conversation_ids)]
+        is_admin = self._is_admin(index)
+        user_id = f"admin_storm_{index}" if is_admin else f"guest_{self.conversation_emails.get(conversation_id, index)}"
+
+        start = time.perf_counter()
+        try:
+            ws = await self.client.session.ws_connect(
+                self.ws_url, params={"userId": user_id, "isAdmin": "true" if is_admin else "false"}
+            )
+            greeting = await ws.receive_json(timeout=10)
+        except Exception:
+            if keep:  # failed storm probes are counted per rate in connection_storm
+                self.connect_failures += 1
+            return None
+        if greeting.get("type") != "connected":
+            if keep:
+                self.connect_failures += 1
+            await ws.close()
+            return None
+        if keep:  # storm probes time their handshakes per rate in connection_storm
+            self.connect_us.record((time.perf_counter() - start) * 1_000_000)
+
+        connection = StormConnection(ws, user_id, is_admin, conversation_id)
+        if keep:
+            self.connections.append(connection)
+            self.readers.append(asyncio.create_task(self.read(connection)))
+            await ws.send_str(json.dumps({"type": "join_conversation", "conversationId": conversation_id}))
+        return connection
+
+    async def read(self, connection: StormConnection):
+        async for msg in connection.ws:
+            if msg.type == aiohttp.WSMsgType.TEXT:
+                try:
+                    data = json.loads(msg.data)
+                except ValueError:
+                    continue  # the server skips frames it cannot parse too
+                self.on_message(connection, data)
+        if not self.stopping:
+            self.disconnects += 1
+
+    def on_message(self, connection: StormConnection, data: Dict):
+        now = time.perf_counter()
+        kind = data.get("type")
+        if kind == "pong":
+            sent = connection.ping_sent
+            connection.ping_sent = None
+        elif kind == "typing":
+            sent = self.sent_at.get(("typing", data.get("userId"), data.get("conversationId")))
+        elif kind == "new_message":
+            message = (data.get("data") or {}).get("message") or {}
+            sent = self.sent_at.get(("new_message", message.get("content")))
+        elif kind == "message_status":
+            sent = self.sent_at.get(("message_status", data.get("messageId")))
+        else:
+            return
+        if sent is not None:
+            self.latency_us[kind].record((now - sent) * 1_000_000)
+
+    async def connection_storm(self):
+        """Open bursts of connections at rising rates and record which rates the server absorbs"""
+        for rate in self.storm_rates:
+            start = time.perf_counter()
+            handshake = Histogram()
+
+            async def attempt(i: int):
+                await asyncio.sleep(i / rate)
+                began = time.perf_counter()
+                connection = await self.connect(i, keep=False)
+                if connection is not None:
+                    handshake.record((time.perf_counter() - began) * 1_000_000)
+                return connection
+
+            opened = await asyncio.gather(*(attempt(i) for i in range(rate)))
+            failed = sum(1 for c in opened if c is None)
+            elapsed = time.perf_counter() - start
+            self.storm_results.append((rate, rate - failed, failed, handshake.percentile(99) / 1000, elapsed))
+            await asyncio.gather(*(c.ws.close() for c in opened if c is not None), return_exceptions=True)
+            await asyncio.sleep(1)
+
+    async def send_ping(self):
+        if not self.connections:
+            return
+        connection = self.connections[self.ping_cursor % len(self.connections)]
+        self.ping_cursor += 1
+        if connection.ping_sent is None and not connection.ws.closed:
+            connection.ping_sent = time.perf_counter()
+            await connection.ws.send_str(json.dumps({"type": "ping"}))
+
+    async def send_typing(self):
+        if not self.connections:
+            return
+        connection = random.choice(self.connections)
+        if connection.ws.closed:
+            return
+        self.sent_at[("typing", connection.user_id, connection.conversation_id)] = time.perf_counter()
+        await connection.ws.send_str(json.dumps({
+            "type": "typing", "conversationId": connection.conversation_id, "isTyping": True
+        }))
+
+    async def send_message(self):
+        """Alternate guest->admin messages (notifyAdmins) and admin->guest messages (notifyUser + message_status)"""
+        if not self.conversation_emails:
+            return
+        self.message_seq += 1
+        conversation_id = random.choice(list(self.conversation_emails))
+        token = f"ws-storm message {self.message_seq}"
+        payload = {"conversationId": conversation_id, "content": token}
+        from_guest = self.message_seq % 2 == 0
+        if from_guest:
+            payload["senderName"] = "Storm Guest"
+            payload["senderEmail"] = self.conversation_emails[conversation_id]
+
+        sent = time.perf_counter()
+        self.sent_at[("new_message", token)] = sent
+        task = asyncio.create_task(self._post_message(payload, sent, from_guest))
+        self.posts.add(task)
+        task.add_done_callback(self.posts.discard)
+
+    async def _post_message(self, payload: Dict, sent: float, from_guest: bool):
+        try:
+            response = await self.client.request("POST", "/chat/send", payload)
+        except Exception:
+            return
+        if response.status_code == 200 and not from_guest:
+            message_id = (response.json().get("message") or {}).get("id")
+            self.sent_at[("message_status", message_id)] = sent
+
+    def expire_sent(self, max_age: float = 60.0):
+        cutoff = time.perf_counter() - max_age
+        for key in [key for key, sent in self.sent_at.items() if sent < cutoff]:
+            del self.sent_at[key]
+
+    async def run(self) -> bool:
+        fd_limit = raise_open_file_limit()
+        await self.client.start()
+        try:
+            await self.setup_conversations()
+            print(f"💬 {len(self.conversation_emails)} conversations ready, file descriptor limit {fd_limit}")
+
+            if self.storm_rates:
+                print(f"🌩️ Connection storm at {', '.join(map(str, self.storm_rates))} connections/s...")
+                await self.connection_storm()
+
+            self.memory["client_before"] = process_rss_kb()
+            self.memory["server_before"] = process_rss_kb(self.server_pid) if self.server_pid else None
+            print(f"🔌 Opening {self.clients} connections at {self.connect_rate:.0f}/s...")
+            ramp_start = time.perf_counter()
+
+            async def delayed_connect(i: int):
+                await asyncio.sleep(i / self.connect_rate)
+                await self.connect(i)
+
+            await asyncio.gather(*(delayed_connect(i) for i in range(self.clients)))
+            self.ramp_seconds = time.perf_counter() - ramp_start
+            self.memory["client_after"] = process_rss_kb()
+            self.memory["server_after"] = process_rss_kb(self.server_pid) if self.server_pid else None
+
+            print(f"📡 {len(self.connections)} connected, driving traffic for {self.duration:.0f}s...")
+            stop = asyncio.Event()
+            ping_rate = len(self.connections) / self.ping_interval if self.ping_interval else 0
+            drivers = [
+                asyncio.create_task(run_at_rate(ping_rate, self.send_ping, stop)),
+                asyncio.create_task(run_at_rate(self.typing_rate, self.send_typing, stop)),
+                asyncio.create_task(run_at_rate(self.message_rate, self.send_message, stop)),
+            ]
+            deadline = time.perf_counter() + self.duration
+            while time.perf_counter() < deadline:
+                await asyncio.sleep(min(1.0, max(0.0, deadline - time.perf_counter())))
+                self.expire_sent()
+            stop.set()
+            await asyncio.gather(*drivers, return_exceptions=True)
+            await asyncio.sleep(1)  # let in-flight fan-out arrive
+        finally:
+            self.stopping = True
+            await asyncio.gather(*(c.ws.close() for c in self.connections), return_exceptions=True)
+            await asyncio.gather(*self.readers, return_exceptions=True)
+            await asyncio.gather(*self.posts, return_exceptions=True)
+            await self.client.close()
+
+        return self.print_report()
+
+    def print_report(self) -> bool:
+        print("\n" + "=" * 80)
+        print("🔌 WEBSOCKET FAN-OUT SUMMARY")
+        print("=" * 80)
+
+        connected = len(self.connections)
+        print(f"Connections: {connected}/{self.clients} in {self.ramp_seconds:.1f}s "
+              f"({connected / max(self.ramp_seconds, 1e-9):.0f}/s), {self.connect_failures} failed, "
+              f"{self.disconnects} dropped during the run")
+        print(f"Handshake: p50 {self.connect_us.percentile(50) / 1000:.1f}ms, "
+              f"p99 {self.connect_us.percentile(99) / 1000:.1f}ms, max {self.connect_us.max / 1000:.1f}ms")
+
+        for side in ("client", "server"):
+            before, after = self.memory.get(f"{side}_before"), self.memory.get(f"{side}_after")
+            if before is not None and after is not None and connected:
+                print(f"{side.capitalize()} memory: {before / 1024:.1f}MB -> {after / 1024:.1f}MB "
+                      f"({(after - before) / connected:.1f}kB per connection)")
+
+        print(f"\n{'Event':<16} {'Delivered':>10} {'p50':>9} {'p90':>9} {'p99':>9} {'Max':>9}")
+        for event, histogram in self.latency_us.items():
+            values = [histogram.percentile(p) / 1000 for p in (50, 90, 99)] + [histogram.max / 1000]
+            print(f"{event:<16} {histogram.total:>10} " + " ".join(f"{ms:>7.1f}ms" for ms in values))
+
+        if self.storm_results:
+            print(f"\n{'Storm rate':<12} {'Opened':>8} {'Failed':>8} {'p99 handshake':>14} {'Took':>7}")
+            survived = 0
+            for rate, opened, failed, p99_ms, elapsed in self.storm_results:
+                print(f"{rate:>8}/s   {opened:>8} {failed:>8} {p99_ms:>12.1f}ms {elapsed:>6.1f}s")
+                if failed <= rate * 0.01:
+                    survived = max(survived, rate)
+            print(f"Highest storm rate with <1% failed handshakes: {survived}/s")
+
+        print("\n" + "=" * 80)
+        return self.connect_failures == 0 and self.disconnects == 0
+
+
+class PdfBenchmark:
+    """Concurrent /booking-lookup/download-confirmation downloads streamed in chunks.
+
+    Bodies are counted and discarded chunk by chunk, never buffered. PDFKit pipes the
+    document into the response as it is rendered, so the gap between the first and
+    last body byte approximates server-side generation time unless the server sends
+    a Server-Timing header.
+    """
+    def __init__(self, base_url: str, concurrency: int = 20, duration: float = 30.0, pool: int = 20,
+                 codes_file: str = None, chunk_size: int = 16384):
+        self.client = AsyncHttpClient(base_url, pool_size=concurrency)
+        self.concurrency = concurrency
+        self.duration = duration
+        self.pool = pool
+        self.codes_file = codes_file
+        self.chunk_size = chunk_size
+        self.codes: List[tuple] = []
+        self.ttfb_us = Histogram()
+        self.generation_us = Histogram()
+        self.total_us = Histogram()
+        self.downloads = 0
+        self.failures = 0
+        self.bytes = 0
+
+    def load_codes(self):
+        """Read `CODE,email` lines from the codes file"""
+        with open(self.codes_file) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    code, email = [part.strip() for part in line.split(",", 1)]
+                    self.codes.append((code, email))
+
+    async def create_bookings(self, start: str = "2031-01-01"):
+        """Create `pool` two-night bookings on consecutive free dates to download confirmations for"""
+        first = datetime.date.fromisoformat(start)
+        for i in range(self.pool):
+            check_in = first + datetime.timedelta(days=3 * i)
+            email = f"pdf-bench-{i}@loadtest.local"
+            response = await self.client.request("POST", "/bookings", {
+                "guestFirstName": "Pdf",
+                "guestLastName": f"Bench {i}",
+                "guestEmail": email,
+                "guestCountry": "Italy",
+                "guestPhone": "123456789",
+                "checkInDate": check_in.isoformat(),
+                "checkOutDate": (check_in + datetime.timedelta(days=2)).isoformat(),
+                "guests": 2,
+                "paymentMethod": "property",
+                "createdBy": "guest"
+            })
+            if response.status_code in (200, 201):
+                self.codes.append((response.json()["confirmationCode"], email))
+            else:
+                print(f"⚠️ Could not create booking {i}: HTTP {response.status_code}")
+
+    async def download(self, code: str, email: str):
+        start = time.perf_counter()
+        try:
+            result = await self.client.stream("POST", "/booking-lookup/download-confirmation",
+                                              {"confirmationCode": code, "email": email}, self.chunk_size)
+        except Exception:
+            self.failures += 1
+            return
+        if result.status_code != 200 or "application/pdf" not in result.headers.get("Content-Type", ""):
+            self.failures += 1
+            return
+
+        self.downloads += 1
+        self.bytes += result.size
+        self.ttfb_us.record(result.ttfb * 1_000_000)
+        self.total_us.record((time.perf_counter() - start) * 1_000_000)
+        server_timing = re.search(r"dur=([\d.]+)", result.headers.get("Server-Timing", ""))
+        if server_timing:
+            self.generation_us.record(float(server_timing.group(1)) * 1000)
+        elif result.first_byte is not None:
+            self.generation_us.record((result.last_byte - result.first_byte) * 1_000_000)
+
+    async def run(self) -> bool:
+        await self.client.start()
+        try:
+            if self.codes_file:
+                self.load_codes()
+            else:
+                print(f"📝 Creating {self.pool} bookings for the download pool...")
+                await self.create_bookings()
+            if not self.codes:
+                print("❌ No confirmation codes available")
+                return False
+
+            print(f"📄 Downloading confirmations with {self.concurrency} concurrent clients for {self.duration:.0f}s...")
+            deadline = time.perf_counter() + self.duration
+
+            async def worker(index: int):
+                cursor = index
+                while time.perf_counter() < deadline:
+                    code, email = self.codes[cursor % len(self.codes)]
+                    cursor += self.concurrency
+                    await self.download(code, email)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(i) for i in range(self.concurrency)))
+            elapsed = time.perf_counter() - started
+        finally:
+            await self.client.close()
+
+        return self.print_report(elapsed)
+
+    def print_report(self, elapsed: float) -> bool:
+        print("\n" + "=" * 80)
+        print("📄 PDF DOWNLOAD SUMMARY")
+        print("=" * 80)
+        print(f"Downloads: {self.downloads} in {elapsed:.1f}s ({self.downloads / elapsed:.1f} PDFs/s), {self.failures} failed")
+        print(f"Throughput: {self.bytes / elapsed / 1024:.1f} kB/s, "
+              f"average PDF {self.bytes / max(self.downloads, 1) / 1024:.1f} kB")
+        print(f"\n{'Timing':<20} {'p50':>9} {'p90':>9} {'p99':>9} {'Max':>9}")
+        for label, histogram in (("Time to first byte", self.ttfb_us), ("Server generation", self.generation_us),
+                                 ("Total download", self.total_us)):
+            values = [histogram.percentile(p) / 1000 for p in (50, 90, 99)] + [histogram.max / 1000]
+            print(f"{label:<20} " + " ".join(f"{ms:>7.1f}ms" for ms in values))
+        print("\n" + "=" * 80)
+        return self.failures == 0
+
+
+SEED_FIRST_NAMES = ["Marco", "Giulia", "Luca", "Sofia", "Anna", "James", "Emma", "Lukas", "Chloé", "Hiro", "Olivia", "Mateo"]
+SEED_LAST_NAMES = ["Rossi", "Bianchi", "Smith", "Müller", "Dubois", "Tanaka", "García", "Johnson", "Costa", "Novak"]
+SEED_COUNTRIES = ["Italy", "United States", "Germany", "France", "United Kingdom", "Japan", "Spain", "Brazil"]
+SEED_MESSAGES = [
+    "Hi, is early check-in possible?",
+    "Thanks, that works for us.",
+    "Could you recommend a restaurant nearby?",
+    "We will arrive by water taxi around 3pm.",
+    "Is there a washing machine in the apartment?",
+    "Can we leave our luggage after check-out?",
+    "The WiFi password is on the fridge door.",
+    "Of course, see you soon!",
+]
+
+
+class DataSeeder:
+    """Deterministic, resumable bulk seeder for bookings, conversations and message histories.
+
+    Everything is derived from `seed`: the same seed always yields the same guests, the
+    same non-overlapping stay layout starting at `start_date` and the same messages.
+    `density` optionally cycles a target occupancy per calendar month (e.g. [0.1, 0.5, 0.9])
+    so read paths can be measured against months of different booking counts.
+    Progress is checkpointed to `state_file`, so an interrupted run picks up where it
+    stopped and never creates a record twice.
+    """
+    def __init__(self, base_url: str, seed: int = 1, bookings: int = 10000, conversations: int = 1000,
+                 messages: int = 50, start_date: str = "2030-01-01", concurrency: int = 20, state_file: str = None,
+                 density: List[float] = None):
+        self.client = AsyncHttpClient(base_url, pool_size=concurrency)
+        self.seed = seed
+        self.bookings = bookings
+        self.conversations = conversations
+        self.messages = messages
+        self.start_date = datetime.date.fromisoformat(start_date)
+        self.concurrency = concurrency
+        self.state_file = state_file or f"seed_state_{seed}.json"
+        self.density = density
+        self.state = {"seed": seed, "density": density, "bookings_done": [], "conversations": {}}
+        self.done_bookings = set()
+        self.created = {"bookings": 0, "conflicts": 0, "conversations": 0, "messages": 0, "errors": 0}
+        self.last_checkpoint = time.perf_counter()
+
+    def booking_plan(self):
+        """Yield (index, payload) for every booking; stays never overlap and only depend on the seed"""
+        rng = random.Random(self.seed)
+        check_in = self.start_date
+        for index in range(self.bookings):
+            if self.density:
+                nights = rng.choice((1, 2, 2, 3, 3, 4, 5, 7))
+                check_in += datetime.timedelta(days=self.gap_before(rng, check_in, nights))
+            else:
+                check_in += datetime.timedelta(days=rng.choice((0, 0, 1, 2)))
+                nights = rng.choice((1, 2, 2, 3, 3, 4, 5, 7))
+            check_out = check_in + datetime.timedelta(days=nights)
+            first, last = rng.choice(SEED_FIRST_NAMES), rng.choice(SEED_LAST_NAMES)
+            payload = {
+                "guestFirstName": first,
+                "guestLastName": last,
+                "guestEmail": f"seed{self.seed}-b{index}@loadtest.local",
+                "guestCountry": rng.choice(SEED_COUNTRIES),
+                "guestPhone": f"+39 3{rng.randrange(10**8, 10**9)}",
+                "checkInDate": check_in.isoformat(),
+                "checkOutDate": check_out.isoformat(),
+                "guests": rng.randint(1, 5),
+                "hasPet": rng.random() < 0.1,
+                "paymentMethod": "property",
+                "createdBy": "guest"
+            }
+            check_in = check_out
+            yield index, payload
+
+    def gap_before(self, rng: random.Random, day: datetime.date, nights: int) -> int:
+        """Free days before the next stay, drawn day by day so each month converges on its target occupancy"""
+        gap = 0
+        while True:
+            current = day + datetime.timedelta(days=gap)
+            months = (current.year - self.start_date.year) * 12 + current.month - self.start_date.month
+            occupancy = min(max(self.density[months % len(self.density)], 0.01), 1.0)
+            if occupancy >= 1.0 or rng.random() < occupancy / (nights * (1 - occupancy) + occupancy):
+                return gap
+            gap += 1
+
+    def conversation_plan(self, index: int) -> List[Dict]:
+        """Opening message followed by the alternating guest/admin history of one conversation"""
+        rng = random.Random(f"{self.seed}-conversation-{index}")
+        name = f"{rng.choice(SEED_FIRST_NAMES)} {rng.choice(SEED_LAST_NAMES)}"
+        email = f"seed{self.seed}-c{index}@loadtest.local"
+        history = [{"message": rng.choice(SEED_MESSAGES), "guestName": name, "guestEmail": email}]
+        for n in range(self.messages):
+            message = {"content": f"{rng.choice(SEED_MESSAGES)} (#{n + 1})"}
+            if n % 2 == 0:
+                message.update(senderName=name, senderEmail=email)
+            history.append(message)
+        return history
+
+    def load_state(self):
+        if os.path.exists(self.state_file):
+            with open(self.state_file) as f:
+                state = json.load(f)
+            if state.get("seed") != self.seed:
+                raise ValueError(f"{self.state_file} belongs to seed {state.get('seed')}, not {self.seed}")
+            if state.get("density") != self.density:
+                raise ValueError(f"{self.state_file} was seeded with density {state.get('density')}, not {self.density}")
+            self.state = state
+            self.done_bookings = set(state["bookings_done"])
+            print(f"♻️ Resuming from {self.state_file}: {len(self.done_bookings)} bookings, "
+                  f"{len(state['conversations'])} conversations already seeded")
+
+    def save_state(self, force: bool = False):
+        if not force and time.perf_counter() - self.last_checkpoint < 5:
+            return
+        self.state["bookings_done"] = sorted(self.done_bookings)
+        with open(f"{self.state_file}.tmp", "w") as f:
+            json.dump(self.state, f)
+        os.replace(f"{self.state_file}.tmp", self.state_file)
+        self.last_checkpoint = time.perf_counter()
+
+    async def seed_booking(self, index: int, payload: Dict):
+        try:
+            response = await self.client.request("POST", "/bookings", payload)
+        except Exception:
+            self.created["errors"] += 1
+            return
+        if response.status_code in (200, 201):
+            self.created["bookings"] += 1
+        elif response.status_code == 400 and "not available" in response.text:
+            # Dates already taken by pre-existing data: nothing to retry
+            self.created["conflicts"] += 1
+        else:
+            self.created["errors"] += 1
+            return
+        self.done_bookings.add(index)
+        self.save_state()
+
+    async def seed_conversation(self, index: int):
+        key = str(index)
+        history = self.conversation_plan(index)
+        conversation_id, sent = self.state["conversations"].get(key, (None, 0))
+        try:
+            if conversation_id is None:
+                response = await self.client.request("POST", "/chat/start", history[0])
+                if response.status_code != 200:
+                    self.created["errors"] += 1
+                    return
+                conversation_id, sent = response.json()["conversationId"], 1
+                self.state["conversations"][key] = [conversation_id, sent]
+                self.created["conversations"] += 1
+
+            # Messages go out in order so the history stays chronological
+            for message in history[sent:]:
+                response = await self.client.request("POST", "/chat/send", {"conversationId": conversation_id, **message})
+                if response.status_code != 200:
+                    self.created["errors"] += 1
+                    return
+                sent += 1
+                self.state["conversations"][key] = [conversation_id, sent]
+                self.created["messages"] += 1
+                self.save_state()
+        except Exception:
+            self.created["errors"] += 1
+
+    async def run_queue(self, jobs):
+        """Run coroutine factories from `jobs` with at most `concurrency` in flight"""
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def worker():
+            while True:
+                job = await queue.get()
+                if job is None:
+                    return
+                await job()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        for job in jobs:
+            await queue.put(job)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+
+    async def run(self) -> bool:
+        self.load_state()
+        await self.client.start()
+        started = time.perf_counter()
+        try:
+            print(f"🌱 Seeding {self.bookings} bookings from {self.start_date} (seed {self.seed})...")
+            await self.run_queue(
+                (lambda i=index, p=payload: self.seed_booking(i, p))
+                for index, payload in self.booking_plan() if index not in self.done_bookings
+            )
+            print(f"💬 Seeding {self.conversations} conversations with {self.messages} messages each...")
+            await self.run_queue(
+                (lambda i=index: self.seed_conversation(i))
+                for index in range(self.conversations)
+                if self.state["conversations"].get(str(index), (None, 0))[1] < self.messages + 1
+            )
+        finally:
+            self.save_state(force=True)
+            await self.client.close()
+
+        elapsed = time.perf_counter() - started
+        total = self.created["bookings"] + self.created["conversations"] + self.created["messages"]
+        print("\n" + "=" * 80)
+        print("🌱 SEED SUMMARY")
+        print("=" * 80)
+        print(f"Bookings created: {self.created['bookings']} ({self.created['conflicts']} skipped, dates taken)")
+        print(f"Conversations created: {self.created['conversations']}")
+        print(f"Messages sent: {self.created['messages']}")
+        print(f"Errors (retried on the next run): {self.created['errors']}")
+        print(f"Elapsed: {elapsed:.1f}s ({total / elapsed:.1f} records/s), state saved to {self.state_file}")
+        print("\n" + "=" * 80)
+        return self.created["errors"] == 0
+
+
+DEFAULT_SCENARIO_MIX = {
+    "rate": 5,
+    "duration": 60,
+    "scenarios": [
+        {
+            "name": "guest_booking",
+            "weight": 3,
+            "steps": [
+                {"method": "GET", "path": "/pricing", "think": [1, 3]},
+                {"method": "GET", "path": "/bookings/dates", "think": [2, 5]},
+                {"method": "POST", "path": "/bookings/calculate-pricing", "think": [1, 4],
+                 "json": {"checkInDate": "{checkIn}", "checkOutDate": "{checkOut}", "guests": "{guests}"}},
+                {"method": "POST", "path": "/bookings", "expect": [200, 201], "think": [5, 15],
+                 "json": {"guestFirstName": "Load", "guestLastName": "Test {session}", "guestEmail": "{email}",
+                          "guestCountry": "Italy", "guestPhone": "123456789", "checkInDate": "{checkIn}",
+                          "checkOutDate": "{checkOut}", "guests": "{guests}", "paymentMethod": "property",
+                          "createdBy": "guest"},
+                 "save": {"code": "confirmationCode"}},
+                {"method": "POST", "path": "/booking-lookup/find",
+                 "json": {"confirmationCode": "{code}", "email": "{email}"}}
+            ]
+        },
+        {
+            "name": "guest_browse",
+            "weight": 10,
+            "steps": [
+                {"method": "GET", "path": "/pricing", "think": [1, 3]},
+                {"method": "GET", "path": "/bookings/calendar/{year}/{month}", "think": [2, 6]},
+                {"method": "GET", "path": "/bookings/dates"}
+            ]
+        },
+        {
+            "name": "guest_chat",
+            "weight": 2,
+            "steps": [
+                {"method": "POST", "path": "/chat/start", "think": [3, 10],
+                 "json": {"message": "Hello, is the apartment free next week?", "guestName": "Load Guest",
+                          "guestEmail": "{email}"},
+                 "save": {"conversation": "conversationId"}},
+                {"method": "POST", "path": "/chat/send", "think": [2, 5],
+                 "json": {"conversationId": "{conversation}", "content": "Thanks!", "senderName": "Load Guest",
+                          "senderEmail": "{email}"}},
+                {"method": "GET", "path": "/chat/conversation/{conversation}"}
+            ]
+        },
+        {
+            "name": "admin_polling",
+            "weight": 1,
+            "repeat": 6,
+            "steps": [
+                {"method": "GET", "path": "/chat/admin/conversations", "expect": [200, 401, 403]},
+                {"method": "GET", "path": "/chat/unread-count", "think": [4, 6]}
+            ]
+        }
+    ]
+}
+
+
+def load_scenario_mix(path: str = None) -> Dict:
+    """Read a scenario mix from JSON or YAML, falling back to DEFAULT_SCENARIO_MIX"""
+    if not path:
+        return DEFAULT_SCENARIO_MIX
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise RuntimeError("YAML scenario files require PyYAML (pip install pyyaml)")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def render_template(value, variables: Dict):
+    """Substitute {name} placeholders in strings, lists and dicts; a bare "{name}" keeps the variable's type"""
+    if isinstance(value, str):
+        match = re.fullmatch(r"\{(\w+)\}", value)
+        if match and match.group(1) in variables:
+            return variables[match.group(1)]
+        return re.sub(r"\{(\w+)\}", lambda m: str(variables.get(m.group(1), m.group(0))), value)
+    if isinstance(value, list):
+        return [render_template(item, variables) for item in value]
+    if isinstance(value, dict):
+        return {key: render_template(item, variables) for key, item in value.items()}
+    return value
+
+
+def extract_path(data, dotted: str):
+    """Follow a dotted path such as `booking.confirmationCode` through decoded JSON"""
+    for part in dotted.split("."):
+        if isinstance(data, list) and part.isdigit():
+            data = data[int(part)] if int(part) < len(data) else None
+        elif isinstance(data, dict):
+            data = data.get(part)
+        else:
+            return None
+    return data
+
+
+class ScenarioStats:
+    """Outcome counts for one scenario of the mix"""
+    def __init__(self):
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.failures: Dict[str, int] = {}
+        self.duration_us = Histogram()
+
+    def snapshot(self) -> tuple:
+        return self.started, self.completed, self.failed, self.failures, self.duration_us.to_sparse()
+
+    def merge_snapshot(self, snapshot: tuple):
+        started, completed, failed, failures, duration = snapshot
+        self.started += started
+        self.completed += completed
+        self.failed += failed
+        for reason, count in failures.items():
+            self.failures[reason] = self.failures.get(reason, 0) + count
+        self.duration_us.merge_sparse(duration)
+
+
+class ScenarioRunner:
+    """Replays a weighted mix of declarative user journeys as an open-model arrival process.
+
+    Sessions arrive as a Poisson process at `rate` per second independent of how fast
+    earlier sessions finish, so a slow server accumulates concurrent sessions the way
+    production does instead of throttling the load. Each session picks a scenario by
+    weight and walks its steps with think times, carrying cookies and saved values.
+    """
+    def __init__(self, base_url: str, mix: Dict, rate: float = None, duration: float = None,
+                 max_sessions: int = 5000, pool_size: int = 100, seed: int = None, keepalive_timeout: float = 15.0,
+                 force_close: bool = False):
+        self.client = AsyncHttpClient(base_url, pool_size=pool_size, keepalive_timeout=keepalive_timeout,
+                                      force_close=force_close)
+        self.scenarios = mix["scenarios"]
+        self.weights = [scenario.get("weight", 1) for scenario in self.scenarios]
+        self.rate = rate or mix.get("rate", 5)
+        self.duration = duration or mix.get("duration", 60)
+        self.max_sessions = max_sessions
+        self.rng = random.Random(seed)
+        self.stats = {scenario["name"]: ScenarioStats() for scenario in self.scenarios}
+        self.active = 0
+        self.dropped = 0
+        self.verbose = True
+
+    def session_variables(self, session_id: int) -> Dict:
+        check_in = datetime.date.today() + datetime.timedelta(days=self.rng.randint(30, 700))
+        return {
+            "session": session_id,
+            "email": f"load-{session_id}-{self.rng.randrange(10**6)}@loadtest.local",
+            "checkIn": check_in.isoformat(),
+            "checkOut": (check_in + datetime.timedelta(days=self.rng.randint(1, 7))).isoformat(),
+            "guests": self.rng.randint(1, 5),
+            "year": check_in.year,
+            "month": check_in.month,
+        }
+
+    def think(self, think) -> float:
+        if isinstance(think, (list, tuple)):
+            return self.rng.uniform(think[0], think[1])
+        return float(think or 0)
+
+    async def run_session(self, scenario: Dict, session_id: int):
+        stats = self.stats[scenario["name"]]
+        stats.started += 1
+        variables = self.session_variables(session_id)
+        cookies = {}
+        started = time.perf_counter()
+        try:
+            for _ in range(scenario.get("repeat", 1)):
+                for step in scenario["steps"]:
+                    path = render_template(step["path"], variables)
+                    body = render_template(step.get("json"), variables)
+                    try:
+                        response = await self.client.request(step.get("method", "GET"), path, body,
+                                                              step.get("headers"), cookies)
+                    except Exception as e:
+                        return self.fail(stats, f"{step['path']}: {type(e).__name__}")
+                    cookies.update(response.cookies)
+
+                    expected = step.get("expect")
+                    if (expected and response.status_code not in expected) or \
+                            (not expected and response.status_code >= 400):
+                        return self.fail(stats, f"{step['path']}: HTTP {response.status_code}")
+                    for name, dotted in step.get("save", {}).items():
+                        try:
+                            variables[name] = extract_path(response.json(), dotted)
+                        except ValueError:
+                            return self.fail(stats, f"{step['path']}: invalid JSON")
+                    await asyncio.sleep(self.think(step.get("think")))
+            stats.completed += 1
+            stats.duration_us.record((time.perf_counter() - started) * 1_000_000)
+        finally:
+            self.active -= 1
+
+    def fail(self, stats: ScenarioStats, reason: str):
+        stats.failed += 1
+        stats.failures[reason] = stats.failures.get(reason, 0) + 1
+
+    async def execute(self) -> tuple:
+        """Generate arrivals for `duration` seconds, wait for the sessions, return (arrivals, arrival time, total time)"""
+        await self.client.start()
+        sessions = set()
+        if self.verbose:
+            print(f"🎭 Scenario mix: {len(self.scenarios)} journeys at {self.rate} sessions/s for {self.duration:.0f}s")
+        started = time.perf_counter()
+        try:
+            session_id = 0
+            next_at = started
+            while next_at - started < self.duration:
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                next_at += self.rng.expovariate(self.rate)
+                session_id += 1
+                if self.active >= self.max_sessions:
+                    self.dropped += 1
+                    continue
+                scenario = self.rng.choices(self.scenarios, self.weights)[0]
+                self.active += 1
+                task = asyncio.create_task(self.run_session(scenario, session_id))
+                sessions.add(task)
+                task.add_done_callback(sessions.discard)
+            arrivals_elapsed = time.perf_counter() - started
+            if self.verbose:
+                print(f"⏳ Arrivals finished, waiting for {len(sessions)} sessions in flight...")
+            await asyncio.gather(*sessions, return_exceptions=True)
+        finally:
+            await self.client.close()
+        return session_id, arrivals_elapsed, time.perf_counter() - started
+
+    async def run(self, export: ResultsExport = None, sampler: ResourceSampler = None) -> bool:
+        if export:
+            export.attach(self.client.metrics)
+        sampling_done = asyncio.Event()
+        sampling = asyncio.create_task(sampler.run(self.client.metrics, sampling_done)) if sampler else None
+        try:
+            arrivals, arrivals_elapsed, elapsed = await self.execute()
+        finally:
+            if sampling:
+                sampling_done.set()
+                await sampling
+        success = self.print_report(arrivals, arrivals_elapsed, elapsed)
+        if sampler:
+            sampler.print_report()
+        return export.finish(self.client.metrics, elapsed) and success if export else success
+
+    def print_report(self, arrivals: int, arrivals_elapsed: float, elapsed: float) -> bool:
+        print("\n" + "=" * 80)
+        print("🎭 SCENARIO MIX SUMMARY")
+        print("=" * 80)
+        print(f"Arrivals: {arrivals} in {arrivals_elapsed:.1f}s ({arrivals / arrivals_elapsed:.2f}/s, target {self.rate}/s), "
+              f"{self.dropped} dropped at the {self.max_sessions}-session cap")
+        print(f"Requests: {self.client.metrics.total_requests()} ({self.client.metrics.total_requests() / elapsed:.1f} req/s)")
+
+        print(f"\n{'Scenario':<20} {'Started':>8} {'Done':>8} {'Failed':>8} {'p50 session':>12} {'p99 session':>12}")
+        failed = 0
+        for name, stats in self.stats.items():
+            failed += stats.failed
+            print(f"{name:<20} {stats.started:>8} {stats.completed:>8} {stats.failed:>8} "
+                  f"{stats.duration_us.percentile(50) / 1_000_000:>11.1f}s {stats.duration_us.percentile(99) / 1_000_000:>11.1f}s")
+            for reason, count in sorted(stats.failures.items(), key=lambda item: -item[1])[:5]:
+                print(f"  • {reason}: {count}")
+
+        print_latency_table(self.client.metrics, elapsed)
+        print_connection_table(self.client.metrics)
+        print("\n" + "=" * 80)
+        return failed == 0 and self.dropped == 0
+
+
+def load_worker(index: int, processes: int, options: Dict, results):
+    """Entry point of one load process: run its share of the load and stream metric deltas to the coordinator"""
+    random.seed(f"{options.get('seed')}-worker-{index}")
+    try:
+        asyncio.run(_load_worker_main(index, processes, options, results))
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        results.put(("error", index, f"{type(e).__name__}: {e}"))
+
+
+async def _load_worker_main(index: int, processes: int, options: Dict, results):
+    if options["scenarios"]:
+        mix = load_scenario_mix(options["scenario_file"])
+        runner = ScenarioRunner(options["base_url"], mix, rate=(options["rate"] or mix.get("rate", 5)) / processes,
+                                duration=options["duration"], pool_size=options["pool_size"],
+                                seed=hash((options.get("seed"), index)),
+                                keepalive_timeout=options.get("keep_alive_timeout", 15.0),
+                                force_close=options.get("no_keep_alive", False))
+        runner.verbose = False
+        client = runner.client
+        work = runner.execute()
+    else:
+        users = options["users"] // processes + (1 if index < options["users"] % processes else 0)
+        client = AsyncHttpClient(options["base_url"], pool_size=options["pool_size"],
+                                 keepalive_timeout=options.get("keep_alive_timeout", 15.0),
+                                 force_close=options.get("no_keep_alive", False))
+        await client.start()
+        sessions = None
+        if options.get("credentials"):
+            sessions = SessionPool(options["credentials"], options["session_cache"], options["session_max_age"])
+            await sessions.start(client)
+            client.metrics = RequestMetrics()
+        work = drive_virtual_users(client, users, options["duration"], options["ramp_up"], sessions)
+
+    export = ResultsExport.from_options(options)
+    export.attach(client.metrics, worker=index)
+
+    async def flush():
+        while True:
+            await asyncio.sleep(MULTIPROCESS_FLUSH_INTERVAL)
+            results.put(("metrics", index, client.metrics.drain()))
+
+    flusher = asyncio.create_task(flush())
+    try:
+        outcome = await work
+    finally:
+        flusher.cancel()
+        export.detach(client.metrics)
+        if not options["scenarios"]:
+            await client.close()
+    results.put(("metrics", index, client.metrics.drain()))
+
+    if options["scenarios"]:
+        arrivals, arrivals_elapsed, elapsed = outcome
+        results.put(("done", index, {
+            "arrivals": arrivals, "arrivals_elapsed": arrivals_elapsed, "elapsed": elapsed,
+            "dropped": runner.dropped,
+            "scenarios": {name: stats.snapshot() for name, stats in runner.stats.items()}
+        }))
+    else:
+        results.put(("done", index, {"elapsed": outcome}))
+
+
+async def prime_session_cache(options: Dict):
+    """Log every account in once so the worker processes start from the cached cookies"""
+    client = AsyncHttpClient(options["base_url"], pool_size=4)
+    await client.start()
+    try:
+        await SessionPool(options["credentials"], options["session_cache"], options["session_max_age"]).start(client)
+    finally:
+        await client.close()
+
+
+def run_multiprocess(options: Dict, processes: int) -> bool:
+    """Fan --load or --scenarios out over `processes` worker processes and merge their histograms into one report.
+
+    Each worker runs its own event loop and connection pool and sends a drained
+    metrics snapshot (sparse histogram buckets, not per-request samples) every
+    MULTIPROCESS_FLUSH_INTERVAL seconds.
+    """
+    if options.get("credentials") and not options["scenarios"]:
+        asyncio.run(prime_session_cache(options))
+
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=load_worker, args=(i, processes, options, results), daemon=True)
+               for i in range(processes)]
+    mode = "scenario mix" if options["scenarios"] else f"{options['users']} virtual users"
+    print(f"🚀 Multi-process load: {mode} across {processes} processes")
+    for worker in workers:
+        worker.start()
+
+    merged = RequestMetrics()
+    finished: Dict[int, Dict] = {}
+    failed: Dict[int, str] = {}
+    started = last_progress = time.perf_counter()
+    window_requests = 0
+    try:
+        while len(finished) + len(failed) < processes:
+            try:
+                kind, index, payload = results.get(timeout=1.0)
+            except Empty:
+                if not any(worker.is_alive() for worker in workers):
+                    break
+                continue
+            if kind == "metrics":
+                merged.merge_snapshot(payload)
+                window_requests += sum(endpoint[0] for endpoint in payload["endpoints"].values())
+            elif kind == "done":
+                finished[index] = payload
+            else:
+                failed[index] = payload
+                print(f"❌ Worker {index} failed: {payload}")
+
+            now = time.perf_counter()
+            if now - last_progress >= 5:
+                print(f"⏱️ {now - started:.0f}s: {window_requests / (now - last_progress):.0f} req/s "
+                      f"across {processes - len(finished) - len(failed)} workers")
+                last_progress, window_requests = now, 0
+    finally:
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+
+    if not finished:
+        print("❌ No worker finished")
+        return False
+
+    if options["scenarios"]:
+        mix = load_scenario_mix(options["scenario_file"])
+        report = ScenarioRunner(options["base_url"], mix, rate=options["rate"], duration=options["duration"])
+        report.client.metrics = merged
+        for payload in finished.values():
+            report.dropped += payload["dropped"]
+            for name, snapshot in payload["scenarios"].items():
+                report.stats[name].merge_snapshot(snapshot)
+        success = report.print_report(
+            sum(payload["arrivals"] for payload in finished.values()),
+            max(payload["arrivals_elapsed"] for payload in finished.values()),
+            max(payload["elapsed"] for payload in finished.values())
+        )
+    else:
+        success = print_load_report(merged, max(payload["elapsed"] for payload in finished.values()))
+    success = ResultsExport.from_options(options).finish(merged, max(p["elapsed"] for p in finished.values())) and success
+    return success and not failed
+
+
+def load_cookie_file(path: str) -> Dict[str, str]:
+    """Read a curl/Netscape cookie jar such as admin_cookies.txt into a name -> value dict"""
+    jar = http.cookiejar.MozillaCookieJar()
+    jar.load(path, ignore_discard=True, ignore_expires=True)
+    return {cookie.name: cookie.value for cookie in jar}
+
+
+BLOCKING_STATUSES = ("confirmed", "checked_in")
+
+
+async def fire_race_jobs(client: AsyncHttpClient, jobs: List[Dict], cookies: Dict, wait_for_start) -> List[tuple]:
+    """Warm the pool, wait at the start barrier, then send every job at once.
+
+    Returns (kind, status, latency, check_in, check_out, booking_id) per job.
+    """
+    await asyncio.gather(*(client.request("GET", "/health") for _ in range(min(len(jobs), client.pool_size or len(jobs)))),
+                         return_exceptions=True)
+    await wait_for_start()
+
+    async def send(job: Dict) -> tuple:
+        start = time.perf_counter()
+        try:
+            if job["kind"] == "create":
+                response = await client.request("POST", "/bookings", job["payload"])
+            else:
+                response = await client.request("PUT", f"/bookings/{job['booking_id']}/edit-dates", {
+                    "newCheckInDate": job["check_in"], "newCheckOutDate": job["check_out"]
+                }, cookies=cookies)
+            status = response.status_code
+            booking_id = response.json().get("id") if status in (200, 201) and job["kind"] == "create" else job.get("booking_id")
+        except Exception:
+            status, booking_id = 0, None
+        return job["kind"], status, time.perf_counter() - start, job["check_in"], job["check_out"], booking_id
+
+    return await asyncio.gather(*(send(job) for job in jobs))
+
+
+def race_worker(index: int, options: Dict, jobs: List[Dict], cookies: Dict, barrier, results):
+    """One process of a multi-process booking race: fire its share of jobs once every process is at the barrier"""
+    async def main():
+        client = AsyncHttpClient(options["base_url"], pool_size=len(jobs) or 1)
+        await client.start()
+        try:
+            loop = asyncio.get_running_loop()
+            return await fire_race_jobs(client, jobs, cookies, lambda: loop.run_in_executor(None, barrier.wait))
+        finally:
+            await client.close()
+
+    try:
+        results.put(("done", index, asyncio.run(main())))
+    except Exception as e:
+        results.put(("error", index, f"{type(e).__name__}: {e}"))
+
+
+class BookingRace:
+    """Contention test for availability: many overlapping bookings and date edits released at the same instant.
+
+    Creates target a short date window so most requests collide; edits move bookings
+    parked outside the window into it (they need admin cookies, see --cookies). After
+    the burst the calendar and /api/bookings/dates are read back and any night held by
+    two confirmed bookings is reported as a double-booking.
+    """
+    def __init__(self, base_url: str, requests: int = 200, edits: int = 20, start_date: str = "2032-06-01",
+                 window_days: int = 10, seed: int = 1, cookies: Dict = None, processes: int = 1):
+        self.base_url = base_url
+        self.requests = requests
+        self.edits = edits if cookies else 0
+        self.window_start = datetime.date.fromisoformat(start_date)
+        self.window_days = window_days
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.cookies = cookies or {}
+        self.processes = max(1, processes)
+        self.client = AsyncHttpClient(base_url, pool_size=max(requests + self.edits, 1))
+
+    def random_stay(self) -> tuple:
+        check_in = self.window_start + datetime.timedelta(days=self.rng.randrange(self.window_days))
+        return check_in.isoformat(), (check_in + datetime.timedelta(days=self.rng.randint(1, 4))).isoformat()
+
+    def create_jobs(self) -> List[Dict]:
+        jobs = []
+        for i in range(self.requests):
+            check_in, check_out = self.random_stay()
+            jobs.append({"kind": "create", "check_in": check_in, "check_out": check_out, "payload": {
+                "guestFirstName": "Race",
+                "guestLastName": f"Guest {i}",
+                "guestEmail": f"race{self.seed}-{i}@loadtest.local",
+                "guestCountry": "Italy",
+                "guestPhone": "123456789",
+                "checkInDate": check_in,
+                "checkOutDate": check_out,
+                "guests": 2,
+                "paymentMethod": "property",
+                "createdBy": "guest"
+            }})
+        return jobs
+
+    async def park_bookings(self) -> List[int]:
+        """Create the bookings that edit-dates requests will try to move into the window"""
+        parked = []
+        base = self.window_start + datetime.timedelta(days=self.window_days + 30)
+        for i in range(self.edits):
+            check_in = base + datetime.timedelta(days=4 * i)
+            response = await self.client.request("POST", "/bookings", {
+                "guestFirstName": "Race", "guestLastName": f"Parked {i}",
+                "guestEmail": f"race{self.seed}-parked-{i}@loadtest.local", "guestCountry": "Italy",
+                "guestPhone": "123456789", "checkInDate": check_in.isoformat(),
+                "checkOutDate": (check_in + datetime.timedelta(days=2)).isoformat(), "guests": 2,
+                "paymentMethod": "property", "createdBy": "guest"
+            })
+            if response.status_code in (200, 201):
+                parked.append(response.json()["id"])
+            else:
+                print(f"⚠️ Could not park booking {i}: HTTP {response.status_code}")
+        return parked
+
+    def fire_across_processes(self, jobs: List[Dict]) -> tuple:
+        """Split the jobs over worker processes that release together on a multiprocessing.Barrier.
+
+        Returns (records, failed workers). A worker that dies or has not reported back by
+        a deadline scaled to the race size counts as failed instead of hanging the race.
+        """
+        barrier = multiprocessing.Barrier(self.processes)
+        results = multiprocessing.Queue()
+        options = {"base_url": self.base_url}
+        workers = [multiprocessing.Process(target=race_worker, daemon=True,
+                                           args=(i, options, jobs[i::self.processes], self.cookies, barrier, results))
+                   for i in range(self.processes)]
+        for worker in workers:
+            worker.start()
+        records, failed = [], []
+        pending = set(range(self.processes))
+        deadline = time.monotonic() + 60 + 0.1 * len(jobs)
+        while pending and time.monotonic() < deadline:
+            try:
+                kind, index, payload = results.get(timeout=1.0)
+            except Empty:
+                dead = {i for i in pending if not workers[i].is_alive()}
+                for i in sorted(dead):
+                    print(f"❌ Race worker {i} died with exit code {workers[i].exitcode}")
+                failed.extend(sorted(dead))
+                pending -= dead
+                continue
+            pending.discard(index)
+            if kind == "error":
+                print(f"❌ Race worker {index} failed: {payload}")
+                failed.append(index)
+            else:
+                records.extend(payload)
+        for i in sorted(pending):
+            print(f"❌ Race worker {i} did not report back in time")
+            workers[i].terminate()
+            failed.append(i)
+        for worker in workers:
+            worker.join(timeout=5)
+        return records, failed
+
+    async def verify(self) -> tuple:
+        """Return (overlapping booking pairs, double-booked nights, confirmed nights missing from /bookings/dates)"""
+        window_end = self.window_start + datetime.timedelta(days=self.window_days + 4)
+        bookings = {}
+        month = self.window_start.replace(day=1)
+        while month <= window_end:
+            response = await self.client.request("GET", f"/bookings/calendar/{month.year}/{month.month}")
+            if response.status_code != 200:
+                raise RuntimeError(f"GET /bookings/calendar/{month.year}/{month.month} answered "
+                                   f"HTTP {response.status_code}, cannot check the calendar")
+            for booking in response.json():
+                bookings[booking["id"]] = booking
+            month = (month + datetime.timedelta(days=32)).replace(day=1)
+
+        blocking = sorted((b for b in bookings.values()
+                           if b.get("status") in BLOCKING_STATUSES or b.get("bookingSource") == "blocked"),
+                          key=lambda b: b["checkInDate"])
+        overlaps = []
+        holder = None
+        for booking in blocking:
+            if holder and booking["checkInDate"] < holder["checkOutDate"]:
+                overlaps.append((holder, booking))
+            if holder is None or booking["checkOutDate"] > holder["checkOutDate"]:
+                holder = booking
+
+        nights: Dict[str, int] = {}
+        confirmed_nights = set()  # /bookings/dates only expands status == "confirmed" bookings
+        for booking in blocking:
+            day = datetime.date.fromisoformat(booking["checkInDate"][:10])
+            end = datetime.date.fromisoformat(booking["checkOutDate"][:10])
+            while day < end:
+                nights[day.isoformat()] = nights.get(day.isoformat(), 0) + 1
+                if booking.get("status") == "confirmed":
+                    confirmed_nights.add(day.isoformat())
+                day += datetime.timedelta(days=1)
+        double_nights = sorted(day for day, count in nights.items() if count > 1)
+
+        response = await self.client.request("GET", "/bookings/dates")
+        if response.status_code != 200:
+            raise RuntimeError(f"GET /bookings/dates answered HTTP {response.status_code}, "
+                               f"cannot check the blocked dates")
+        blocked_dates = set(response.json())
+        missing = sorted(day for day in confirmed_nights if day not in blocked_dates)
+        return overlaps, double_nights, missing
+
+    async def run(self) -> bool:
+        await self.client.start()
+        try:
+            jobs = self.create_jobs()
+            if self.edits:
+                parked = await self.park_bookings()
+                for booking_id in parked:
+                    check_in, check_out = self.random_stay()
+                    jobs.append({"kind": "edit", "booking_id": booking_id, "check_in": check_in, "check_out": check_out})
+            else:
+                print("ℹ️ No --cookies given, skipping PUT /bookings/:id/edit-dates (admin only)")
+            self.rng.shuffle(jobs)
+
+            print(f"🏁 Releasing {len(jobs)} requests for {self.window_start} + {self.window_days} days "
+                  f"across {self.processes} process(es)...")
+            started = time.perf_counter()
+            failed_workers = []
+            if self.processes > 1:
+                records, failed_workers = await asyncio.get_running_loop().run_in_executor(
+                    None, self.fire_across_processes, jobs)
+            else:
+                gate = asyncio.Event()
+                asyncio.get_running_loop().call_later(0.05, gate.set)
+                records = await fire_race_jobs(self.client, jobs, self.cookies, gate.wait)
+            elapsed = time.perf_counter() - started
+
+            try:
+                overlaps, double_nights, missing = await self.verify()
+                verify_error = None
+            except RuntimeError as e:
+                overlaps, double_nights, missing, verify_error = [], [], [], str(e)
+        finally:
+            await self.client.close()
+
+        return self.print_report(records, elapsed, overlaps, double_nights, missing, failed_workers, verify_error)
+
+    def print_report(self, records: List[tuple], elapsed: float, overlaps: List, double_nights: List[str],
+                     missing: List[str], failed_workers: List[int] = (), verify_error: str = None) -> bool:
+        print("\n" + "=" * 80)
+        print("🏁 BOOKING RACE SUMMARY")
+        print("=" * 80)
+        print(f"{'Request':<12} {'Accepted':>9} {'Conflict':>9} {'Other':>7} {'p50':>9} {'p99':>9}")
+        for kind in ("create", "edit"):
+            rows = [r for r in records if r[0] == kind]
+            if not rows:
+                continue
+            latency = Histogram()
+            for row in rows:
+                latency.record(row[2] * 1_000_000)
+            accepted = sum(1 for r in rows if r[1] in (200, 201))
+            conflicts = sum(1 for r in rows if r[1] == 400)
+            print(f"{kind:<12} {accepted:>9} {conflicts:>9} {len(rows) - accepted - conflicts:>7} "
+                  f"{latency.percentile(50) / 1000:>7.1f}ms {latency.percentile(99) / 1000:>7.1f}ms")
+        print(f"Throughput: {len(records) / elapsed:.1f} decisions/s ({len(records)} in {elapsed:.2f}s)")
+        if failed_workers:
+            print(f"❌ {len(failed_workers)} race worker(s) failed, their requests are missing from the results")
+
+        if verify_error:
+            print(f"\n❌ Verification failed: {verify_error}")
+        elif overlaps:
+            print(f"\n❌ {len(overlaps)} overlapping confirmed bookings, {len(double_nights)} nights sold twice:")
+            for first, second in overlaps[:10]:
+                print(f"  • #{first['id']} {first['checkInDate']}→{first['checkOutDate']} overlaps "
+                      f"#{second['id']} {second['checkInDate']}→{second['checkOutDate']}")
+        else:
+            print("\n✅ No double-bookings in the calendar")
+        if missing:
+            print(f"⚠️ {len(missing)} confirmed nights missing from /bookings/dates: {', '.join(missing[:10])}")
+
+        print("\n" + "=" * 80)
+        return not overlaps and not missing and not failed_workers and not verify_error
+
+CHAT_HISTORY_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500)  # upper bounds of the history-length buckets
+CHAT_VISIBILITY_TIMEOUT = 5.0  # seconds after which an unseen message counts as lost
+
+
+def history_bucket(length: int) -> str:
+    """Label of the history-length bucket a conversation with `length` messages falls into"""
+    lower = 0
+    for upper in CHAT_HISTORY_BUCKETS:
+        if length < upper:
+            return f"{lower}-{upper - 1}"
+        lower = upper
+    return f"{lower}+"
+
+
+class ChatBenchmark:
+    """Sustained /chat/send streams across many conversations with concurrent readers.
+
+    Writers post guest messages, picking conversations with a power-law skew so a
+    few histories grow long while the rest stay short. With `rate` the writers are
+    replaced by an open-loop stream of that many sends per second, each sent without
+    waiting for the previous one. Readers re-read conversations
+    right after a write was acknowledged (read-after-write lag) and poll
+    /chat/unread-count and, with an admin session pool, /chat/my-conversations.
+    Send and read latency are bucketed by the conversation's history length. With an
+    admin session the unread counter is also checked against the acknowledged writes.
+    """
+    def __init__(self, base_url: str, conversations: int = 1000, writers: int = 50, readers: int = 20,
+                 duration: float = 60.0, skew: float = 3.0, rate: float = 0.0, sessions: SessionPool = None,
+                 pool_size: int = 200, seed: int = 1):
+        self.client = AsyncHttpClient(base_url, pool_size=pool_size)
+        self.conversations = conversations
+        self.writers = writers
+        self.readers = readers
+        self.duration = duration
+        self.skew = skew
+        self.rate = rate
+        self.sessions = sessions
+        self.rng = random.Random(seed)
+
+        self.conversation_ids: List[int] = []
+        self.history: Dict[int, int] = {}
+        self.pending = collections.deque(maxlen=max(readers, 1) * 4)  # newest acknowledged writes to verify
+        self.sent = 0
+        self.send_failures = 0
+        self.send_us: Dict[str, Histogram] = {}
+        self.read_us: Dict[str, Histogram] = {}
+        self.visible_lag_us = Histogram()
+        self.verified = 0
+        self.first_read_hits = 0
+        self.stale_reads = 0
+        self.lost = 0
+        self.unread_base = None
+        self.unread_checks = 0
+        self.unread_behind = 0
+        self.sends_started = 0
+        self.posts = set()
+
+    async def setup(self):
+        """Start the conversations in batches, each with its first guest message"""
+        semaphore = asyncio.Semaphore(self.client.pool_size)
+
+        async def start(index: int):
+            async with semaphore:
+                response = await self.client.request("POST", "/chat/start", {
+                    "message": "Chat benchmark conversation",
+                    "guestName": f"Chat Bench {index}",
+                    "guestEmail": f"chat-bench-{index}@loadtest.local"
+                })
+            if response.status_code == 200:
+                conversation_id = response.json()["conversationId"]
+                self.conversation_ids.append(conversation_id)
+                self.history[conversation_id] = 1
+
+        print(f"💬 Starting {self.conversations} conversations...")
+        await asyncio.gather(*(start(i) for i in range(self.conversations)), return_exceptions=True)
+        if self.sessions:
+            await self.sessions.start(self.client)
+        self.client.metrics = RequestMetrics()
+
+    def pick_conversation(self) -> int:
+        return self.conversation_ids[int(len(self.conversation_ids) * self.rng.random() ** self.skew)]
+
+    async def send(self):
+        conversation_id = self.pick_conversation()
+        bucket = history_bucket(self.history[conversation_id])
+        self.sends_started += 1
+        start = time.perf_counter()
+        try:
+            response = await self.client.request("POST", "/chat/send", {
+                "conversationId": conversation_id,
+                "content": f"Benchmark message {self.sends_started}",
+                "senderName": "Chat Bench",
+                "senderEmail": "chat-bench@loadtest.local"
+            })
+        except Exception:
+            response = None
+        acked = time.perf_counter()
+        if response is None or response.status_code != 200:
+            self.send_failures += 1
+            return
+        self.sent += 1
+        self.history[conversation_id] += 1
+        self.send_us.setdefault(bucket, Histogram()).record((acked - start) * 1_000_000)
+        self.pending.append((conversation_id, response.json()["message"]["id"], acked, False))
+
+    async def writer(self, stop: asyncio.Event):
+        while not stop.is_set():
+            await self.send()
+
+    async def start_send(self):
+        """Fire one send without waiting for it, so --chat-rate holds however slowly the server answers"""
+        task = asyncio.create_task(self.send())
+        self.posts.add(task)
+        task.add_done_callback(self.posts.discard)
+
+    async def read_conversation(self):
+        """Re-read the newest acknowledged write's conversation (or a random one) and check the message is there.
+
+        A write seen by the first read after its acknowledgement is consistent; otherwise
+        the time from acknowledgement to the read that finally saw it is the visibility lag.
+        """
+        target = self.pending.pop() if self.pending else None
+        conversation_id = target[0] if target else self.pick_conversation()
+        start = time.perf_counter()
+        response = await self.client.request("GET", f"/chat/conversation/{conversation_id}")
+        done = time.perf_counter()
+        if response.status_code != 200:
+            return
+        messages = response.json().get("messages", [])
+        self.read_us.setdefault(history_bucket(len(messages)), Histogram()).record((done - start) * 1_000_000)
+        if target is None:
+            return
+
+        conversation_id, message_id, acked, stale = target
+        if any(message.get("id") == message_id for message in messages):
+            self.verified += 1
+            if stale:
+                self.visible_lag_us.record((start - acked) * 1_000_000)
+            else:
+                self.first_read_hits += 1
+        elif done - acked > CHAT_VISIBILITY_TIMEOUT:
+            self.lost += 1
+        else:
+            self.stale_reads += 1
+            self.pending.append((conversation_id, message_id, acked, True))
+
+    async def poll_unread(self, cookies: Dict):
+        """Read the unread counter; with an admin session it must cover every guest message acknowledged so far"""
+        acked_before = self.sent
+        started_before = self.sends_started
+        response = await self.client.request("GET", "/chat/unread-count", cookies=cookies)
+        if response.status_code != 200 or not cookies:
+            return
+        count = response.json().get("count", 0)
+        if self.unread_base is None:
+            self.unread_base = count - acked_before
+            return
+        self.unread_checks += 1
+        if count < self.unread_base + acked_before:
+            self.unread_behind += 1
+        elif count > self.unread_base + started_before + self.send_failures:
+            # a larger count can only come from traffic outside the benchmark; rebase on it
+            self.unread_base = count - acked_before
+
+    async def reader(self, index: int, stop: asyncio.Event):
+        cookies = self.sessions.acquire()[1] if self.sessions else {}
+        step = index
+        while not stop.is_set():
+            try:
+                if step % 4 == 3:
+                    await self.poll_unread(cookies)
+                elif step % 4 == 1 and cookies:
+                    await self.client.request("GET", "/chat/my-conversations", cookies=cookies)
+                else:
+                    await self.read_conversation()
+            except Exception:
+                await asyncio.sleep(0.05)
+            step += 1
+
+    async def run(self) -> bool:
+        await self.client.start()
+        try:
+            await self.setup()
+            if not self.conversation_ids:
+                print("❌ Could not start any conversation")
+                return False
+
+            print(f"💬 {self.writers if not self.rate else f'{self.rate:g} msg/s of'} writers over "
+                  f"{len(self.conversation_ids)} conversations, {self.readers} readers, {self.duration:.0f}s")
+            stop = asyncio.Event()
+            if self.rate:
+                tasks = [asyncio.create_task(run_at_rate(self.rate, self.start_send, stop))]
+            else:
+                tasks = [asyncio.create_task(self.writer(stop)) for _ in range(self.writers)]
+            tasks += [asyncio.create_task(self.reader(i, stop)) for i in range(self.readers)]
+            started = time.perf_counter()
+            await asyncio.sleep(self.duration)
+            stop.set()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.gather(*self.posts, return_exceptions=True)
+            elapsed = time.perf_counter() - started
+        finally:
+            await self.client.close()
+
+        return self.print_report(elapsed)
+
+    def print_report(self, elapsed: float) -> bool:
+        print("\n" + "=" * 80)
+        print("💬 CHAT THROUGHPUT SUMMARY")
+        print("=" * 80)
+        print(f"Messages: {self.sent} sent ({self.sent / elapsed:.1f} msg/s), {self.send_failures} failed")
+        print(f"Longest history: {max(self.history.values())} messages")
+
+        print(f"\nLatency by history length:")
+        print(f"{'History':<12} {'Sends':>7} {'send p50':>9} {'send p99':>9} {'Reads':>7} {'read p50':>9} {'read p99':>9}")
+        labels = sorted(set(self.send_us) | set(self.read_us), key=lambda label: int(label.split("-")[0].rstrip("+")))
+        empty = Histogram()
+        for label in labels:
+            send, read = self.send_us.get(label, empty), self.read_us.get(label, empty)
+            print(f"{label:<12} {send.total:>7} {send.percentile(50) / 1000:>7.1f}ms {send.percentile(99) / 1000:>7.1f}ms "
+                  f"{read.total:>7} {read.percentile(50) / 1000:>7.1f}ms {read.percentile(99) / 1000:>7.1f}ms")
+
+        lag = self.visible_lag_us
+        print(f"\nRead-after-write: {self.verified} writes verified, {self.first_read_hits} visible on the first read, "
+              f"{self.stale_reads} stale reads, {self.lost} never visible")
+        if lag.total:
+            print(f"  Visibility lag of late writes: p50 {lag.percentile(50) / 1000:.1f}ms, "
+                  f"p99 {lag.percentile(99) / 1000:.1f}ms, max {lag.max / 1000:.1f}ms")
+        if self.sessions:
+            print(f"Unread counter: {self.unread_checks} checks, {self.unread_behind} behind acknowledged writes")
+        else:
+            print("Unread counter: latency only (pass --credentials to check it against the writes)")
+
+        print_latency_table(self.client.metrics, elapsed)
+        print("\n" + "=" * 80)
+        return self.lost == 0 and self.unread_behind == 0 and self.send_failures == 0
+
+
+def linear_fit(points: List[tuple]) -> Optional[tuple]:
+    """Least-squares (intercept, slope) through (x, y) points; None unless there are two distinct x values"""
+    if len({x for x, _ in points}) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    slope = (sum((x - mean_x) * (y - mean_y) for x, y in points) /
+             sum((x - mean_x) ** 2 for x, _ in points))
+    return mean_y - slope * mean_x, slope
+
+
+def rising_trend(values: List[float], min_growth: float = 0.1) -> Optional[tuple]:
+    """(growth per window, share of rising steps) when `values` climb steadily, else None.
+
+    A series counts as trending when at least 80% of its window-to-window steps are
+    non-decreasing and it ends more than `min_growth` (relative) above where it started.
+    """
+    values = [value for value in values if value is not None]
+    if len(values) < 4:
+        return None
+    steps = [b - a for a, b in zip(values, values[1:])]
+    rising = sum(1 for step in steps if step >= 0) / len(steps)
+    first, last = values[0], values[-1]
+    if rising < 0.8 or last <= first or (first and (last - first) / abs(first) < min_growth):
+        return None
+    return linear_fit(list(enumerate(values)))[1], rising
+
+
+async def session_count(command: str) -> Optional[int]:
+    """Session-store size printed (as the last word) by a --session-count-command; None without one"""
+    if not command:
+        return None
+    process = await asyncio.create_subprocess_shell(command, stdout=asyncio.subprocess.PIPE,
+                                                    stderr=asyncio.subprocess.DEVNULL)
+    output, _ = await process.communicate()
+    try:
+        return int(output.decode().strip().split()[-1])
+    except (ValueError, IndexError):
+        return None
+
+
+class SoakTest:
+    """Hours-long constant mixed workload with windowed reporting and leak detection.
+
+    Virtual users replay the guest chat and booking-lookup journey while a fixed set of
+    /ws/chat subscribers stays connected. Request metrics are drained into one compact
+    row per window (the cumulative view lives in fixed-size histograms), so driver
+    memory stays flat however long the run. Each window also records server RSS, CPU
+    and FDs, the server's WebSocket connection count and, through an optional shell
+    command, the session-store size; steadily rising series are flagged at the end.
+    """
+    TRENDS = (("rss_mb", "Server RSS (MB)"), ("fds", "Open FDs"), ("ws_connections", "Server WebSocket connections"),
+              ("sessions", "Session store rows"), ("p99_ms", "p99 latency (ms)"))
+
+    def __init__(self, base_url: str, users: int = 20, ws_clients: int = 50, duration: float = 3600.0,
+                 window: float = 60.0, pool_size: int = 100, pid: int = None, session_count_command: str = None):
+        self.client = AsyncHttpClient(base_url, pool_size=pool_size)
+        self.ws_url = base_url.replace("http", "ws", 1) + "/ws/chat"
+        self.users = users
+        self.ws_clients = ws_clients
+        self.duration = duration
+        self.window = window
+        self.pid = pid
+        self.session_count_command = session_count_command
+        self.total = RequestMetrics()
+        self.rows: List[Dict] = []
+        self.ws_open = 0
+        self.ws_reconnects = 0
+
+    async def subscriber(self, index: int, stop: asyncio.Event):
+        """Keep one /ws/chat guest subscriber connected, pinging inside the server's 5-minute idle timeout"""
+        url = f"{self.ws_url}?userId=guest_soak-{index}@loadtest.local&isAdmin=false"
+        while not stop.is_set():
+            try:
+                async with self.client.session.ws_connect(url, heartbeat=None) as ws:
+                    self.ws_open += 1
+                    try:
+                        while not stop.is_set():
+                            await ws.send_str(json.dumps({"type": "ping"}))
+                            deadline = time.perf_counter() + 60
+                            while not stop.is_set() and time.perf_counter() < deadline:
+                                try:
+                                    message = await ws.receive(timeout=1.0)
+                                except asyncio.TimeoutError:
+                                    continue
+                                if message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                    raise ConnectionError("closed by server")
+                    finally:
+                        self.ws_open -= 1
+            except Exception:
+                if not stop.is_set():
+                    self.ws_reconnects += 1
+                    await asyncio.sleep(1.0)
+
+    async def close_window(self, started: float, previous: Dict) -> Dict:
+        snapshot = self.client.metrics.drain()
+        window = RequestMetrics()
+        window.merge_snapshot(snapshot)
+        self.total.merge_snapshot(snapshot)
+        latency = Histogram()
+        for endpoint in window.endpoints.values():
+            latency.merge_sparse(endpoint.wall_us.to_sparse())
+
+        now = time.perf_counter()
+        row = {
+            "t": now - started,
+            "requests": window.total_requests(),
+            "req_s": window.total_requests() / max(now - previous.get("at", started), 1e-6),
+            "errors": window.total_errors(),
+            "p50_ms": latency.percentile(50) / 1000,
+            "p99_ms": latency.percentile(99) / 1000,
+            "ws_open": self.ws_open,
+            "ws_connections": None,
+            "sessions": await session_count(self.session_count_command)
+        }
+        if self.pid:
+            usage = process_usage(process_tree(self.pid))
+            row["rss_mb"] = usage["rss_kb"] / 1024
+            row["fds"] = usage["fds"]
+            if "cpu_seconds" in previous:
+                row["cpu_pct"] = 100 * (usage["cpu_seconds"] - previous["cpu_seconds"]) / (now - previous["at"])
+            previous["cpu_seconds"] = usage["cpu_seconds"]
+        previous["at"] = now
+        try:
+            # straight through the session so the probe stays out of the workload metrics
+            async with self.client.session.get(f"{self.client.api_base}/ws/health") as response:
+                row["ws_connections"] = chat_connections(await response.json(content_type=None))
+        except Exception:
+            pass
+        return row
+
+    def print_row(self, row: Dict):
+        rss = f"{row['rss_mb']:.1f}MB" if row.get("rss_mb") is not None else "-"
+        cpu = f"{row['cpu_pct']:.0f}%" if row.get("cpu_pct") is not None else "-"
+        sessions = row["sessions"] if row["sessions"] is not None else "-"
+        ws_server = row["ws_connections"] if row["ws_connections"] is not None else "-"
+        print(f"{row['t'] / 60:>7.1f}m {row['req_s']:>8.1f} {row['errors']:>6} {row['p50_ms']:>6.1f}ms "
+              f"{row['p99_ms']:>6.1f}ms {rss:>9} {cpu:>6} {row.get('fds', '-'):>6} "
+              f"{row['ws_open']:>4}/{ws_server:<5} {sessions:>8}")
+
+    async def windows(self, stop: asyncio.Event, started: float):
+        previous: Dict = {}
+        print(f"\n{'Elapsed':>8} {'req/s':>8} {'Errors':>6} {'p50':>8} {'p99':>8} {'RSS':>9} {'CPU':>6} {'FDs':>6} "
+              f"{'WS us/srv':>10} {'Sessions':>8}")
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), self.window)
+            except asyncio.TimeoutError:
+                pass
+            row = await self.close_window(started, previous)
+            self.rows.append(row)
+            self.print_row(row)
+
+    async def run(self) -> bool:
+        raise_open_file_limit()
+        await self.client.start()
+        print(f"🛁 Soak test: {self.users} virtual users + {self.ws_clients} WebSocket subscribers for "
+              f"{self.duration / 60:g} min, {self.window:g}s windows")
+        stop = asyncio.Event()
+        started = time.perf_counter()
+        try:
+            subscribers = [asyncio.create_task(self.subscriber(i, stop)) for i in range(self.ws_clients)]
+            reporter = asyncio.create_task(self.windows(stop, started))
+            try:
+                await drive_virtual_users(self.client, self.users, self.duration)
+            except asyncio.CancelledError:
+                print("\n⚠️ Soak test interrupted, reporting the windows so far")
+            finally:
+                stop.set()
+                await asyncio.gather(reporter, *subscribers, return_exceptions=True)
+        finally:
+            await self.client.close()
+
+        return self.print_report(time.perf_counter() - started)
+
+    def print_report(self, elapsed: float) -> bool:
+        print("\n" + "=" * 80)
+        print("🛁 SOAK TEST SUMMARY")
+        print("=" * 80)
+        total = self.total.total_requests()
+        print(f"Duration: {elapsed / 60:.1f} min, {len(self.rows)} windows")
+        print(f"Requests: {total} ({total / elapsed:.1f} req/s), {self.total.total_errors()} errors")
+        print(f"WebSocket reconnects: {self.ws_reconnects}")
+
+        flagged = 0
+        print(f"\nTrends ({self.window:.0f}s windows):")
+        for key, label in self.TRENDS:
+            values = [row.get(key) for row in self.rows]
+            if all(value is None for value in values):
+                print(f"  • {label}: not sampled")
+                continue
+            trend = rising_trend(values)
+            if key == "ws_connections" and trend is None:
+                held = [row["ws_open"] for row in self.rows if row["ws_connections"] is not None]
+                reported = [row["ws_connections"] for row in self.rows if row["ws_connections"] is not None]
+                if held and reported[-1] > held[-1] * 1.1 + 5:
+                    print(f"  ⚠️ {label}: server reports {reported[-1]} for {held[-1]} live subscribers")
+                    flagged += 1
+                    continue
+            if trend:
+                slope, rising = trend
+                flagged += 1
+                print(f"  ⚠️ {label}: rising in {rising:.0%} of windows, "
+                      f"+{slope * 3600 / self.window:.1f}/hour ({values[0]} -> {values[-1]})"
+                      if isinstance(values[0], int) else
+                      f"  ⚠️ {label}: rising in {rising:.0%} of windows, "
+                      f"+{slope * 3600 / self.window:.1f}/hour ({values[0]:.1f} -> {values[-1]:.1f})")
+            else:
+                print(f"  ✅ {label}: no steady growth")
+
+        print_latency_table(self.total, elapsed)
+        print_connection_table(self.total)
+        print("\n" + "=" * 80)
+        return flagged == 0 and self.total.total_errors() == 0
+
+
+class CalendarBenchmark:
+    """Read-path sweep over the guest calendar: /bookings/calendar/:year/:month, /bookings/dates and /pricing.
+
+    Every month from `start_month` for `months` months is fetched `repeats` times and
+    its latency is related to the number of bookings the month returns (seed varying
+    densities with --seed-data --seed-density). Each endpoint is then probed for HTTP
+    caching: the validators and Cache-Control it sends, and whether a conditional
+    request with If-None-Match is answered 304 and how much that saves.
+    """
+    DENSITY_BUCKETS = (1, 5, 10, 20, 31)  # upper bounds of the bookings-per-month buckets
+
+    def __init__(self, base_url: str, start_month: str = "2030-01", months: int = 24, repeats: int = 20,
+                 concurrency: int = 10):
+        self.client = AsyncHttpClient(base_url, pool_size=concurrency)
+        year, month = (int(part) for part in start_month.split("-")[:2])
+        self.months = [(year + (month - 1 + i) // 12, (month - 1 + i) % 12 + 1) for i in range(months)]
+        self.repeats = repeats
+        self.concurrency = concurrency
+        self.month_rows: List[Dict] = []
+        self.cache_rows: List[Dict] = []
+
+    async def timed(self, endpoint: str, headers: Dict = None) -> tuple:
+        start = time.perf_counter()
+        response = await self.client.request("GET", endpoint, headers=headers)
+        return response, (time.perf_counter() - start) * 1_000_000
+
+    async def repeat(self, endpoint: str, headers: Dict = None) -> tuple:
+        """Fetch `endpoint` `repeats` times, `concurrency` at a time; return (latency histogram, last response)"""
+        latency = Histogram()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        last = None
+
+        async def one():
+            nonlocal last
+            async with semaphore:
+                response, elapsed_us = await self.timed(endpoint, headers)
+            latency.record(elapsed_us)
+            last = response
+
+        await asyncio.gather(*(one() for _ in range(self.repeats)))
+        return latency, last
+
+    async def sweep_months(self):
+        for year, month in self.months:
+            latency, response = await self.repeat(f"/bookings/calendar/{year}/{month}")
+            bookings = len(response.json()) if response is not None and response.status_code == 200 else None
+            self.month_rows.append({"month": f"{year}-{month:02d}", "bookings": bookings, "latency": latency,
+                                    "size": len(response.content) if response is not None else 0})
+
+    async def check_caching(self, endpoint: str):
+        """Compare plain repeats with conditional ones and record the caching headers the endpoint sends"""
+        plain, response = await self.repeat(endpoint)
+        row = {"endpoint": endpoint, "plain": plain, "size": len(response.content), "status": response.status_code,
+               "etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified"),
+               "cache_control": response.headers.get("Cache-Control"), "conditional": None, "not_modified": 0}
+        validators = {}
+        if row["etag"]:
+            validators["If-None-Match"] = row["etag"]
+        if row["last_modified"]:
+            validators["If-Modified-Since"] = row["last_modified"]
+        if validators:
+            conditional = Histogram()
+            for _ in range(self.repeats):
+                conditional_response, elapsed_us = await self.timed(endpoint, validators)
+                conditional.record(elapsed_us)
+                row["not_modified"] += conditional_response.status_code == 304
+            row["conditional"] = conditional
+        self.cache_rows.append(row)
+
+    async def run(self) -> bool:
+        await self.client.start()
+        try:
+            print(f"📅 Sweeping {len(self.months)} months from {self.months[0][0]}-{self.months[0][1]:02d}, "
+                  f"{self.repeats} requests each")
+            await self.sweep_months()
+            year, month = max(self.month_rows, key=lambda row: row["bookings"] or 0)["month"].split("-")
+            for endpoint in (f"/bookings/calendar/{int(year)}/{int(month)}", "/bookings/dates", "/pricing"):
+                await self.check_caching(endpoint)
+        finally:
+            await self.client.close()
+        return self.print_report()
+
+    def density_label(self, bookings: int) -> str:
+        lower = 0
+        for upper in self.DENSITY_BUCKETS:
+            if bookings < upper:
+                return f"{lower}-{upper - 1}" if upper - 1 > lower else f"{lower}"
+            lower = upper
+        return f"{lower}+"
+
+    def print_report(self) -> bool:
+        print("\n" + "=" * 80)
+        print("📅 CALENDAR READ-PATH SUMMARY")
+        print("=" * 80)
+        print(f"{'Month':<9} {'Bookings':>9} {'p50':>9} {'p99':>9} {'Size':>9}")
+        for row in self.month_rows:
+            bookings = row["bookings"] if row["bookings"] is not None else "error"
+            print(f"{row['month']:<9} {bookings:>9} {row['latency'].percentile(50) / 1000:>7.1f}ms "
+                  f"{row['latency'].percentile(99) / 1000:>7.1f}ms {row['size']:>8}B")
+
+        by_density: Dict[str, Histogram] = {}
+        points = []
+        for row in self.month_rows:
+            if row["bookings"] is None:
+                continue
+            bucket = by_density.setdefault(self.density_label(row["bookings"]), Histogram())
+            bucket.merge_sparse(row["latency"].to_sparse())
+            points.append((row["bookings"], row["latency"].percentile(50) / 1000))
+        print(f"\nLatency by bookings per month:")
+        for label in sorted(by_density, key=lambda label: int(label.split("-")[0].rstrip("+"))):
+            latency = by_density[label]
+            print(f"  {label:>6} bookings: p50 {latency.percentile(50) / 1000:.1f}ms, "
+                  f"p99 {latency.percentile(99) / 1000:.1f}ms ({latency.total} requests)")
+        fit = linear_fit(points)
+        if fit:
+            print(f"  ≈ {fit[1]:+.3f}ms p50 per extra booking in the month")
+
+        print(f"\nHTTP caching:")
+        for row in self.cache_rows:
+            plain = row["plain"].percentile(50) / 1000
+            print(f"  {row['endpoint']} (HTTP {row['status']}, {row['size']}B, p50 {plain:.1f}ms)")
+            print(f"    Cache-Control: {row['cache_control'] or 'none - every page view refetches'}")
+            print(f"    Validators: ETag {row['etag'] or '-'}, Last-Modified {row['last_modified'] or '-'}")
+            if row["conditional"] is None:
+                print(f"    ❌ No validator, conditional requests impossible")
+            elif row["not_modified"]:
+                saved = plain - row["conditional"].percentile(50) / 1000
+                print(f"    ✅ {row['not_modified']}/{self.repeats} conditional requests answered 304, "
+                      f"p50 {row['conditional'].percentile(50) / 1000:.1f}ms ({saved:+.1f}ms saved, "
+                      f"{row['size']}B not resent)")
+            else:
+                print(f"    ⚠️ Validator sent but conditional requests still return the full body")
+
+        print("\n" + "=" * 80)
+        return all(row["bookings"] is not None for row in self.month_rows)
+
+
+class PricingMatrix:
+    """Booking-widget pricing hot path under a combinatorial matrix of stays and discounts.
+
+    Every cell (stay length x guests x pet x promo code x voucher) sends what the widget
+    sends on a date change: POST /bookings/calculate-pricing plus /promo-codes/validate
+    and /vouchers/validate when a code is entered. Latency is recorded per combination
+    class next to the totals the server computed, and every response is checked for
+    internal consistency, for agreement with the validate endpoints and for identical
+    totals across repeats. With admin cookies, temporary promo codes, vouchers and a
+    promotion are created for the run and deleted afterwards.
+    """
+    NIGHTS = (1, 2, 3, 6, 7, 13, 14, 21, 30)  # either side of the fee (2) and stay-discount (7, 14) thresholds
+    GUESTS = (1, 2, 4, 6)
+    INVALID_CODE = "NOSUCHCODE0"
+    CENT = 0.011
+
+    def __init__(self, base_url: str, promo_codes: List[str] = None, vouchers: List[str] = None,
+                 start_date: str = "2031-03-02", repeats: int = 2, concurrency: int = 20, cookies: Dict = None,
+                 seed: int = 1):
+        self.client = AsyncHttpClient(base_url, pool_size=concurrency)
+        self.promo_labels = {code.upper(): code.upper() for code in promo_codes or []}
+        self.voucher_labels = {code.upper(): code.upper() for code in vouchers or []}
+        self.start_date = datetime.date.fromisoformat(start_date)
+        self.repeats = max(1, repeats)
+        self.concurrency = concurrency
+        self.cookies = cookies or {}
+        self.tag = f"LT{seed % 100:02d}{random.Random(time.time()).randrange(36 ** 3):03X}"
+        self.fixtures: List[tuple] = []
+        self.promo_rules: Dict[str, Dict] = {}
+        self.latency: Dict[tuple, Histogram] = collections.defaultdict(Histogram)
+        self.totals: Dict[tuple, List[float]] = {}
+        self.seen_totals: Dict[tuple, float] = {}
+        self.issues: Dict[str, List[str]] = collections.defaultdict(list)
+        self.errors: Dict[str, int] = collections.Counter()
+
+    async def create_fixture(self, endpoint: str, payload: Dict) -> Optional[Dict]:
+        response = await self.client.request("POST", endpoint, payload, cookies=self.cookies)
+        if response.status_code not in (200, 201):
+            print(f"⚠️ Could not create {endpoint} fixture {payload.get('code') or payload.get('name')}: "
+                  f"HTTP {response.status_code} {response.text[:120]}")
+            return None
+        created = response.json()
+        self.fixtures.append((endpoint, created["id"]))
+        return created
+
+    async def create_fixtures(self):
+        """Promo codes and vouchers covering each discount rule: percentage, fixed, capped, minimum amount"""
+        today = datetime.date.today()
+        window = {"startDate": (today - datetime.timedelta(days=1)).isoformat(),
+                  "endDate": (today + datetime.timedelta(days=2)).isoformat()}
+        for label, rule in (("pct", {"discountType": "percentage", "discountValue": 15}),
+                            ("fixed", {"discountType": "fixed", "discountValue": 40}),
+                            ("pct+cap", {"discountType": "percentage", "discountValue": 30, "maxDiscountAmount": 50}),
+                            ("min-order", {"discountType": "percentage", "discountValue": 10, "minOrderAmount": 600})):
+            code = f"{self.tag}P{label.replace('+', '').replace('-', '').upper()}"
+            if await self.create_fixture("/promo-codes", {"code": code, "description": "Load test fixture",
+                                                          **window, **rule}):
+                self.promo_labels[code] = label
+        for label, rule in (("pct", {"discountType": "percentage", "discountValue": 20}),
+                            ("fixed", {"discountType": "fixed", "discountValue": 25}),
+                            ("pct+cap", {"discountType": "percentage", "discountValue": 50, "maxDiscountAmount": 60}),
+                            ("min-order", {"discountType": "fixed", "discountValue": 30, "minBookingAmount": 800})):
+            code = f"{self.tag}V{label.replace('+', '').replace('-', '').upper()}"
+            if await self.create_fixture("/vouchers", {"code": code, "usageLimit": 1000, "minBookingAmount": 0,
+                                                       "validFrom": window["startDate"],
+                                                       "validUntil": window["endDate"],
+                                                       "description": "Load test fixture", **rule}):
+                self.voucher_labels[code] = label
+
+    async def delete_fixtures(self):
+        for endpoint, fixture_id in reversed(self.fixtures):
+            try:
+                response = await self.client.request("DELETE", f"{endpoint}/{fixture_id}", cookies=self.cookies)
+                if response.status_code != 200:
+                    print(f"⚠️ Could not delete {endpoint}/{fixture_id}: HTTP {response.status_code}")
+            except Exception as e:
+                print(f"⚠️ Could not delete {endpoint}/{fixture_id}: {e}")
+        self.fixtures.clear()
+
+    async def current_promotion(self) -> str:
+        try:
+            response = await self.client.request("GET", "/promotions/current-effect")
+            effect = response.json() if response.status_code == 200 else {}
+        except Exception:
+            effect = {}
+        if not effect.get("hasActivePromotion"):
+            return "none"
+        return f"{effect.get('promotionName')} ({effect.get('discountPercentage')}%)"
+
+    async def load_promo_rules(self):
+        """Fetch each promo code's rule once through the public validate endpoint, for the cross-checks"""
+        for code in self.promo_labels:
+            response = await self.client.request("POST", "/promo-codes/validate", {"code": code})
+            data = response.json() if response.status_code == 200 else {}
+            if data.get("valid"):
+                self.promo_rules[code] = data["promoCode"]
+            else:
+                print(f"⚠️ Promo code {code} does not validate: {data.get('message', response.status_code)}")
+
+    def cells(self) -> List[tuple]:
+        promos = [None, self.INVALID_CODE] + list(self.promo_labels)
+        vouchers = [None, self.INVALID_CODE] + list(self.voucher_labels)
+        return [(nights, guests, pet, promo, voucher) for nights in self.NIGHTS for guests in self.GUESTS
+                for pet in (False, True) for promo in promos for voucher in vouchers]
+
+    def stay_band(self, nights: int) -> str:
+        if nights <= 2:
+            return "1-2 nights"
+        return "3-6 nights" if nights < 7 else "7-13 nights" if nights < 14 else "14+ nights"
+
+    def code_label(self, code: Optional[str], labels: Dict[str, str]) -> str:
+        return "none" if code is None else "invalid" if code == self.INVALID_CODE else labels[code]
+
+    def issue(self, kind: str, cell: tuple, detail: str):
+        self.issues[kind].append(f"{cell[0]}n/{cell[1]}g/{'pet' if cell[2] else 'no pet'}/"
+                                 f"promo {cell[3] or '-'}/voucher {cell[4] or '-'}: {detail}")
+
+    def check_pricing(self, cell: tuple, pricing: Dict):
+        nights = cell[0]
+        total = pricing.get("totalPrice")
+        if pricing.get("totalNights") != nights:
+            self.issue("nights", cell, f"asked for {nights}, priced {pricing.get('totalNights')}")
+        if not isinstance(total, (int, float)) or total != total or total < 0:
+            self.issue("total", cell, f"totalPrice {total!r}")
+            return
+        shown = pricing["originalPrice"] - pricing["totalDiscountAmount"]
+        if abs(shown - total) > self.CENT:
+            self.issue("savings", cell, f"original {pricing['originalPrice']:.2f} - discounts "
+                                        f"{pricing['totalDiscountAmount']:.2f} = {shown:.2f}, total {total:.2f}")
+        if cell[3] and cell[3] != self.INVALID_CODE and cell[3] in self.promo_rules:
+            rule = self.promo_rules[cell[3]]
+            value = float(rule["discountValue"])
+            expected = pricing["priceBeforeDiscount"] * value / 100 if rule["discountType"] == "percentage" else value
+            if rule["discountType"] == "percentage" and rule.get("maxDiscountAmount"):
+                expected = min(expected, float(rule["maxDiscountAmount"]))
+            if rule.get("minOrderAmount") and pricing["priceBeforeDiscount"] < float(rule["minOrderAmount"]):
+                expected = 0.0
+            if abs(expected - pricing.get("promoCodeDiscount", 0)) > self.CENT:
+                self.issue("promo", cell, f"validate rule gives {expected:.2f}, pricing applied "
+                                          f"{pricing.get('promoCodeDiscount', 0):.2f}")
+        elif cell[3] == self.INVALID_CODE and pricing.get("appliedPromoCode"):
+            self.issue("promo", cell, f"invalid code applied as {pricing['appliedPromoCode']}")
+        previous = self.seen_totals.setdefault(cell, total)
+        if abs(previous - total) > self.CENT:
+            self.issue("repeat", cell, f"{previous:.2f} then {total:.2f}")
+
+    def check_voucher(self, cell: tuple, pricing: Dict, response: LoadResponse):
+        applied = pricing.get("voucherDiscount", 0) if pricing.get("appliedVoucher") else 0
+        if response.status_code != 200:
+            if applied:
+                self.issue("voucher", cell, f"validate refused (HTTP {response.status_code}), pricing applied "
+                                            f"{applied:.2f}")
+            return
+        discount = response.json().get("discountAmount", 0)
+        if cell[4] == self.INVALID_CODE or abs(discount - applied) > self.CENT:
+            self.issue("voucher", cell, f"validate gives {discount:.2f}, pricing applied {applied:.2f}")
+
+    async def timed(self, key: tuple, endpoint: str, payload: Dict) -> Optional[LoadResponse]:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request("POST", endpoint, payload)
+        except Exception:
+            self.errors[endpoint] += 1
+            return None
+        self.latency[(endpoint,) + key].record((time.perf_counter() - start) * 1_000_000)
+        if response.status_code >= 500:
+            self.errors[endpoint] += 1
+        return response
+
+    async def price_cell(self, index: int, cell: tuple, promotion: str):
+        nights, guests, pet, promo, voucher = cell
+        check_in = self.start_date + datetime.timedelta(days=index % 120)
+        stay = {"checkInDate": check_in.isoformat(),
+                "checkOutDate": (check_in + datetime.timedelta(days=nights)).isoformat()}
+        key = (self.stay_band(nights), guests, "pet" if pet else "no pet", self.code_label(promo, self.promo_labels),
+               self.code_label(voucher, self.voucher_labels), promotion)
+
+        response = await self.timed(key, "/bookings/calculate-pricing", {
+            **stay, "guests": guests, "hasPet": pet, "promoCode": promo, "voucherCode": voucher})
+        if response is None or response.status_code != 200:
+            if response is not None and response.status_code < 500:
+                self.issue("status", cell, f"calculate-pricing HTTP {response.status_code}")
+            return
+        pricing = response.json()
+        self.check_pricing(cell + (promotion,), pricing)
+        self.totals.setdefault(key, []).append(pricing.get("totalPrice") or 0.0)
+
+        if promo:
+            await self.timed(key, "/promo-codes/validate", {"code": promo})
+        if voucher:
+            response = await self.timed(key, "/vouchers/validate", {
+                **stay, "code": voucher, "bookingAmount": pricing["originalPrice"],
+                "guestEmail": "pricing@loadtest.local", "guestName": "Pricing Matrix"})
+            if response is not None and response.status_code < 500:
+                self.check_voucher(cell + (promotion,), pricing, response)
+
+    async def fire(self, promotion: str):
+        cells = self.cells()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def one(index: int, cell: tuple):
+            async with semaphore:
+                await self.price_cell(index, cell, promotion)
+
+        print(f"💶 Pricing {len(cells)} combinations x {self.repeats} (promotion: {promotion})")
+        for _ in range(self.repeats):
+            await asyncio.gather(*(one(i, cell) for i, cell in enumerate(cells)))
+
+    async def run(self) -> bool:
+        await self.client.start()
+        try:
+            if self.cookies:
+                await self.create_fixtures()
+            await self.load_promo_rules()
+            promotion = await self.current_promotion()
+            await self.fire(promotion)
+            if self.cookies and promotion == "none":
+                today = datetime.date.today()
+                if await self.create_fixture("/promotions", {
+                        "name": f"{self.tag} load test", "tag": "LOADTEST", "discountPercentage": 12,
+                        "startDate": (today - datetime.timedelta(days=1)).isoformat(),
+                        "endDate": (today + datetime.timedelta(days=2)).isoformat(), "isActive": True}):
+                    await self.fire(await self.current_promotion())
+        finally:
+            try:
+                if self.fixtures:
+                    await self.delete_fixtures()
+            finally:
+                await self.client.close()
+        return self.print_report()
+
+    @staticmethod
+    def natural_key(value) -> tuple:
+        """Sort "3-6 nights" before "14+ nights" and numbers before labels"""
+        match = re.match(r"\d+", str(value))
+        return (0, int(match.group()), "") if match else (1, 0, str(value))
+
+    def print_report(self) -> bool:
+        print("\n" + "=" * 80)
+        print("💶 PRICING MATRIX SUMMARY")
+        print("=" * 80)
+        for endpoint in ("/bookings/calculate-pricing", "/promo-codes/validate", "/vouchers/validate"):
+            merged = Histogram()
+            for key, histogram in self.latency.items():
+                if key[0] == endpoint:
+                    merged.merge_sparse(histogram.to_sparse())
+            if merged.total:
+                print(f"{endpoint:<30} {merged.total:>7} requests  p50 {merged.percentile(50) / 1000:>7.1f}ms  "
+                      f"p99 {merged.percentile(99) / 1000:>7.1f}ms  5xx/failed {self.errors[endpoint]}")
+
+        pricing_keys = [key for key in self.latency if key[0] == "/bookings/calculate-pricing"]
+        for position, dimension in enumerate(("Stay", "Guests", "Pet", "Promo code", "Voucher", "Promotion"), 1):
+            groups: Dict = {}
+            for key in pricing_keys:
+                groups.setdefault(key[position], Histogram()).merge_sparse(self.latency[key].to_sparse())
+            if len(groups) < 2:
+                continue
+            print(f"\ncalculate-pricing by {dimension.lower()}:")
+            for value, histogram in sorted(groups.items(), key=lambda item: self.natural_key(item[0])):
+                print(f"  {str(value):<24} p50 {histogram.percentile(50) / 1000:>7.1f}ms  "
+                      f"p99 {histogram.percentile(99) / 1000:>7.1f}ms")
+
+        print(f"\nSlowest combination classes (calculate-pricing p99, computed totals):")
+        for key in sorted(pricing_keys, key=lambda key: self.latency[key].percentile(99), reverse=True)[:10]:
+            totals = self.totals.get(key[1:], [0.0])
+            print(f"  {key[1]:<11} {key[2]}g {key[3]:<6} promo {key[4]:<9} voucher {key[5]:<9} "
+                  f"p99 {self.latency[key].percentile(99) / 1000:>7.1f}ms  €{min(totals):.2f}-€{max(totals):.2f}")
+
+        explanations = {"nights": "priced a different number of nights than requested",
+                        "total": "negative or non-numeric total",
+                        "savings": "originalPrice - totalDiscountAmount differs from totalPrice",
+                        "promo": "promo discount disagrees with /promo-codes/validate",
+                        "voucher": "voucher discount disagrees with /vouchers/validate",
+                        "repeat": "same inputs priced differently across repeats",
+                        "status": "request rejected"}
+        print()
+        if not self.issues:
+            print("✅ Every computed total was consistent")
+        for kind, samples in self.issues.items():
+            print(f"⚠️ {len(samples)} × {explanations[kind]}")
+            for sample in samples[:3]:
+                print(f"    {sample}")
+        print("=" * 80)
+        return not self.issues and not any(self.errors.values())
+
+
+def latency_knee(points: List[tuple]) -> Optional[tuple]:
+    """Point of a rising (rate, latency) curve furthest below the chord from its first to its last point.
+
+    Both axes are normalised to 0..1 first, so this is where latency stops growing
+    roughly linearly with load and starts to climb steeply (the Kneedle heuristic).
+    """
+    points = sorted(points)
+    if len(points) < 3:
+        return None
+    (x0, y0), (x1, y1) = points[0], points[-1]
+    if x1 == x0 or y1 <= y0:
+        return None
+    distance = [((x - x0) / (x1 - x0)) - ((y - y0) / (y1 - y0)) for x, y in points]
+    best = max(range(1, len(points) - 1), key=lambda i: distance[i])
+    return points[best] if distance[best] > 0 else None
+
+
+class CapacityFinder:
+    """Closed-loop search for the highest session arrival rate the server sustains within its SLOs.
+
+    Each step replays the scenario mix (see ScenarioRunner) at a fixed arrival rate for
+    `step_duration` seconds and checks overall and per-route p95/p99 latency and the
+    error rate against the SLOs. The "step" search raises the rate by `step` until the
+    first breach; the "binary" search doubles the rate until a breach and then bisects
+    between the last passing and the first failing rate down to `resolution`.
+    """
+    def __init__(self, base_url: str, mix: Dict, start_rate: float = 1.0, max_rate: float = 200.0,
+                 step: float = None, step_duration: float = 30.0, search: str = "step", resolution: float = 0.05,
+                 slo_p95_ms: float = 500.0, slo_p99_ms: float = 1000.0, slo_error_rate: float = 0.01,
+                 pool_size: int = 100, seed: int = None):
+        self.base_url = base_url
+        self.mix = mix
+        self.start_rate = start_rate
+        self.max_rate = max_rate
+        self.step = step or start_rate
+        self.step_duration = step_duration
+        self.search = search
+        self.resolution = resolution
+        self.slo = {"p95": slo_p95_ms, "p99": slo_p99_ms, "errors": slo_error_rate}
+        self.pool_size = pool_size
+        self.seed = seed
+        self.steps: List[Dict] = []
+
+    def breaches(self, metrics: RequestMetrics) -> List[tuple]:
+        """(route, reason, severity) for every route outside the SLOs; severity is measured / limit"""
+        found = []
+        for key, m in metrics.endpoints.items():
+            if not m.count:
+                continue
+            p95, p99 = m.wall_us.percentile(95) / 1000, m.wall_us.percentile(99) / 1000
+            if p95 > self.slo["p95"]:
+                found.append((key, f"p95 {p95:.0f}ms > {self.slo['p95']:g}ms", p95 / self.slo["p95"]))
+            if p99 > self.slo["p99"]:
+                found.append((key, f"p99 {p99:.0f}ms > {self.slo['p99']:g}ms", p99 / self.slo["p99"]))
+            error_rate = m.errors / m.count
+            if error_rate > self.slo["errors"]:
+                found.append((key, f"errors {error_rate:.1%} > {self.slo['errors']:.1%}",
+                              error_rate / max(self.slo["errors"], 1e-9)))
+        return sorted(found, key=lambda breach: -breach[2])
+
+    async def probe(self, rate: float) -> Dict:
+        """Replay the mix at `rate` sessions/s for one step and return its SLO verdict"""
+        runner = ScenarioRunner(self.base_url, self.mix, rate=rate, duration=self.step_duration,
+                                pool_size=self.pool_size, seed=self.seed)
+        runner.verbose = False
+        arrivals, arrivals_elapsed, elapsed = await runner.execute()
+        metrics = runner.client.metrics
+        overall = Histogram()
+        for m in metrics.endpoints.values():
+            overall.merge_sparse(m.wall_us.to_sparse())
+        total = metrics.total_requests()
+        error_rate = metrics.total_errors() / total if total else 1.0
+        breaches = self.breaches(metrics)
+        if error_rate > self.slo["errors"]:
+            breaches.append(("overall", f"errors {error_rate:.1%} > {self.slo['errors']:.1%}", 1.0))
+        if runner.dropped:
+            breaches.append(("overall", f"{runner.dropped} sessions dropped at the {runner.max_sessions}-session cap",
+                             1.0))
+        row = {
+            "rate": rate,
+            "achieved": arrivals / arrivals_elapsed if arrivals_elapsed else 0.0,
+            "req_s": total / elapsed if elapsed else 0.0,
+            "p50_ms": overall.percentile(50) / 1000,
+            "p95_ms": overall.percentile(95) / 1000,
+            "p99_ms": overall.percentile(99) / 1000,
+            "error_rate": error_rate,
+            "breaches": breaches,
+            "passed": not breaches and total > 0
+        }
+        self.steps.append(row)
+        verdict = "✅" if row["passed"] else f"❌ {breaches[0][0]}: {breaches[0][1]}" if breaches else "❌ no requests"
+        print(f"{rate:>9.2f}/s {row['req_s']:>8.1f} {row['p50_ms']:>6.1f}ms {row['p95_ms']:>6.1f}ms "
+              f"{row['p99_ms']:>6.1f}ms {row['error_rate']:>6.1%}  {verdict}")
+        return row
+
+    async def step_search(self):
+        rate = self.start_rate
+        while rate <= self.max_rate:
+            if not (await self.probe(rate))["passed"]:
+                return
+            rate += self.step
+
+    async def binary_search(self):
+        passing, failing = 0.0, None
+        rate = self.start_rate
+        while rate <= self.max_rate:
+            if (await self.probe(rate))["passed"]:
+                passing = rate
+                rate *= 2
+            else:
+                failing = rate
+                break
+        if failing is None:
+            return
+        while failing - passing > max(passing, self.start_rate) * self.resolution:
+            middle = (passing + failing) / 2
+            if (await self.probe(middle))["passed"]:
+                passing = middle
+            else:
+                failing = middle
+
+    async def run(self) -> bool:
+        print(f"🧭 Capacity search ({self.search}) from {self.start_rate:g} to {self.max_rate:g} sessions/s, "
+              f"{self.step_duration:g}s per step; SLO p95 ≤ {self.slo['p95']:g}ms, p99 ≤ {self.slo['p99']:g}ms, "
+              f"errors ≤ {self.slo['errors']:.1%}")
+        print(f"\n{'Rate':>11} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'Errors':>7}")
+        try:
+            await (self.binary_search() if self.search == "binary" else self.step_search())
+        except asyncio.CancelledError:
+            print("\n⚠️ Capacity search interrupted, reporting the steps so far")
+        return self.print_report()
+
+    def print_report(self) -> bool:
+        print("\n" + "=" * 80)
+        print("🧭 CAPACITY SUMMARY")
+        print("=" * 80)
+        passed = [row for row in self.steps if row["passed"]]
+        failed = sorted((row for row in self.steps if not row["passed"]), key=lambda row: row["rate"])
+        if passed:
+            best = max(passed, key=lambda row: row["rate"])
+            print(f"Highest sustainable rate: {best['rate']:.2f} sessions/s ({best['req_s']:.1f} req/s, "
+                  f"p95 {best['p95_ms']:.1f}ms, p99 {best['p99_ms']:.1f}ms)")
+        else:
+            print(f"❌ No step met the SLOs, even {self.start_rate:g} sessions/s")
+        if self.steps and not failed:
+            print(f"ℹ️ No breach up to {max(row['rate'] for row in self.steps):.2f} sessions/s; "
+                  f"raise --capacity-max to find the limit")
+
+        knee = latency_knee([(row["rate"], row["p99_ms"]) for row in self.steps])
+        if knee:
+            print(f"Latency knee: ~{knee[0]:.2f} sessions/s (p99 {knee[1]:.1f}ms), "
+                  f"latency climbs steeply beyond this rate")
+
+        if failed:
+            first = failed[0]
+            print(f"\nFirst breach at {first['rate']:.2f} sessions/s:")
+            for key, reason, _ in first["breaches"][:5]:
+                print(f"  • {key}: {reason}")
+            routes = [key for key, _, _ in first["breaches"] if key != "overall"]
+            if routes:
+                print(f"Broke first: {routes[0]}")
+        print("\n" + "=" * 80)
+        return bool(passed)
+
+
+class ConnectionBenchmark:
+    """Cost of a cold connection versus a pooled keep-alive one, per endpoint.
+
+    Every endpoint is fetched `repeats` times in sequence twice: with keep-alive off,
+    so each request opens its own connection, and over a warmed one-connection
+    keep-alive pool, optionally idling `idle` seconds between requests to test the
+    server's keep-alive timeout. New connections in the pooled pass mean the server
+    (or a proxy in front of it) closed them. A raw socket probe splits connection
+    setup into the TCP connect and, for https targets, the TLS handshake.
+    """
+    ENDPOINTS = ("/health", "/pricing", "/bookings/dates", "/chat/unread-count")
+
+    def __init__(self, base_url: str, endpoints: List[str] = None, repeats: int = 50,
+                 keepalive_timeout: float = 15.0, idle: float = 0.0):
+        self.base_url = base_url
+        self.endpoints = endpoints or list(self.ENDPOINTS)
+        self.repeats = repeats
+        self.keepalive_timeout = keepalive_timeout
+        self.idle = idle
+        url = urllib.parse.urlsplit(base_url)
+        self.host = url.hostname
+        self.tls = url.scheme == "https"
+        self.port = url.port or (443 if self.tls else 80)
+        self.tcp_us = Histogram()
+        self.tls_us = Histogram()
+        self.keep_alive_headers: Dict[str, str] = {}
+
+    async def handshake_probe(self):
+        loop = asyncio.get_running_loop()
+        context = ssl.create_default_context() if self.tls else None
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            _, writer = await asyncio.open_connection(self.host, self.port)
+            self.tcp_us.record((time.perf_counter() - start) * 1_000_000)
+            try:
+                if context:
+                    start = time.perf_counter()
+                    await loop.start_tls(writer.transport, writer.transport.get_protocol(), context,
+                                         server_hostname=self.host)
+                    self.tls_us.record((time.perf_counter() - start) * 1_000_000)
+            finally:
+                writer.transport.abort()
+
+    async def timed_pass(self, force_close: bool) -> RequestMetrics:
+        """Fetch every endpoint in sequence over a one-connection pool; return the pass's metrics"""
+        client = AsyncHttpClient(self.base_url, pool_size=1, keepalive_timeout=self.keepalive_timeout,
+                                 force_close=force_close)
+        await client.start()
+        try:
+            if not force_close:
+                await client.request("GET", self.endpoints[0])
+                client.metrics = RequestMetrics()
+            for endpoint in self.endpoints:
+                for _ in range(self.repeats):
+                    response = await client.request("GET", endpoint)
+                    for name in ("Connection", "Keep-Alive"):
+                        if name in response.headers and not force_close:
+                            self.keep_alive_headers[name] = response.headers[name]
+                    if self.idle and not force_close:
+                        await asyncio.sleep(self.idle)
+        finally:
+            await client.close()
+        return client.metrics
+
+    async def run(self) -> bool:
+        print(f"🔗 Connection reuse: {len(self.endpoints)} endpoints x {self.repeats} requests, cold and pooled"
+              + (f" ({self.idle:g}s idle between pooled requests)" if self.idle else ""))
+        cold = await self.timed_pass(force_close=True)
+        pooled = await self.timed_pass(force_close=False)
+        try:
+            await self.handshake_probe()
+        except (OSError, ssl.SSLError) as e:
+            print(f"⚠️ Socket probe failed: {e}")
+        return self.print_report(cold, pooled)
+
+    def print_report(self, cold: RequestMetrics, pooled: RequestMetrics) -> bool:
+        print("\n" + "=" * 80)
+        print("🔗 CONNECTION REUSE SUMMARY")
+        print("=" * 80)
+        print(f"{'Endpoint':<28} {'Cold p50':>9} {'Cold p99':>9} {'Pooled p50':>11} {'Pooled p99':>11} "
+              f"{'Cold cost':>10} {'Connect p50':>12} {'Pooled new':>11}")
+        errors = cold.total_errors() + pooled.total_errors()
+        reconnects = 0
+        for endpoint in self.endpoints:
+            key = f"GET {route_template(endpoint)}"
+            if key not in cold.endpoints or key not in pooled.endpoints:
+                print(f"{endpoint:<28} no responses")
+                continue
+            c, p = cold.endpoints[key].wall_us, pooled.endpoints[key].wall_us
+            connect = cold.connections.get(key, ConnectionMetrics()).connect_us
+            new = pooled.connections.get(key, ConnectionMetrics()).new
+            reconnects += new
+            print(f"{endpoint:<28} {c.percentile(50) / 1000:>7.2f}ms {c.percentile(99) / 1000:>7.2f}ms "
+                  f"{p.percentile(50) / 1000:>9.2f}ms {p.percentile(99) / 1000:>9.2f}ms "
+                  f"{(c.percentile(50) - p.percentile(50)) / 1000:>+8.2f}ms {connect.percentile(50) / 1000:>10.2f}ms "
+                  f"{new:>11}")
+
+        print(f"\nConnection setup to {self.host}:{self.port}:")
+        if self.tcp_us.total:
+            print(f"  TCP connect: p50 {self.tcp_us.percentile(50) / 1000:.2f}ms, "
+                  f"p99 {self.tcp_us.percentile(99) / 1000:.2f}ms")
+        if self.tls_us.total:
+            print(f"  TLS handshake: p50 {self.tls_us.percentile(50) / 1000:.2f}ms, "
+                  f"p99 {self.tls_us.percentile(99) / 1000:.2f}ms")
+        elif not self.tls:
+            print(f"  TLS handshake: - (plain http; terminate TLS at the proxy and keep its upstreams pooled)")
+        headers = ", ".join(f"{name}: {value}" for name, value in self.keep_alive_headers.items())
+        print(f"  Server keep-alive headers: {headers or 'none'}")
+
+        if reconnects:
+            print(f"\n⚠️ The server closed {reconnects} pooled connections"
+                  + (f" after {self.idle:g}s idle: its keep-alive timeout is shorter, so proxy/agent idle timeouts "
+                     f"must be lower still" if self.idle else ""))
+        else:
+            print(f"\n✅ Every pooled request reused the warm connection")
+        print("\n" + "=" * 80)
+        return errors == 0
+
+
+ACCESS_LOG_LINE = re.compile(
+    r"(?:(\d{1,2}):(\d{2}):(\d{2})\s*([AP]M)\s+)?(?:\[express\]\s+)?"
+    r"(GET|POST|PUT|PATCH|DELETE|HEAD|OPTIONS) (/api\S*) (\d{3}) in (\d+)ms"
+)
+
+
+def parse_access_log(path: str):
+    """Stream (offset seconds, method, path, status, duration ms) from server/index.ts request log lines.
+
+    The lines look like `8:53:17 PM [express] GET /api/pricing 200 in 12ms :: {...}`,
+    optionally behind a `[0] ` prefix from concurrently and gzipped. The clock is the
+    finish time at one-second resolution, so the start offset is that minus the
+    duration, clamped to never run backwards; a clock going back by more than twelve
+    hours is taken as midnight passing. Other lines are skipped.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    first = last_clock = None
+    day = 0
+    offset = 0.0
+    with opener(path, "rt", errors="replace") as f:
+        for line in f:
+            match = ACCESS_LOG_LINE.search(line)
+            if not match:
+                continue
+            hour, minute, second, meridiem, method, request_path, status, duration = match.groups()
+            if hour is not None:
+                clock = (int(hour) % 12 + (12 if meridiem == "PM" else 0)) * 3600 + int(minute) * 60 + int(second)
+                if last_clock is not None and clock < last_clock - 12 * 3600:
+                    day += 86400
+                last_clock = clock
+                started = clock + day - int(duration) / 1000
+                if first is None:
+                    first = started
+                offset = max(offset, started - first)
+            yield offset, method, request_path, int(status), int(duration)
+
+
+class LogReplay:
+    """Replays the request sequence of a server access log against a target, keeping its timing.
+
+    Requests are sent at their original offsets divided by `speed` (0 sends them back to
+    back), streamed from the log so a file of any size replays in constant memory. Each
+    route's replay latency is compared with the latency the log recorded, and responses
+    whose status differs from the recorded one are counted. At most `max_in_flight`
+    requests are outstanding; beyond that the replay waits for a response before sending
+    the next line. The log holds no request bodies: writes are skipped unless `writes`
+    is set, and then sent with the body `bodies` gives for their route (rendered with
+    {n}, the request number) or {}.
+    """
+    def __init__(self, base_url: str, log_path: str, speed: float = 1.0, writes: bool = False,
+                 bodies: Dict = None, max_in_flight: int = 1000, limit: int = None, pool_size: int = 100):
+        self.client = AsyncHttpClient(base_url, pool_size=pool_size)
+        self.log_path = log_path
+        self.speed = speed
+        self.writes = writes
+        self.bodies = bodies or {}
+        self.max_in_flight = max_in_flight
+        self.limit = limit
+        self.recorded: Dict[str, Histogram] = collections.defaultdict(Histogram)
+        self.status_mismatches: Dict[str, int] = collections.Counter()
+        self.send_lag_us = Histogram()
+        self.skipped = collections.Counter()
+        self.sent = 0
+
+    async def send(self, number: int, method: str, path: str, status: int):
+        endpoint = path[len("/api"):] or "/"
+        key = f"{method} {route_template(endpoint)}"
+        body = render_template(self.bodies.get(key), {"n": number}) if method not in ("GET", "HEAD") else None
+        if method not in ("GET", "HEAD") and body is None:
+            body = {}
+        try:
+            response = await self.client.request(method, endpoint, body)
+        except Exception:
+            self.status_mismatches[key] += 1
+            return
+        if response.status_code != (200 if status == 304 else status):  # the log has no validators to resend
+            self.status_mismatches[key] += 1
+
+    async def replay(self) -> float:
+        in_flight = set()
+        slots = asyncio.Semaphore(self.max_in_flight)
+
+        def finished(task):
+            in_flight.discard(task)
+            slots.release()
+
+        started = time.perf_counter()
+        for number, (offset, method, path, status, duration) in enumerate(parse_access_log(self.log_path)):
+            if self.limit and self.sent >= self.limit:
+                break
+            if method not in ("GET", "HEAD") and not self.writes:
+                self.skipped["write"] += 1
+                continue
+            intended = started + offset / self.speed if self.speed else time.perf_counter()
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await slots.acquire()  # a full cap holds the replay back (counted as send lag) rather than dropping lines
+            self.send_lag_us.record((time.perf_counter() - intended) * 1_000_000)
+            self.recorded[f"{method} {route_template(path[len('/api'):] or '/')}"].record(duration * 1000)
+            self.sent += 1
+            task = asyncio.create_task(self.send(number, method, path, status))
+            in_flight.add(task)
+            task.add_done_callback(finished)
+        await asyncio.gather(*in_flight, return_exceptions=True)
+        return time.perf_counter() - started
+
+    async def run(self, export: ResultsExport = None) -> bool:
+        await self.client.start()
+        if export:
+            export.attach(self.client.metrics)
+        pace = f"{self.speed:g}x speed" if self.speed else "back to back"
+        print(f"📼 Replaying {self.log_path} against {self.client.base_url} ({pace})")
+        try:
+            elapsed = await self.replay()
+        finally:
+            await self.client.close()
+        success = self.print_report(elapsed)
+        return export.finish(self.client.metrics, elapsed) and success if export else success
+
+    def print_report(self, elapsed: float) -> bool:
+        print("\n" + "=" * 80)
+        print("📼 LOG REPLAY SUMMARY")
+        print("=" * 80)
+        metrics = self.client.metrics
+        print(f"Replayed {self.sent} requests in {elapsed:.1f}s ({self.sent / max(elapsed, 1e-6):.1f} req/s)")
+        for reason, count in self.skipped.items():
+            print(f"Skipped: {count} ({reason}{', pass --replay-writes to send them' if reason == 'write' else ''})")
+        if self.speed:
+            print(f"Send lag behind the log's timeline: p50 {self.send_lag_us.percentile(50) / 1000:.1f}ms, "
+                  f"p99 {self.send_lag_us.percentile(99) / 1000:.1f}ms")
+
+        print(f"\n{'Route':<44} {'Count':>6} {'Log p50':>8} {'Now p50':>8} {'Log p95':>8} {'Now p95':>8} "
+              f"{'Δp95':>7} {'Status ≠':>9}")
+        slower = []
+        for key in sorted(self.recorded):
+            recorded = self.recorded[key]
+            replayed = metrics.endpoints.get(key)
+            if replayed is None:
+                print(f"{key:<44} {recorded.total:>6} {'no responses':>20}")
+                continue
+            logged = [recorded.percentile(p) / 1000 for p in (50, 95)]
+            now = [replayed.wall_us.percentile(p) / 1000 for p in (50, 95)]
+            change = (now[1] - logged[1]) / logged[1] if logged[1] else 0.0
+            if change > 0.5 and now[1] - logged[1] > 5:
+                slower.append(key)
+            print(f"{key:<44} {recorded.total:>6} {logged[0]:>6.0f}ms {now[0]:>6.1f}ms {logged[1]:>6.0f}ms "
+                  f"{now[1]:>6.1f}ms {change:>+7.0%} {self.status_mismatches[key]:>9}")
+
+        mismatches = sum(self.status_mismatches.values())
+        print()
+        if slower:
+            print(f"⚠️ {len(slower)} routes more than 50% slower at p95 than in the log: {', '.join(slower)}")
+        if mismatches:
+            print(f"⚠️ {mismatches} responses with a different status than recorded (missing data on the target?)")
+        if not slower and not mismatches:
+            print("✅ Replay latency and statuses in line with the log")
+        print("\n" + "=" * 80)
+        return not mismatches and metrics.total_errors() == 0
+
+
+LIST_ENDPOINTS = {
+    # endpoint: (ijson prefix of the records, fields every record must have)
+    "/bookings": ("item", ("id", "checkInDate", "checkOutDate", "guestEmail", "status", "totalPrice")),
+    "/reviews/all": ("item", ("id", "guestName", "rating", "content")),
+    "/messages": ("item", ("id", "senderName", "senderEmail", "content")),
+    "/chat/admin/conversations": ("conversations.item", ("id", "status", "lastMessageAt")),
+}
+
+
+class ListStreamBenchmark:
+    """Incremental parse and shape check of the unpaginated list endpoints.
+
+    Each endpoint in LIST_ENDPOINTS is downloaded `repeats` times and fed chunk by
+    chunk into an ijson push parser, so only the current chunk and record are held
+    however large the list grows. Every record is checked for its required fields as
+    it completes. The report relates payload size, download and parse time to the row
+    count and flags lists past `max_bytes` or `max_rows` as needing pagination.
+    """
+    def __init__(self, base_url: str, endpoints: List[str] = None, repeats: int = 5, cookies: Dict = None,
+                 chunk_size: int = 65536, max_bytes: int = 1_000_000, max_rows: int = 1000):
+        self.client = AsyncHttpClient(base_url, pool_size=1)
+        self.endpoints = endpoints or list(LIST_ENDPOINTS)
+        self.repeats = repeats
+        self.cookies = cookies or {}
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.max_rows = max_rows
+        self.rows: List[Dict] = []
+
+    async def measure(self, endpoint: str) -> Dict:
+        prefix, fields = LIST_ENDPOINTS.get(endpoint, ("item", ()))
+        row = {"endpoint": endpoint, "status": None, "rows": 0, "size": 0, "invalid": 0, "examples": [],
+               "malformed": None, "ttfb_us": Histogram(), "total_us": Histogram(), "parse_us": Histogram()}
+        for _ in range(self.repeats):
+            records = ijson.sendable_list()
+            parser = ijson.items_coro(records, prefix, use_float=True)
+            count = 0
+            parse = 0.0
+
+            def check():
+                nonlocal count
+                for record in records:
+                    count += 1
+                    missing = [f for f in fields if f not in record] if isinstance(record, dict) else list(fields)
+                    if missing:
+                        row["invalid"] += 1
+                        if len(row["examples"]) < 3:
+                            row["examples"].append(f"record {count}: missing {', '.join(missing)}")
+                del records[:]
+
+            def feed(chunk: bytes):
+                nonlocal parse
+                if row["malformed"]:
+                    return
+                started = time.perf_counter()
+                try:
+                    parser.send(chunk)
+                    check()
+                except ijson.JSONError as e:
+                    row["malformed"] = str(e)
+                parse += time.perf_counter() - started
+
+            start = time.perf_counter()
+            result = await self.client.stream("GET", endpoint, chunk_size=self.chunk_size, cookies=self.cookies,
+                                              on_chunk=feed)
+            elapsed = time.perf_counter() - start
+            row["status"] = result.status_code
+            if result.status_code != 200:
+                break
+            started = time.perf_counter()
+            try:
+                parser.close()
+                check()
+            except ijson.JSONError as e:
+                row["malformed"] = row["malformed"] or str(e)
+            parse += time.perf_counter() - started
+            row["rows"], row["size"] = count, result.size
+            row["ttfb_us"].record(result.ttfb * 1_000_000)
+            row["total_us"].record(elapsed * 1_000_000)
+            row["parse_us"].record(parse * 1_000_000)
+        return row
+
+    async def run(self) -> bool:
+        await self.client.start()
+        print(f"📜 Streaming {len(self.endpoints)} list endpoints, {self.repeats} times each "
+              f"(ijson {ijson.backend} backend)")
+        try:
+            for endpoint in self.endpoints:
+                self.rows.append(await self.measure(endpoint))
+        finally:
+            await self.client.close()
+        return self.print_report()
+
+    def print_report(self) -> bool:
+        print("\n" + "=" * 80)
+        print("📜 LIST RESPONSE SUMMARY")
+        print("=" * 80)
+        print(f"{'Endpoint':<28} {'Rows':>7} {'Size':>10} {'B/row':>7} {'TTFB p50':>9} {'Total p50':>10} "
+              f"{'Parse p50':>10} {'µs/row':>7} {'Invalid':>8}")
+        unpaginated, problems = [], 0
+        for row in self.rows:
+            if row["status"] != 200:
+                hint = " (needs admin --cookies)" if row["status"] in (401, 403) else ""
+                print(f"{row['endpoint']:<28} HTTP {row['status']}{hint}")
+                problems += row["status"] is None or row["status"] >= 500
+                continue
+            rows, size = row["rows"], row["size"]
+            parse = row["parse_us"].percentile(50)
+            print(f"{row['endpoint']:<28} {rows:>7} {size / 1024:>8.1f}kB {size / max(rows, 1):>7.0f} "
+                  f"{row['ttfb_us'].percentile(50) / 1000:>7.1f}ms {row['total_us'].percentile(50) / 1000:>8.1f}ms "
+                  f"{parse / 1000:>8.1f}ms {parse / max(rows, 1):>7.1f} {row['invalid']:>8}")
+            for example in row["examples"]:
+                print(f"    ⚠️ {example}")
+            if row["malformed"]:
+                print(f"    ❌ Malformed JSON: {row['malformed']}")
+            problems += row["invalid"] + bool(row["malformed"])
+            if size > self.max_bytes or rows > self.max_rows:
+                unpaginated.append(row)
+
+        if unpaginated:
+            print(f"\nNeeds pagination (over {self.max_bytes / 1_000_000:g}MB or {self.max_rows} rows):")
+            for row in unpaginated:
+                per_row = row["size"] / max(row["rows"], 1)
+                parse_per_row = row["parse_us"].percentile(50) / max(row["rows"], 1)
+                print(f"  • {row['endpoint']}: at 10x the rows ≈ {per_row * row['rows'] * 10 / 1_000_000:.1f}MB "
+                      f"and {parse_per_row * row['rows'] * 10 / 1000:.0f}ms to parse on every load")
+        else:
+            print(f"\n✅ Every list is under {self.max_bytes / 1_000_000:g}MB and {self.max_rows} rows")
+        print("\n" + "=" * 80)
+        return problems == 0
+
+
+def stripe_signature(secret: str, payload: bytes, timestamp: int = None) -> str:
+    """Stripe-Signature header value for `payload`, as stripe.webhooks.constructEvent verifies it"""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+class StripeWebhookStorm:
+    """Bursts of locally signed Stripe events against /api/webhooks/stripe, checked against the bookings.
+
+    Online-payment bookings are created for the run and each gets one delivery plan:
+    a plain payment_intent.succeeded, the same event delivered `duplicates` times, a
+    payment_failed, a failure followed by a success, a success overtaken by an older
+    failure, or a success followed by charge.refunded. Every event is signed with the
+    test webhook secret at send time, the way Stripe re-signs retries, and all plans
+    are fired at once through a `rate` events/s limiter. Readers poll
+    GET /bookings/:id before and during the burst to show its knock-on latency, and
+    every booking's final state is compared with the plan's expected outcome.
+    """
+    PLANS = {"succeeded": 4, "duplicate": 2, "failed": 1, "failed_then_succeeded": 1, "out_of_order": 1,
+             "refunded": 1}
+    SETTLED = {"status": "confirmed", "paymentStatus": "paid"}
+    UNPAID = {"status": "pending", "paymentStatus": "pending"}
+
+    def __init__(self, base_url: str, secret: str, bookings: int = 100, rate: float = 500.0, duplicates: int = 3,
+                 readers: int = 10, reader_rate: float = 20.0, baseline: float = 5.0, start_date: str = "2033-01-01",
+                 confirm_payment: bool = False, pool_size: int = 100, seed: int = 1):
+        self.client = AsyncHttpClient(base_url, pool_size=pool_size)
+        self.secret = secret
+        self.bookings = bookings
+        self.rate = rate
+        self.duplicates = max(2, duplicates)
+        self.readers = readers
+        self.reader_rate = reader_rate
+        self.baseline = baseline
+        self.start_date = datetime.date.fromisoformat(start_date)
+        self.confirm_payment = confirm_payment
+        self.rng = random.Random(seed)
+        self.booking_ids: List[int] = []
+        self.plans: Dict[int, str] = {}
+        self.next_slot = 0.0
+        self.ack_us: Dict[str, Histogram] = collections.defaultdict(Histogram)
+        self.ack_status: Dict[str, collections.Counter] = collections.defaultdict(collections.Counter)
+        self.signature_errors = 0
+        self.read_us = {"baseline": Histogram(), "burst": Histogram()}
+        self.confirm_us = Histogram()
+        self.confirm_status = collections.Counter()
+        self.reprocessed: List[int] = []
+        self.wrong_state: Dict[str, List[str]] = collections.defaultdict(list)
+        self.refunds_ignored = 0
+        self.burst_elapsed = 0.0
+        self.events_sent = 0
+
+    def random_id(self, prefix: str) -> str:
+        return prefix + "".join(self.rng.choices(string.ascii_letters + string.digits, k=24))
+
+    async def create_bookings(self):
+        for i in range(self.bookings):
+            check_in = self.start_date + datetime.timedelta(days=3 * i)
+            response = await self.client.request("POST", "/bookings", {
+                "guestFirstName": "Webhook",
+                "guestLastName": f"Storm {i}",
+                "guestEmail": f"webhook-storm-{i}@loadtest.local",
+                "guestCountry": "Italy",
+                "guestPhone": "123456789",
+                "checkInDate": check_in.isoformat(),
+                "checkOutDate": (check_in + datetime.timedelta(days=2)).isoformat(),
+                "guests": 2,
+                "paymentMethod": "online",
+                "createdBy": "guest"
+            })
+            if response.status_code in (200, 201):
+                booking = response.json()
+                self.booking_ids.append(booking["id"])
+                self.plans[booking["id"]] = self.rng.choices(list(self.PLANS), list(self.PLANS.values()))[0]
+            else:
+                print(f"⚠️ Could not create booking {i}: HTTP {response.status_code}")
+
+    def payment_intent(self, booking_id: int) -> Dict:
+        amount = self.rng.randint(150, 1500) * 100
+        return {"id": self.random_id("pi_"), "object": "payment_intent", "amount": amount, "currency": "eur",
+                "latest_charge": self.random_id("ch_"), "livemode": False,
+                "metadata": {"bookingId": str(booking_id), "type": "full_payment"}}
+
+    def event(self, kind: str, intent: Dict, created: int = None) -> Dict:
+        """A Stripe event envelope around the payment intent (or its charge, for charge.refunded)"""
+        if kind == "charge.refunded":
+            obj = {"id": intent["latest_charge"], "object": "charge", "amount": intent["amount"],
+                   "amount_refunded": intent["amount"], "refunded": True, "payment_intent": intent["id"],
+                   "currency": intent["currency"], "metadata": intent["metadata"]}
+        else:
+            status = "succeeded" if kind == "payment_intent.succeeded" else "requires_payment_method"
+            obj = {**intent, "status": status, "amount_received": intent["amount"] if status == "succeeded" else 0}
+            if status != "succeeded":
+                obj["last_payment_error"] = {"code": "card_declined", "decline_code": "insufficient_funds",
+                                             "type": "card_error"}
+        return {"id": self.random_id("evt_"), "object": "event", "api_version": "2023-10-16",
+                "created": created or int(time.time()), "type": kind, "livemode": False, "pending_webhooks": 1,
+                "request": {"id": None, "idempotency_key": None}, "data": {"object": obj}}
+
+    async def pace(self):
+        """Token-bucket limiter shared by every plan: one send slot every 1/rate seconds"""
+        now = time.perf_counter()
+        self.next_slot = max(self.next_slot, now) + 1.0 / self.rate
+        delay = self.next_slot - 1.0 / self.rate - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def deliver(self, event: Dict):
+        payload = json.dumps(event, separators=(",", ":")).encode()
+        await self.pace()
+        headers = {"Content-Type": "application/json", "Stripe-Signature": stripe_signature(self.secret, payload)}
+        start = time.perf_counter()
+        try:
+            response = await self.client.request("POST", "/webhooks/stripe", payload, headers)
+        except Exception:
+            self.ack_status[event["type"]]["failed"] += 1
+            return
+        self.events_sent += 1
+        self.ack_us[event["type"]].record((time.perf_counter() - start) * 1_000_000)
+        self.ack_status[event["type"]][response.status_code] += 1
+        if response.status_code == 400 and "Webhook Error" in response.text:
+            self.signature_errors += 1
+
+    async def booking_state(self, booking_id: int) -> Dict:
+        response = await self.client.request("GET", f"/bookings/{booking_id}")
+        return response.json() if response.status_code == 200 else {}
+
+    async def confirm(self, intent: Dict, booking_id: int):
+        start = time.perf_counter()
+        try:
+            response = await self.client.request("POST", "/confirm-payment",
+                                                 {"paymentIntentId": intent["id"], "bookingId": booking_id})
+        except Exception:
+            self.confirm_status["failed"] += 1
+            return
+        self.confirm_us.record((time.perf_counter() - start) * 1_000_000)
+        self.confirm_status[response.status_code] += 1
+
+    async def run_plan(self, booking_id: int, plan: str):
+        intent = self.payment_intent(booking_id)
+        succeeded = self.event("payment_intent.succeeded", intent)
+        failed = self.event("payment_intent.payment_failed", intent, created=succeeded["created"] - 30)
+        if plan in ("succeeded", "refunded", "out_of_order", "duplicate") and self.confirm_payment:
+            await asyncio.gather(self.deliver(succeeded), self.confirm(intent, booking_id))
+        elif plan in ("succeeded", "refunded", "out_of_order", "duplicate"):
+            await self.deliver(succeeded)
+
+        if plan == "duplicate":
+            before = await self.booking_state(booking_id)
+            await asyncio.gather(*(self.deliver(succeeded) for _ in range(self.duplicates - 1)))
+            after = await self.booking_state(booking_id)
+            if before.get("updatedAt") != after.get("updatedAt"):
+                self.reprocessed.append(booking_id)
+        elif plan == "failed":
+            await self.deliver(failed)
+        elif plan == "failed_then_succeeded":
+            await self.deliver(failed)
+            await self.deliver(succeeded)
+        elif plan == "out_of_order":
+            await self.deliver(failed)
+        elif plan == "refunded":
+            await self.deliver(self.event("charge.refunded", intent))
+
+    async def reader(self, phase: Dict, stop: asyncio.Event):
+        async def read():
+            booking_id = self.rng.choice(self.booking_ids)
+            start = time.perf_counter()
+            try:
+                await self.client.request("GET", f"/bookings/{booking_id}")
+            except Exception:
+                return
+            self.read_us[phase["name"]].record((time.perf_counter() - start) * 1_000_000)
+
+        await run_at_rate(self.reader_rate, read, stop)
+
+    async def check_final_states(self):
+        for booking_id in self.booking_ids:
+            plan = self.plans[booking_id]
+            state = await self.booking_state(booking_id)
+            expected = self.UNPAID if plan == "failed" else self.SETTLED
+            actual = {key: state.get(key) for key in expected}
+            if plan == "refunded" and actual == self.SETTLED:
+                self.refunds_ignored += 1
+            elif actual != expected:
+                self.wrong_state[plan].append(f"booking {booking_id}: {actual['status']}/{actual['paymentStatus']}, "
+                                              f"expected {expected['status']}/{expected['paymentStatus']}")
+
+    async def run(self) -> bool:
+        await self.client.start()
+        try:
+            print(f"💳 Creating {self.bookings} online-payment bookings from {self.start_date}...")
+            await self.create_bookings()
+            if not self.booking_ids:
+                print("❌ No bookings to deliver events for")
+                return False
+            phase = {"name": "baseline"}
+            stop = asyncio.Event()
+            readers = [asyncio.create_task(self.reader(phase, stop)) for _ in range(self.readers)]
+            try:
+                await asyncio.sleep(self.baseline)
+                phase["name"] = "burst"
+                print(f"💥 Firing webhook plans for {len(self.booking_ids)} bookings at up to {self.rate:g} events/s")
+                started = time.perf_counter()
+                await asyncio.gather(*(self.run_plan(booking_id, self.plans[booking_id])
+                                       for booking_id in self.booking_ids))
+                self.burst_elapsed = time.perf_counter() - started
+            finally:
+                stop.set()
+                await asyncio.gather(*readers, return_exceptions=True)
+            await self.check_final_states()
+        finally:
+            await self.client.close()
+        return self.print_report()
+
+    def print_report(self) -> bool:
+        print("\n" + "=" * 80)
+        print("💳 STRIPE WEBHOOK STORM SUMMARY")
+        print("=" * 80)
+        print(f"Events: {self.events_sent} in {self.burst_elapsed:.1f}s "
+              f"({self.events_sent / max(self.burst_elapsed, 1e-6):.1f}/s, limit {self.rate:g}/s)")
+        plans = collections.Counter(self.plans.values())
+        print("Plans: " + ", ".join(f"{name} {plans[name]}" for name in self.PLANS if plans[name]))
+
+        print(f"\n{'Event type':<32} {'Acks':>6} {'p50':>8} {'p99':>8} {'Max':>8}  Statuses")
+        not_acked = 0
+        for kind, latency in sorted(self.ack_us.items()):
+            statuses = self.ack_status[kind]
+            not_acked += sum(count for status, count in statuses.items() if not str(status).startswith("2"))
+            print(f"{kind:<32} {latency.total:>6} {latency.percentile(50) / 1000:>6.1f}ms "
+                  f"{latency.percentile(99) / 1000:>6.1f}ms {latency.max / 1000:>6.1f}ms  "
+                  + ", ".join(f"{status}×{count}" for status, count in sorted(statuses.items(), key=str)))
+        if self.signature_errors:
+            print(f"❌ {self.signature_errors} events rejected as unsigned: check the secret matches "
+                  f"STRIPE_WEBHOOK_SECRET, and that no JSON body parser runs before express.raw on this route")
+        elif not_acked:
+            print(f"⚠️ {not_acked} deliveries not acknowledged with 2xx: Stripe would retry every one of them")
+
+        baseline, burst = self.read_us["baseline"], self.read_us["burst"]
+        if baseline.total and burst.total:
+            print(f"\nGET /bookings/:id during the burst: p50 {baseline.percentile(50) / 1000:.1f} -> "
+                  f"{burst.percentile(50) / 1000:.1f}ms, p99 {baseline.percentile(99) / 1000:.1f} -> "
+                  f"{burst.percentile(99) / 1000:.1f}ms ({baseline.total} baseline, {burst.total} burst reads)")
+        if self.confirm_status:
+            print(f"POST /confirm-payment alongside: p50 {self.confirm_us.percentile(50) / 1000:.1f}ms, "
+                  + ", ".join(f"{status}×{count}" for status, count in sorted(self.confirm_status.items(), key=str)))
+
+        print()
+        duplicates = plans["duplicate"]
+        if self.reprocessed:
+            print(f"⚠️ Duplicate deliveries re-applied for {len(self.reprocessed)}/{duplicates} bookings "
+                  f"(updatedAt changed): events are not deduplicated by id")
+        elif duplicates and not self.signature_errors:
+            print(f"✅ Duplicate deliveries left {duplicates} bookings untouched")
+        if self.refunds_ignored:
+            print(f"ℹ️ charge.refunded acknowledged but {self.refunds_ignored} refunded bookings are still paid")
+        for plan, samples in self.wrong_state.items():
+            print(f"❌ {len(samples)} '{plan}' bookings ended in the wrong state")
+            for sample in samples[:3]:
+                print(f"    {sample}")
+        if not self.wrong_state:
+            print("✅ Every booking ended in the state its events imply")
+        print("\n" + "=" * 80)
+        return not self.wrong_state and not not_acked
+
+
+
+class ImageUploadBenchmark:
+    """Admin photo bulk-upload through /api/hero-images/upload, then /property-images and the reorder.
+
+    Images of each size in `sizes_kb` are generated on the fly: a JPEG header, incompressible
+    filler from one reused noise block, and the end marker, so no file is ever held whole.
+    Each one streams as a chunked multipart/form-data body from an async generator, the same
+    fields the dashboard's form sends to multer. `concurrency` uploads run at a time; per size
+    the report shows MB/s over the batch, per-upload latency and its growth with file size,
+    and (with a local `server_pid`) the server's RSS before, at peak and after the batch.
+    The uploaded URLs are then registered with POST /property-images and the hero images
+    reordered in one PUT /hero-images/reorder, before everything created is deleted again.
+    """
+    POSITIONS = ("main", "top-right", "top-left", "bottom-right", "bottom-left")
+    JPEG_HEADER = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    JPEG_END = b"\xff\xd9"
+
+    def __init__(self, base_url: str, cookies: Dict, sizes_kb: List[int], count: int = 10, concurrency: int = 4,
+                 chunk_kb: int = 64, server_pid: int = None, cleanup: bool = True, pool_size: int = 100,
+                 seed: int = 1):
+        self.client = AsyncHttpClient(base_url, pool_size=pool_size, timeout=300.0)
+        self.cookies = cookies
+        self.sizes_kb = sizes_kb
+        self.count = count
+        self.concurrency = concurrency
+        self.chunk_size = chunk_kb * 1024
+        self.server_pid = server_pid
+        self.cleanup = cleanup
+        self.noise = random.Random(seed).randbytes(self.chunk_size)
+        self.results: Dict[int, Dict] = {}
+        self.statuses = collections.Counter()
+        self.errors: Dict[Any, str] = {}
+        self.hero_images: List[Dict] = []
+        self.property_ids: List[int] = []
+        self.register_us = Histogram()
+        self.reorder: Optional[Dict] = None
+        self.deleted = 0
+
+    def image_chunks(self, size: int):
+        """`size` bytes of JPEG, yielded `chunk_size` at a time"""
+        yield self.JPEG_HEADER
+        remaining = size - len(self.JPEG_HEADER) - len(self.JPEG_END)
+        while remaining > 0:
+            chunk = self.noise[:min(remaining, self.chunk_size)]
+            remaining -= len(chunk)
+            yield chunk
+        yield self.JPEG_END
+
+    async def multipart(self, boundary: str, fields: Dict, filename: str, size: int):
+        for name, value in fields.items():
+            yield (f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n').encode()
+        yield (f'--{boundary}\r\nContent-Disposition: form-data; name="image"; filename="{filename}"\r\n'
+               f'Content-Type: image/jpeg\r\n\r\n').encode()
+        for chunk in self.image_chunks(size):
+            yield chunk
+            await asyncio.sleep(0)  # let other uploads interleave between chunks
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    async def upload(self, size_kb: int, index: int, latency: Histogram):
+        boundary = f"----loadtest{random.getrandbits(64):016x}"
+        fields = {"title": f"Load test {size_kb}kB #{index}", "alt": f"Upload benchmark image {index}",
+                  "position": self.POSITIONS[index % len(self.POSITIONS)], "isActive": "false",
+                  "displayOrder": 1000 + index}
+        body = self.multipart(boundary, fields, f"loadtest-{size_kb}kb-{index}.jpg", size_kb * 1024)
+        headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+        start = time.perf_counter()
+        try:
+            response = await self.client.request("POST", "/hero-images/upload", body, headers, self.cookies)
+        except Exception as e:
+            self.statuses["failed"] += 1
+            self.errors.setdefault("failed", str(e) or type(e).__name__)
+            return False
+        self.statuses[response.status_code] += 1
+        if response.status_code != 200:
+            self.errors.setdefault(response.status_code, response.text[:120])
+            return False
+        latency.record((time.perf_counter() - start) * 1_000_000)
+        self.hero_images.append(response.json())
+        return True
+
+    async def watch_memory(self, peak: Dict, stop: asyncio.Event):
+        while not stop.is_set():
+            peak["rss_kb"] = max(peak["rss_kb"], process_usage(process_tree(self.server_pid))["rss_kb"])
+            try:
+                await asyncio.wait_for(stop.wait(), 0.2)
+            except asyncio.TimeoutError:
+                pass
+
+    async def batch(self, size_kb: int):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        latency = Histogram()
+
+        async def limited(index: int):
+            async with semaphore:
+                return await self.upload(size_kb, index, latency)
+
+        result = {"latency": latency}
+        stop = asyncio.Event()
+        watcher = None
+        if self.server_pid:
+            result["rss_before"] = process_usage(process_tree(self.server_pid))["rss_kb"]
+            result["peak"] = {"rss_kb": result["rss_before"]}
+            watcher = asyncio.create_task(self.watch_memory(result["peak"], stop))
+        started = time.perf_counter()
+        uploaded = await asyncio.gather(*(limited(i) for i in range(self.count)))
+        result["elapsed"] = time.perf_counter() - started
+        result["ok"] = sum(uploaded)
+        if watcher:
+            stop.set()
+            await watcher
+            result["rss_after"] = process_usage(process_tree(self.server_pid))["rss_kb"]
+        self.results[size_kb] = result
+
+    async def register_and_reorder(self):
+        for order, image in enumerate(self.hero_images):
+            start = time.perf_counter()
+            response = await self.client.request("POST", "/property-images", {
+                "url": image["url"], "alt": image["alt"], "isPrimary": False, "displayOrder": 1000 + order
+            }, cookies=self.cookies)
+            if response.status_code == 200:
+                self.register_us.record((time.perf_counter() - start) * 1_000_000)
+                self.property_ids.append(response.json()["id"])
+            else:
+                self.statuses[f"property-images {response.status_code}"] += 1
+
+        updates = [{"id": image["id"], "displayOrder": order}
+                   for order, image in enumerate(reversed(self.hero_images))]
+        start = time.perf_counter()
+        response = await self.client.request("PUT", "/hero-images/reorder", {"updates": updates},
+                                             cookies=self.cookies)
+        self.reorder = {"images": len(updates), "status": response.status_code,
+                        "ms": (time.perf_counter() - start) * 1000}
+
+    async def delete_created(self):
+        for endpoint, ids in (("/hero-images", [image["id"] for image in self.hero_images]),
+                              ("/property-images", self.property_ids)):
+            for image_id in ids:
+                response = await self.client.request("DELETE", f"{endpoint}/{image_id}", cookies=self.cookies)
+                self.deleted += response.status_code == 200
+
+    async def run(self) -> bool:
+        await self.client.start()
+        try:
+            for size_kb in self.sizes_kb:
+                print(f"📤 Uploading {self.count} × {size_kb}kB images, {self.concurrency} at a time...")
+                await self.batch(size_kb)
+            if self.hero_images:
+                print(f"🖼️ Registering {len(self.hero_images)} property images and reordering the hero images...")
+                await self.register_and_reorder()
+            if self.cleanup:
+                await self.delete_created()
+        finally:
+            await self.client.close()
+        return self.print_report()
+
+    def print_report(self) -> bool:
+        print("\n" + "=" * 80)
+        print("📤 IMAGE UPLOAD SUMMARY")
+        print("=" * 80)
+        print(f"{'Size':>8} {'OK':>7} {'MB/s':>8} {'p50':>9} {'p99':>9} {'Max':>9} {'ms/MB':>7} {'Server RSS':>24}")
+        points = []
+        for size_kb, result in self.results.items():
+            latency = result["latency"]
+            mb = size_kb / 1024
+            throughput = result["ok"] * mb / max(result["elapsed"], 1e-9)
+            p50 = latency.percentile(50) / 1000
+            if latency.total:
+                points.append((mb, p50))
+            rss = "-"
+            if "rss_before" in result:
+                rss = (f"{result['rss_before'] / 1024:.0f} -> {result['peak']['rss_kb'] / 1024:.0f} -> "
+                       f"{result['rss_after'] / 1024:.0f}MB")
+            print(f"{size_kb:>6}kB {result['ok']:>3}/{self.count:<3} {throughput:>8.2f} {p50:>7.1f}ms "
+                  f"{latency.percentile(99) / 1000:>7.1f}ms {latency.max / 1000:>7.1f}ms "
+                  f"{p50 / mb if latency.total else 0:>7.1f} {rss:>24}")
+
+        fit = linear_fit(points)
+        if fit:
+            intercept, slope = fit
+            mean = sum(y for _, y in points) / len(points)
+            print(f"\nMedian upload latency ≈ {intercept:.1f}ms + {slope:.1f}ms per MB "
+                  f"({1000 / slope:.1f} MB/s per upload)" if slope > 0 else
+                  f"\nMedian upload latency does not grow with size ({mean:.1f}ms on average)")
+        batches = [result for result in self.results.values() if "rss_before" in result]
+        if batches:
+            growth = (batches[-1]["rss_after"] - batches[0]["rss_before"]) / 1024
+            peak = max(result["peak"]["rss_kb"] for result in batches) / 1024
+            in_flight = max(self.sizes_kb) / 1024 * self.concurrency
+            print(f"Server RSS grew {growth:+.1f}MB over the run (peak {peak:.0f}MB)"
+                  + (" ⚠️ more than twice the bytes in flight, uploads are not released" if growth > 2 * in_flight
+                     else ""))
+
+        if self.register_us.total:
+            print(f"\nPOST /property-images: {self.register_us.total} registered, "
+                  f"p50 {self.register_us.percentile(50) / 1000:.1f}ms, max {self.register_us.max / 1000:.1f}ms")
+        if self.reorder:
+            print(f"PUT /hero-images/reorder of {self.reorder['images']} images: HTTP {self.reorder['status']} "
+                  f"in {self.reorder['ms']:.1f}ms ({self.reorder['ms'] / max(self.reorder['images'], 1):.2f}ms "
+                  f"per image, one UPDATE each)")
+        if self.cleanup and (self.hero_images or self.property_ids):
+            print(f"🧹 Deleted {self.deleted}/{len(self.hero_images) + len(self.property_ids)} created images")
+
+        failed = {status: count for status, count in self.statuses.items() if status != 200}
+        if failed:
+            print("\n❌ Failed requests: " + ", ".join(f"{status}×{count}" for status, count in failed.items()))
+            for status, message in self.errors.items():
+                hint = " (needs admin --cookies)" if status in (401, 403) else ""
+                print(f"    {status}: {message}{hint}")
+            if any(size_kb > 10 * 1024 for size_kb in self.sizes_kb):
+                print("    multer rejects files over 10MB")
+        print("\n" + "=" * 80)
+        return not failed
+
+
+def open_loop_schedule(rate: float, duration: float, poisson: bool = False, seed: int = None) -> "array":
+    """Intended start offsets (seconds from t0) of every request of an open-loop run, computed up front"""
+    rng = random.Random(seed)
+    schedule = array("d")
+    at = 0.0
+    while at < duration:
+        schedule.append(at)
+        # constant spacing is derived from the count: summing 1 / rate drifts and can add a send
+        at = at + rng.expovariate(rate) if poisson else len(schedule) / rate
+    return schedule
+
+
+class OpenLoopRunner:
+    """Fires requests on a precomputed intended-start timeline and times them from that timeline.
+
+    Every send has its intended start fixed before the run begins (constant spacing or
+    Poisson arrivals) and is measured on the monotonic perf_counter clock. The response
+    time of a request runs from its intended start, not from when it actually went out,
+    so a server stall that holds back sends (full in-flight cap, busy event loop) shows
+    up in the percentiles the way waiting guests see it instead of being hidden by the
+    pause in sending; AsyncHttpClient records it that way too, so the latency table and
+    --summary/--baseline carry the corrected numbers, while TTFB stays measured from the
+    actual send. Service time (actual send -> response) is kept alongside to show the
+    gap. Sends that go out more than `late_ms` behind schedule are counted late, and
+    sends more than `max_lag` seconds behind are not sent at all but counted as missed,
+    with that lag as a lower bound of their response time.
+    """
+    TARGETS = {
+        "lookup": ("POST", "/booking-lookup/find"),
+        "chat": ("POST", "/chat/send"),
+    }
+
+    def __init__(self, base_url: str, rate: float, duration: float, mix: Dict[str, float] = None,
+                 poisson: bool = False, max_in_flight: int = 1000, late_ms: float = 5.0, max_lag: float = 5.0,
+                 conversations: int = 20, start_date: str = "2034-06-01", pool_size: int = 100, seed: int = 1):
+        self.client = AsyncHttpClient(base_url, pool_size=pool_size)
+        self.rate = rate
+        self.duration = duration
+        self.mix = mix or {"lookup": 1, "chat": 1}
+        self.poisson = poisson
+        self.max_in_flight = max_in_flight
+        self.late = late_ms / 1000
+        self.max_lag = max_lag
+        self.conversations = conversations
+        self.start_date = datetime.date.fromisoformat(start_date)
+        self.rng = random.Random(seed)
+        self.schedule = open_loop_schedule(rate, duration, poisson, seed)
+        names = list(self.mix)
+        self.targets = array("B", (names.index(name) for name in
+                                   self.rng.choices(names, list(self.mix.values()), k=len(self.schedule))))
+        self.names = names
+        self.lookup_body: Dict = {}
+        self.conversation_ids: List[int] = []
+        self.chat_cursor = 0
+        self.service_us = {name: Histogram() for name in names}
+        self.response_us = {name: Histogram() for name in names}
+        self.with_missed_us = {name: Histogram() for name in names}
+        self.statuses = {name: collections.Counter() for name in names}
+        self.lag_us = Histogram()
+        self.late_sends = 0
+        self.missed = collections.Counter()
+        self.elapsed = 0.0
+
+    async def setup(self):
+        """One booking to look up and a few guest conversations to post into"""
+        if "lookup" in self.mix:
+            for attempt in range(10):
+                check_in = self.start_date + datetime.timedelta(days=7 * attempt)
+                email = "open-loop@loadtest.local"
+                response = await self.client.request("POST", "/bookings", {
+                    "guestFirstName": "Open", "guestLastName": "Loop", "guestEmail": email,
+                    "guestCountry": "Italy", "guestPhone": "123456789", "checkInDate": check_in.isoformat(),
+                    "checkOutDate": (check_in + datetime.timedelta(days=2)).isoformat(), "guests": 2,
+                    "paymentMethod": "property", "createdBy": "guest"
+                })
+                if response.status_code in (200, 201):
+                    self.lookup_body = {"confirmationCode": response.json()["confirmationCode"], "email": email}
+                    break
+            else:
+                print("⚠️ Could not create a booking to look up, timing not-found lookups instead")
+                self.lookup_body = {"confirmationCode": "ARCO000000", "email": "open-loop@loadtest.local"}
+        if "chat" in self.mix:
+            for i in range(self.conversations):
+                response = await self.client.request("POST", "/chat/start", {
+                    "message": "Open-loop timing conversation", "guestName": f"Open Loop {i}",
+                    "guestEmail": f"open-loop-{i}@loadtest.local"
+                })
+                if response.status_code == 200 and response.json().get("conversationId"):
+                    self.conversation_ids.append(response.json()["conversationId"])
+            if not self.conversation_ids:
+                raise RuntimeError("could not start any chat conversation")
+
+    def body(self, name: str) -> Dict:
+        if name == "lookup":
+            return self.lookup_body
+        self.chat_cursor += 1
+        return {"conversationId": self.conversation_ids[self.chat_cursor % len(self.conversation_ids)],
+                "content": f"Open-loop message {self.chat_cursor}"}
+
+    async def send(self, name: str, intended: float, slots: asyncio.Semaphore):
+        method, endpoint = self.TARGETS[name]
+        try:
+            start = time.perf_counter()
+            try:
+                response = await self.client.request(method, endpoint, self.body(name), intended=intended)
+                status = response.status_code
+            except Exception:
+                status = "failed"
+            end = time.perf_counter()
+            self.service_us[name].record((end - start) * 1_000_000)
+            self.response_us[name].record((end - intended) * 1_000_000)
+            self.with_missed_us[name].record((end - intended) * 1_000_000)
+            self.statuses[name][status] += 1
+        finally:
+            slots.release()
+
+    async def dispatch(self) -> float:
+        """Walk the schedule, sending each request at its intended start or as soon after as possible"""
+        slots = asyncio.Semaphore(self.max_in_flight)
+        in_flight = set()
+        t0 = time.perf_counter() + 0.1
+        for offset, target in zip(self.schedule, self.targets):
+            intended = t0 + offset
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await slots.acquire()
+            lag = time.perf_counter() - intended
+            name = self.names[target]
+            if lag > self.max_lag:
+                slots.release()
+                self.missed[name] += 1
+                self.with_missed_us[name].record(lag * 1_000_000)
+                continue
+            self.lag_us.record(lag * 1_000_000)
+            if lag > self.late:
+                self.late_sends += 1
+            task = asyncio.create_task(self.send(name, intended, slots))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        await asyncio.gather(*in_flight, return_exceptions=True)
+        return time.perf_counter() - t0
+
+    async def run(self, export: ResultsExport = None) -> bool:
+        await self.client.start()
+        try:
+            await self.setup()
+            self.client.metrics = RequestMetrics()
+            if export:
+                export.attach(self.client.metrics)
+            arrivals = "Poisson" if self.poisson else "evenly spaced"
+            print(f"⏱️ Open loop: {len(self.schedule)} requests at {self.rate:g}/s for {self.duration:.0f}s "
+                  f"({arrivals}), up to {self.max_in_flight} in flight")
+            self.elapsed = await self.dispatch()
+        finally:
+            await self.client.close()
+        success = self.print_report()
+        return export.finish(self.client.metrics, self.elapsed) and success if export else success
+
+    def print_report(self) -> bool:
+        print("\n" + "=" * 80)
+        print("⏱️ OPEN-LOOP TIMING SUMMARY")
+        print("=" * 80)
+        sent = self.lag_us.total
+        missed = sum(self.missed.values())
+        on_time = sent - self.late_sends
+        print(f"Schedule: {len(self.schedule)} intended sends, {sent} sent in {self.elapsed:.1f}s "
+              f"({sent / max(self.elapsed, 1e-9):.1f}/s, target {self.rate:g}/s)")
+        print(f"On time: {on_time}, late (> {self.late * 1000:g}ms behind): {self.late_sends}, "
+              f"missed (> {self.max_lag:g}s behind, not sent): {missed}")
+        print(f"Send lag: p50 {self.lag_us.percentile(50) / 1000:.2f}ms, p99 {self.lag_us.percentile(99) / 1000:.2f}ms, "
+              f"max {self.lag_us.max / 1000:.1f}ms")
+
+        print(f"\n{'Route':<26} {'Sent':>6} {'Service p50':>12} {'p99':>9} {'Response p50':>13} {'p99':>9} "
+              f"{'Max':>9} {'p99 w/ missed':>14}")
+        errors = 0
+        for name in self.names:
+            method, endpoint = self.TARGETS[name]
+            service, response = self.service_us[name], self.response_us[name]
+            errors += sum(count for status, count in self.statuses[name].items()
+                          if status == "failed" or status >= 500)
+            print(f"{method + ' ' + endpoint:<26} {response.total:>6} {service.percentile(50) / 1000:>10.1f}ms "
+                  f"{service.percentile(99) / 1000:>7.1f}ms {response.percentile(50) / 1000:>11.1f}ms "
+                  f"{response.percentile(99) / 1000:>7.1f}ms {response.max / 1000:>7.1f}ms "
+                  f"{self.with_missed_us[name].percentile(99) / 1000:>12.1f}ms")
+        print("\nService time runs from the actual send, response time from the intended start: "
+              "the difference is time guests spent waiting while sends were held back.")
+        for name in self.names:
+            service, response = self.service_us[name], self.response_us[name]
+            if service.total and response.percentile(99) > 2 * service.percentile(99):
+                print(f"⚠️ {self.TARGETS[name][1]}: p99 response {response.percentile(99) / 1000:.1f}ms is "
+                      f"{response.percentile(99) / max(service.percentile(99), 1):.1f}x the service p99: "
+                      f"a closed-loop client would have reported the smaller number")
+        if self.late_sends > 0.01 * max(sent, 1) and self.lag_us.percentile(50) > self.late * 1_000_000:
+            print("⚠️ Most sends were late even outside stalls: the client itself cannot keep up, "
+                  "lower --open-loop-rate or raise --open-loop-max-in-flight")
+        statuses = {name: counts for name, counts in self.statuses.items()
+                    if any(status != 200 for status in counts)}
+        for name, counts in statuses.items():
+            print(f"  {self.TARGETS[name][1]}: " + ", ".join(f"{status}×{count}"
+                                                             for status, count in sorted(counts.items(), key=str)))
+        print_latency_table(self.client.metrics, self.elapsed)
+        print("\n" + "=" * 80)
+        return errors == 0 and missed == 0
+
+
+class LoginStorm:
+    """Morning-login burst against the password endpoints at rising concurrency.
+
+    A pool of guest accounts is created up front through /api/auth/signup (bcrypt cost
+    12, so signup latency is timed too) and the session each signup opens is logged out
+    again; accounts left over from an earlier run with the same seed are reused. Each
+    concurrency step then runs that many workers looping login -> logout for
+    `step_duration` seconds. Admin accounts from a credentials file, if given, take
+    `admin_ratio` of the flows through /admin/auth/login + verify-totp.
+    Readers poll /bookings/calendar/:year/:month on their own connection pool during a
+    quiet baseline and every step, so the report shows what a login storm does to guest
+    reads next to logins/s, per-endpoint latency and, with a session-count command, how
+    the session table grows.
+    """
+    PASSWORD = "LoadTest2024"
+    LOGIN = "POST /auth/login"
+    ADMIN_LOGIN = "POST /admin/auth/login"
+    VERIFY = "POST /admin/auth/verify-totp"
+    LOGOUT = "POST /auth/logout"
+    CALENDAR = "GET /bookings/calendar/:year/:month"
+
+    def __init__(self, base_url: str, accounts: int = 200, concurrency: List[int] = None, step_duration: float = 20.0,
+                 admins: List[Dict] = None, admin_ratio: float = 0.1, readers: int = 5, reader_rate: float = 10.0,
+                 baseline: float = 10.0, signup_concurrency: int = 4, session_count_command: str = None,
+                 pool_size: int = 100, seed: int = 1):
+        self.client = AsyncHttpClient(base_url, pool_size=pool_size)
+        self.reader_client = AsyncHttpClient(base_url, pool_size=max(readers, 1))
+        self.account_count = accounts
+        self.concurrency = concurrency or [1, 5, 10, 25, 50]
+        self.step_duration = step_duration
+        self.admins = admins or []
+        self.admin_ratio = admin_ratio if self.admins else 0.0
+        self.readers = readers
+        self.reader_rate = reader_rate
+        self.baseline = baseline
+        self.signup_concurrency = signup_concurrency
+        self.session_count_command = session_count_command
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.accounts: List[Dict] = []
+        self.created = 0
+        self.signup = RequestMetrics()
+        self.baseline_reads = Histogram()
+        self.steps: List[Dict] = []
+        self.failures = collections.Counter()
+        self.cursor = 0
+
+    async def create_accounts(self):
+        semaphore = asyncio.Semaphore(self.signup_concurrency)
+
+        async def signup(index: int):
+            email = f"login-storm-{self.seed}-{index}@loadtest.local"
+            async with semaphore:
+                try:
+                    response = await self.client.request("POST", "/auth/signup", {
+                        "firstName": "Login", "lastName": f"Storm {index}", "email": email,
+                        "password": self.PASSWORD, "confirmPassword": self.PASSWORD
+                    })
+                    if response.status_code == 201:
+                        # signup logs the new account in; end that session so it doesn't skew the session count
+                        logout = await self.client.request("POST", "/auth/logout", cookies=dict(response.cookies))
+                        if logout.status_code != 200:
+                            self.failures[f"POST /auth/logout {logout.status_code}"] += 1
+                except Exception as e:
+                    self.failures[f"POST /auth/signup {type(e).__name__}"] += 1
+                    return
+            if response.status_code == 201:
+                self.created += 1
+            elif response.status_code != 400 or "already exists" not in response.text:
+                self.failures[f"POST /auth/signup {response.status_code}"] += 1
+                return
+            self.accounts.append({"email": email, "password": self.PASSWORD})
+
+        await asyncio.gather(*(signup(i) for i in range(self.account_count)), return_exceptions=True)
+        self.signup = self.client.metrics
+        self.client.metrics = RequestMetrics()
+
+    def next_account(self) -> Dict:
+        if self.admins and self.rng.random() < self.admin_ratio:
+            return self.rng.choice(self.admins)
+        self.cursor += 1
+        return self.accounts[self.cursor % len(self.accounts)]
+
+    async def login_flow(self, account: Dict, failures: collections.Counter) -> bool:
+        """Log one account in (with TOTP for admins) and out again; True if every step succeeded"""
+        flow = account.get("flow") or ("admin" if account.get("totpSecret") else "team")
+        endpoint = "/admin/auth/login" if flow == "admin" else "/auth/login"
+        credentials = {"email": account["email"], "password": account["password"]}
+        response = await self.client.request("POST", endpoint, credentials)
+        if response.status_code != 200:
+            failures[f"POST {endpoint} {response.status_code}"] += 1
+            return False
+        cookies = dict(response.cookies)
+        data = response.json()
+        ok = True
+        if data.get("requiresTOTPSetup"):
+            failures[f"{account['email']} has no TOTP set up"] += 1
+            ok = False
+        elif (data.get("requiresTOTP") or data.get("requiresTOTPVerification")) and not account.get("totpSecret"):
+            failures[f"{account['email']} requires TOTP but has no totpSecret"] += 1
+            ok = False
+        elif data.get("requiresTOTP") or data.get("requiresTOTPVerification"):
+            response = await self.client.request("POST", "/admin/auth/verify-totp",
+                                                 {"code": totp_code(account["totpSecret"])}, cookies=cookies)
+            cookies.update(response.cookies)
+            if response.status_code != 200:
+                failures[f"POST /admin/auth/verify-totp {response.status_code}"] += 1
+                ok = False
+        response = await self.client.request("POST", "/auth/logout", cookies=cookies)
+        if response.status_code != 200:
+            failures[f"POST /auth/logout {response.status_code}"] += 1
+            return False
+        return ok
+
+    async def worker(self, step: Dict, stop: asyncio.Event):
+        while not stop.is_set():
+            try:
+                if await self.login_flow(self.next_account(), step["failures"]):
+                    step["flows"] += 1
+            except Exception as e:
+                step["failures"][type(e).__name__] += 1
+
+    async def reader(self, stop: asyncio.Event):
+        today = datetime.date.today()
+
+        async def read():
+            month = today.month - 1 + self.rng.randrange(12)
+            endpoint = f"/bookings/calendar/{today.year + month // 12}/{month % 12 + 1}"
+            try:
+                await self.reader_client.request("GET", endpoint)
+            except Exception:
+                pass
+
+        await run_at_rate(self.reader_rate, read, stop)
+
+    def drain_reads(self) -> Histogram:
+        reads = RequestMetrics()
+        reads.merge_snapshot(self.reader_client.metrics.drain())
+        endpoint = reads.endpoints.get(self.CALENDAR)
+        return endpoint.wall_us if endpoint else Histogram()
+
+    async def run_step(self, concurrency: int):
+        step = {"concurrency": concurrency, "flows": 0, "failures": collections.Counter(),
+                "sessions_before": await session_count(self.session_count_command)}
+        self.client.metrics.drain()
+        self.drain_reads()
+        stop = asyncio.Event()
+        started = time.perf_counter()
+        workers = [asyncio.create_task(self.worker(step, stop)) for _ in range(concurrency)]
+        await asyncio.sleep(self.step_duration)
+        stop.set()
+        await asyncio.gather(*workers, return_exceptions=True)
+        step["elapsed"] = time.perf_counter() - started
+        step["metrics"] = RequestMetrics()
+        step["metrics"].merge_snapshot(self.client.metrics.drain())
+        step["reads"] = self.drain_reads()
+        step["sessions_after"] = await session_count(self.session_count_command)
+        self.steps.append(step)
+        login = self.endpoint(step, self.LOGIN) or self.endpoint(step, self.ADMIN_LOGIN)
+        print(f"  {concurrency:>4} concurrent: {step['flows'] / step['elapsed']:.1f} logins/s, "
+              f"login p99 {login.percentile(99) / 1000 if login else 0:.0f}ms")
+
+    @staticmethod
+    def endpoint(step: Dict, key: str) -> Optional[Histogram]:
+        metrics = step["metrics"].endpoints.get(key)
+        return metrics.wall_us if metrics and metrics.count else None
+
+    async def run(self) -> bool:
+        await self.client.start()
+        await self.reader_client.start()
+        stop = asyncio.Event()
+        readers = []
+        try:
+            print(f"👥 Preparing {self.account_count} accounts through /auth/signup...")
+            await self.create_accounts()
+            if not self.accounts:
+                print("❌ No accounts to log in with")
+                return self.print_report()
+            readers = [asyncio.create_task(self.reader(stop)) for _ in range(self.readers)]
+            await asyncio.sleep(self.baseline)
+            self.baseline_reads = self.drain_reads()
+            print(f"🔐 Login storm at {', '.join(map(str, self.concurrency))} concurrent users, "
+                  f"{self.step_duration:g}s each")
+            for concurrency in self.concurrency:
+                await self.run_step(concurrency)
+        finally:
+            stop.set()
+            await asyncio.gather(*readers, return_exceptions=True)
+            await self.client.close()
+            await self.reader_client.close()
+        return self.print_report()
+
+    def print_report(self) -> bool:
+        print("\n" + "=" * 80)
+        print("🔐 LOGIN STORM SUMMARY")
+        print("=" * 80)
+        signup = self.signup.endpoints.get("POST /auth/signup")
+        admins = f", {len(self.admins)} admin accounts at {self.admin_ratio:.0%} of flows" if self.admins else ""
+        failed = self.account_count - len(self.accounts)
+        print(f"Accounts: {len(self.accounts)} ready ({self.created} created, "
+              f"{len(self.accounts) - self.created} reused{f', {failed} signups failed' if failed else ''}){admins}")
+        if signup and self.created:
+            print(f"Signup (bcrypt cost 12): p50 {signup.wall_us.percentile(50) / 1000:.0f}ms, "
+                  f"p99 {signup.wall_us.percentile(99) / 1000:.0f}ms at {self.signup_concurrency} concurrent")
+
+        base = self.baseline_reads
+        print(f"\n{'Users':>5} {'Logins/s':>9} {'Login p50':>10} {'p99':>8} {'TOTP p99':>9} {'Logout p99':>11} "
+              f"{'Calendar p50':>13} {'p99':>8} {'Sessions Δ':>11} {'Errors':>7}")
+        print(f"{'idle':>5} {'-':>9} {'-':>10} {'-':>8} {'-':>9} {'-':>11} "
+              f"{base.percentile(50) / 1000:>11.1f}ms {base.percentile(99) / 1000:>6.1f}ms {'-':>11} {'-':>7}")
+
+        def ms(histogram: Optional[Histogram], percent: float) -> str:
+            return f"{histogram.percentile(percent) / 1000:.1f}ms" if histogram else "-"
+
+        floor = None
+        peak = (0.0, None)
+        errors = sum(self.failures.values())
+        for step in self.steps:
+            login = self.endpoint(step, self.LOGIN) or self.endpoint(step, self.ADMIN_LOGIN)
+            verify, logout = self.endpoint(step, self.VERIFY), self.endpoint(step, self.LOGOUT)
+            rate = step["flows"] / step["elapsed"]
+            if login and floor is None:
+                floor = login.percentile(50) / 1_000_000
+            if rate > peak[0]:
+                peak = (rate, step["concurrency"])
+            before, after = step["sessions_before"], step["sessions_after"]
+            step["growth"] = after - before if before is not None and after is not None else None
+            failures = sum(step["failures"].values())
+            errors += failures
+            print(f"{step['concurrency']:>5} {rate:>9.1f} {ms(login, 50):>10} {ms(login, 99):>8} {ms(verify, 99):>9} "
+                  f"{ms(logout, 99):>11} {ms(step['reads'], 50):>13} {ms(step['reads'], 99):>8} "
+                  f"{step['growth'] if step['growth'] is not None else '-':>11} {failures:>7}")
+
+        if floor and peak[1]:
+            parallel = peak[0] * floor
+            print(f"\nPeak {peak[0]:.1f} logins/s at {peak[1]} users; with the {floor * 1000:.0f}ms median login of "
+                  f"the first step that is ≈{parallel:.1f} password checks in parallel")
+            rates = [step["flows"] / step["elapsed"] for step in self.steps]
+            if parallel < 5 and len(rates) > 1 and rates[-1] < 1.1 * rates[-2]:
+                print("⚠️ Logins/s stopped growing with a handful of password checks in flight: bcrypt runs on "
+                      "libuv's threadpool (4 threads unless UV_THREADPOOL_SIZE is raised)")
+        if self.steps and base.total:
+            worst = max(self.steps, key=lambda step: step["reads"].percentile(99))
+            slowdown = worst["reads"].percentile(99) / max(base.percentile(99), 1)
+            print(f"Calendar reads: p99 {base.percentile(99) / 1000:.1f}ms idle -> "
+                  f"{worst['reads'].percentile(99) / 1000:.1f}ms at {worst['concurrency']} logging in "
+                  f"({slowdown:.1f}x)")
+        grown = [step for step in self.steps if step.get("growth")]
+        if grown:
+            total = sum(step["growth"] for step in grown)
+            flows = sum(step["flows"] for step in self.steps)
+            print(f"⚠️ Session table grew by {total} rows over {flows} login/logout cycles: "
+                  f"{1000 * total / max(flows, 1):.0f} per 1000 logins survive logout")
+        elif self.session_count_command and self.steps:
+            print("✅ Session table back to its size after every step")
+        elif not self.session_count_command:
+            print("ℹ️ Pass --session-count-command to track session-table growth")
+
+        for step in self.steps:
+            self.failures.update(step["failures"])
+        if self.failures:
+            print("\n❌ Failures:")
+            for reason, count in self.failures.most_common(8):
+                print(f"  • {reason}: {count}")
+        print("\n" + "=" * 80)
+        return errors == 0 and bool(self.accounts)
+
+
+def start_ws_storm(args, server_pid, export, sampler):
+    return WebSocketStorm(
+        args.base_url, clients=args.ws_clients, admin_ratio=args.ws_admin_ratio,
+        connect_rate=args.ws_connect_rate, duration=args.duration or 30.0, conversations=args.ws_conversations,
+        typing_rate=args.ws_typing_rate, message_rate=args.ws_message_rate,
+        ping_interval=args.ws_ping_interval,
+        storm_rates=[int(rate) for rate in args.ws_storm_rates.split(",") if rate.strip()],
+        server_pid=server_pid
+    ).run()
+
+
+def start_login_storm(args, server_pid, export, sampler):
+    admins = []
+    if args.credentials:
+        with open(args.credentials) as f:
+            admins = json.load(f)
+    return LoginStorm(args.base_url, accounts=args.login_accounts,
+                      concurrency=[int(n) for n in args.login_concurrency.split(",")],
+                      step_duration=args.login_step_duration, admins=admins,
+                      admin_ratio=args.login_admin_ratio, readers=args.login_readers,
+                      session_count_command=args.session_count_command, pool_size=args.pool_size,
+                      seed=args.seed).run()
+
+
+def start_open_loop(args, server_pid, export, sampler):
+    mix = {}
+    for item in args.open_loop_mix.split(","):
+        name, _, weight = item.partition(":")
+        if name not in OpenLoopRunner.TARGETS:
+            print(f"❌ Unknown --open-loop-mix route '{name}', expected one of {', '.join(OpenLoopRunner.TARGETS)}")
+            sys.exit(1)
+        mix[name] = float(weight or 1)
+    return OpenLoopRunner(args.base_url, args.open_loop_rate, args.open_loop_duration, mix,
+                          poisson=args.open_loop_poisson, max_in_flight=args.open_loop_max_in_flight,
+                          late_ms=args.late_ms, max_lag=args.max_lag, pool_size=args.pool_size,
+                          seed=args.seed).run(export)
+
+
+def start_upload_bench(args, server_pid, export, sampler):
+    if not args.cookies:
+        print("❌ --upload-bench needs admin --cookies: every image route is admin only")
+        sys.exit(1)
+    return ImageUploadBenchmark(args.base_url, load_cookie_file(args.cookies),
+                                [int(size) for size in args.upload_sizes.split(",")], count=args.upload_count,
+                                concurrency=args.upload_concurrency, chunk_kb=args.upload_chunk_kb,
+                                server_pid=server_pid, cleanup=not args.upload_keep,
+                                pool_size=args.pool_size, seed=args.seed).run()
+
+
+def start_webhook_storm(args, server_pid, export, sampler):
+    if not args.stripe_webhook_secret:
+        print("❌ --webhook-storm needs --stripe-webhook-secret (or STRIPE_WEBHOOK_SECRET) matching the server's")
+        sys.exit(1)
+    return StripeWebhookStorm(args.base_url, args.stripe_webhook_secret, bookings=args.webhook_bookings,
+                              rate=args.webhook_rate, duplicates=args.webhook_duplicates,
+                              readers=args.concurrency, start_date=args.webhook_start_date,
+                              confirm_payment=args.webhook_confirm_payment, pool_size=args.pool_size,
+                              seed=args.seed).run()
+
+
+def start_list_bench(args, server_pid, export, sampler):
+    if ijson is None:
+        print("❌ --list-bench requires ijson (pip install ijson)")
+        sys.exit(1)
+    return ListStreamBenchmark(args.base_url, endpoints=[e for e in args.list_endpoints.split(",") if e],
+                               repeats=args.list_repeats, max_bytes=args.list_max_bytes,
+                               max_rows=args.list_max_rows,
+                               cookies=load_cookie_file(args.cookies) if args.cookies else None).run()
+
+
+def start_replay_log(args, server_pid, export, sampler):
+    bodies = None
+    if args.replay_bodies:
+        with open(args.replay_bodies) as f:
+            bodies = json.load(f)
+    return LogReplay(args.base_url, args.replay_log, speed=args.replay_speed, writes=args.replay_writes,
+                     bodies=bodies, limit=args.replay_limit, pool_size=args.pool_size).run(export)
+
+
+def start_connection_bench(args, server_pid, export, sampler):
+    return ConnectionBenchmark(args.base_url, endpoints=[e for e in args.connection_endpoints.split(",") if e],
+                               repeats=args.connection_repeats, keepalive_timeout=args.keep_alive_timeout,
+                               idle=args.connection_idle).run()
+
+
+def start_find_capacity(args, server_pid, export, sampler):
+    return CapacityFinder(args.base_url, load_scenario_mix(args.scenario_file), start_rate=args.capacity_start,
+                          max_rate=args.capacity_max, step=args.capacity_step,
+                          step_duration=args.capacity_step_duration, search=args.capacity_search,
+                          resolution=args.capacity_resolution, slo_p95_ms=args.slo_p95_ms,
+                          slo_p99_ms=args.slo_p99_ms, slo_error_rate=args.slo_error_rate,
+                          pool_size=args.pool_size, seed=args.seed).run()
+
+
+def start_scenarios(args, server_pid, export, sampler):
+    if args.processes != 1:
+        return run_multiprocess(vars(args), args.processes or os.cpu_count() or 1)
+    return ScenarioRunner(args.base_url, load_scenario_mix(args.scenario_file), rate=args.rate,
+                          duration=args.duration, pool_size=args.pool_size,
+                          keepalive_timeout=args.keep_alive_timeout,
+                          force_close=args.no_keep_alive).run(export, sampler)
+
+
+def start_calendar_bench(args, server_pid, export, sampler):
+    return CalendarBenchmark(args.base_url, start_month=args.calendar_start, months=args.calendar_months,
+                             repeats=args.calendar_repeats, concurrency=args.concurrency).run()
+
+
+def start_pricing_matrix(args, server_pid, export, sampler):
+    return PricingMatrix(args.base_url, promo_codes=[c for c in args.promo_codes.split(",") if c],
+                         vouchers=[c for c in args.vouchers.split(",") if c],
+                         start_date=args.pricing_start_date, repeats=args.pricing_repeats,
+                         concurrency=args.concurrency, seed=args.seed,
+                         cookies=load_cookie_file(args.cookies) if args.cookies else None).run()
+
+
+def start_soak(args, server_pid, export, sampler):
+    return SoakTest(args.base_url, users=args.users, ws_clients=args.soak_ws_clients,
+                    duration=args.duration or 3600.0, window=args.soak_window, pool_size=args.pool_size,
+                    pid=server_pid, session_count_command=args.session_count_command).run()
+
+
+def start_chat_bench(args, server_pid, export, sampler):
+    return ChatBenchmark(args.base_url, conversations=args.chat_conversations, writers=args.chat_writers,
+                         readers=args.chat_readers, duration=args.duration or 30.0, skew=args.chat_skew,
+                         rate=args.chat_rate,
+                         sessions=(SessionPool(args.credentials, args.session_cache, args.session_max_age)
+                                   if args.credentials else None),
+                         pool_size=args.pool_size, seed=args.seed).run()
+
+
+def start_booking_race(args, server_pid, export, sampler):
+    return BookingRace(args.base_url, requests=args.race_requests, edits=args.race_edits,
+                       start_date=args.race_start_date, window_days=args.race_window_days, seed=args.seed,
+                       cookies=load_cookie_file(args.cookies) if args.cookies else None,
+                       processes=args.processes or os.cpu_count() or 1).run()
+
+
+def start_seed_data(args, server_pid, export, sampler):
+    return DataSeeder(args.base_url, seed=args.seed, bookings=args.seed_bookings,
+                      conversations=args.seed_conversations, messages=args.seed_messages,
+                      start_date=args.seed_start_date, concurrency=args.concurrency, state_file=args.seed_state,
+                      density=[float(d) for d in args.seed_density.split(",")] if args.seed_density else None).run()
+
+
+def start_pdf_bench(args, server_pid, export, sampler):
+    return PdfBenchmark(args.base_url, concurrency=args.concurrency, duration=args.duration or 30.0,
+                        pool=args.pdf_pool, codes_file=args.pdf_codes).run()
+
+
+def start_load(args, server_pid, export, sampler):
+    if args.processes != 1:
+        return run_multiprocess(dict(vars(args), duration=args.duration or 30.0),
+                                args.processes or os.cpu_count() or 1)
+    sessions = (SessionPool(args.credentials, args.session_cache, args.session_max_age)
+                if args.credentials else None)
+    return run_load_test(args.base_url, args.users, args.duration or 30.0, args.pool_size, args.ramp_up,
+                         sessions, export, sampler, args.keep_alive_timeout, args.no_keep_alive)
+
+
+# (flag, Ctrl-C notice, shared options honored, starter) in dispatch order; the first mode set wins.
+# A starter returns the mode's coroutine, or its result when it manages its own event loops.
+MODES = (
+    ("ws_storm", "WebSocket storm interrupted by user", (), start_ws_storm),
+    ("login_storm", "Login storm interrupted by user", (), start_login_storm),
+    ("open_loop", "Open-loop run interrupted by user", ("export",), start_open_loop),
+    ("upload_bench", "Upload benchmark interrupted by user", (), start_upload_bench),
+    ("webhook_storm", "Webhook storm interrupted by user", (), start_webhook_storm),
+    ("list_bench", "List benchmark interrupted by user", (), start_list_bench),
+    ("replay_log", "Log replay interrupted by user", ("export",), start_replay_log),
+    ("connection_bench", "Connection benchmark interrupted by user", (), start_connection_bench),
+    ("find_capacity", "Capacity search interrupted by user", (), start_find_capacity),
+    ("scenarios", "Scenario run interrupted by user", ("export", "sampler", "processes"), start_scenarios),
+    ("calendar_bench", "Calendar benchmark interrupted by user", (), start_calendar_bench),
+    ("pricing_matrix", "Pricing matrix interrupted by user", (), start_pricing_matrix),
+    ("soak", "Soak test interrupted by user", (), start_soak),
+    ("chat_bench", "Chat benchmark interrupted by user", (), start_chat_bench),
+    ("booking_race", "Booking race interrupted by user", ("processes",), start_booking_race),
+    ("seed_data", "Seeding interrupted, progress saved - rerun with the same seed to resume", (), start_seed_data),
+    ("pdf_bench", "PDF benchmark interrupted by user", (), start_pdf_bench),
+    ("load", "Load test interrupted by user", ("export", "sampler", "processes"), start_load),
+)
+
+# shared option -> (what it needs from the mode, whether it was given)
+SHARED_OPTIONS = {
+    "--records": ("export", lambda args: args.records),
+    "--summary": ("export", lambda args: args.summary),
+    "--baseline": ("export", lambda args: args.baseline),
+    "--sample-interval": ("sampler", lambda args: args.sample_interval),
+    "--processes": ("processes", lambda args: args.processes != 1),
+}
+
+
+def selected_mode(args) -> Optional[tuple]:
+    """The MODES entry chosen on the command line, None for the functional test run"""
+    return next((mode for mode in MODES if getattr(args, mode[0])), None)
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Backend API tests and load generation for the All'Arco server")
+    parser.add_argument("--base-url", default="http://localhost:3000", help="Server to test")
+    parser.add_argument("--load", action="store_true", help="Run the scenarios as concurrent virtual users")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users in load mode")
+    parser.add_argument("--duration", type=float, help="Run duration in seconds (default 30, or the scenario file's)")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which virtual users are started")
+    parser.add_argument("--pool-size", type=int, default=100, help="Maximum open connections per load process")
+    parser.add_argument("--keep-alive-timeout", type=float, default=15.0,
+                        help="Seconds an idle pooled connection is kept open by the load client")
+    parser.add_argument("--no-keep-alive", action="store_true",
+                        help="Open a new connection for every request (Connection: close)")
+    parser.add_argument("--connection-bench", action="store_true",
+                        help="Compare cold and pooled connections per endpoint, with TCP and TLS setup times")
+    parser.add_argument("--connection-endpoints", default="",
+                        help="Comma-separated GET endpoints for --connection-bench (default: health, pricing, dates, unread)")
+    parser.add_argument("--connection-repeats", type=int, default=50, help="Requests per endpoint and pass")
+    parser.add_argument("--connection-idle", type=float, default=0.0,
+                        help="Seconds to idle between pooled requests, to probe the server's keep-alive timeout")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Worker processes for --load/--scenarios, each with its own event loop (0 = one per core)")
+    parser.add_argument("--ws-storm", action="store_true",
+                        help="Run the /ws/chat fan-out stress test (admin->guest messages need a server "
+                             "running with NODE_ENV=development)")
+    parser.add_argument("--ws-clients", type=int, default=1000, help="WebSocket clients to hold open")
+    parser.add_argument("--ws-admin-ratio", type=float, default=0.05, help="Fraction of clients connecting as admins")
+    parser.add_argument("--ws-connect-rate", type=float, default=200.0, help="New WebSocket connections per second")
+    parser.add_argument("--ws-conversations", type=int, default=50, help="Guest conversations shared by the clients")
+    parser.add_argument("--ws-typing-rate", type=float, default=2.0, help="Typing events per second (each fans out to every client)")
+    parser.add_argument("--ws-message-rate", type=float, default=5.0, help="Chat messages per second sent through /chat/send")
+    parser.add_argument("--ws-ping-interval", type=float, default=10.0, help="Seconds between pings from each client")
+    parser.add_argument("--ws-storm-rates", default="", help="Comma-separated connection-storm rates to probe, e.g. 100,500,1000")
+    parser.add_argument("--pdf-bench", action="store_true", help="Benchmark concurrent confirmation PDF downloads")
+    parser.add_argument("--pdf-codes", help="File of `CODE,email` lines to download (default: create bookings)")
+    parser.add_argument("--pdf-pool", type=int, default=20, help="Bookings to create when no codes file is given")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients for the benchmark modes")
+    parser.add_argument("--scenarios", action="store_true", help="Replay the weighted scenario mix as an open-model load")
+    parser.add_argument("--scenario-file", help="JSON or YAML scenario mix (default: built-in guest/admin mix)")
+    parser.add_argument("--rate", type=float, help="Session arrivals per second (overrides the scenario file)")
+    parser.add_argument("--find-capacity", action="store_true",
+                        help="Ramp the scenario mix's arrival rate until a latency or error SLO breaks")
+    parser.add_argument("--capacity-search", choices=("step", "binary"), default="step",
+                        help="Raise the rate in fixed steps, or double it and bisect")
+    parser.add_argument("--capacity-start", type=float, default=1.0, help="First arrival rate (sessions/s) to try")
+    parser.add_argument("--capacity-max", type=float, default=200.0, help="Highest arrival rate to try")
+    parser.add_argument("--capacity-step", type=float, help="Rate increment of the step search (default --capacity-start)")
+    parser.add_argument("--capacity-step-duration", type=float, default=30.0, help="Seconds of load per rate")
+    parser.add_argument("--capacity-resolution", type=float, default=0.05,
+                        help="Binary search stops when the pass/fail bracket is this fraction of the rate")
+    parser.add_argument("--slo-p95-ms", type=float, default=500.0, help="p95 latency SLO per route")
+    parser.add_argument("--slo-p99-ms", type=float, default=1000.0, help="p99 latency SLO per route")
+    parser.add_argument("--slo-error-rate", type=float, default=0.01, help="Error-rate SLO (0.01 = 1%%)")
+    parser.add_argument("--replay-log", help="Replay the request lines of a server access log, e.g. server.log")
+    parser.add_argument("--replay-speed", type=float, default=1.0,
+                        help="Speed-up of the log's timeline (2 = twice as fast, 0 = back to back)")
+    parser.add_argument("--replay-writes", action="store_true",
+                        help="Also send POST/PUT/PATCH/DELETE lines (the log has no request bodies)")
+    parser.add_argument("--replay-bodies", help="JSON mapping 'METHOD /route/:id' to the body sent for replayed writes")
+    parser.add_argument("--replay-limit", type=int, help="Stop after this many replayed requests")
+    parser.add_argument("--list-bench", action="store_true",
+                        help="Stream-parse the unpaginated list endpoints and relate size and parse time to row count")
+    parser.add_argument("--list-endpoints", default="",
+                        help="Comma-separated list endpoints (default: bookings, reviews/all, messages, admin conversations)")
+    parser.add_argument("--list-repeats", type=int, default=5, help="Downloads per list endpoint")
+    parser.add_argument("--list-max-bytes", type=int, default=1_000_000, help="Payload size that calls for pagination")
+    parser.add_argument("--list-max-rows", type=int, default=1000, help="Row count that calls for pagination")
+    parser.add_argument("--webhook-storm", action="store_true",
+                        help="Fire signed Stripe webhook bursts and check acks, dedup and booking state")
+    parser.add_argument("--stripe-webhook-secret", default=os.environ.get("STRIPE_WEBHOOK_SECRET"),
+                        help="Test webhook signing secret the server verifies with (default $STRIPE_WEBHOOK_SECRET)")
+    parser.add_argument("--webhook-bookings", type=int, default=100, help="Online-payment bookings to pay for")
+    parser.add_argument("--webhook-rate", type=float, default=500.0, help="Maximum webhook deliveries per second")
+    parser.add_argument("--webhook-duplicates", type=int, default=3, help="Deliveries of each duplicated event")
+    parser.add_argument("--webhook-start-date", default="2033-01-01", help="First check-in date of the bookings")
+    parser.add_argument("--webhook-confirm-payment", action="store_true",
+                        help="Also call /confirm-payment as the client would, racing the webhook")
+    parser.add_argument("--upload-bench", action="store_true",
+                        help="Stream generated images to /hero-images/upload and time registration and reorder")
+    parser.add_argument("--upload-sizes", default="100,500,2000,8000",
+                        help="Comma-separated image sizes in kB, one upload batch per size")
+    parser.add_argument("--upload-count", type=int, default=10, help="Uploads per image size")
+    parser.add_argument("--upload-concurrency", type=int, default=4, help="Uploads in flight at a time")
+    parser.add_argument("--upload-chunk-kb", type=int, default=64, help="Size of each streamed body chunk")
+    parser.add_argument("--upload-keep", action="store_true", help="Keep the uploaded images instead of deleting them")
+    parser.add_argument("--open-loop", action="store_true",
+                        help="Time /booking-lookup/find and /chat/send on a fixed schedule, from each intended start")
+    parser.add_argument("--open-loop-rate", type=float, default=50.0, help="Scheduled requests per second")
+    parser.add_argument("--open-loop-duration", type=float, default=60.0, help="Length of the schedule in seconds")
+    parser.add_argument("--open-loop-mix", default="lookup:1,chat:1",
+                        help="Weights of the timed routes, e.g. lookup:3,chat:1")
+    parser.add_argument("--open-loop-poisson", action="store_true",
+                        help="Poisson arrivals instead of evenly spaced sends")
+    parser.add_argument("--open-loop-max-in-flight", type=int, default=1000,
+                        help="Requests in flight before further sends are held back")
+    parser.add_argument("--late-ms", type=float, default=5.0, help="Send lag above which a send counts as late")
+    parser.add_argument("--max-lag", type=float, default=5.0,
+                        help="Send lag in seconds above which a send is skipped and counted as missed")
+    parser.add_argument("--login-storm", action="store_true",
+                        help="Hammer login/logout at rising concurrency and measure calendar reads alongside")
+    parser.add_argument("--login-accounts", type=int, default=200, help="Guest accounts created for the storm")
+    parser.add_argument("--login-concurrency", default="1,5,10,25,50",
+                        help="Comma-separated concurrent login loops, one step each")
+    parser.add_argument("--login-step-duration", type=float, default=20.0, help="Seconds per concurrency step")
+    parser.add_argument("--login-admin-ratio", type=float, default=0.1,
+                        help="Share of flows using the --credentials admin accounts (with TOTP)")
+    parser.add_argument("--login-readers", type=int, default=5, help="Concurrent /bookings/calendar readers")
+    parser.add_argument("--calendar-bench", action="store_true",
+                        help="Sweep the calendar, blocked-dates and pricing reads and check their HTTP caching")
+    parser.add_argument("--calendar-start", default="2030-01", help="First month (YYYY-MM) of the calendar sweep")
+    parser.add_argument("--calendar-months", type=int, default=24, help="Months to sweep")
+    parser.add_argument("--calendar-repeats", type=int, default=20, help="Requests per month and per caching probe")
+    parser.add_argument("--pricing-matrix", action="store_true",
+                        help="Fire a stay/guest/pet/promo/voucher matrix at the pricing endpoints and check the totals")
+    parser.add_argument("--promo-codes", default="", help="Comma-separated promo codes to include in the matrix")
+    parser.add_argument("--vouchers", default="", help="Comma-separated voucher codes to include in the matrix")
+    parser.add_argument("--pricing-start-date", default="2031-03-02", help="First check-in date of the matrix")
+    parser.add_argument("--pricing-repeats", type=int, default=2, help="Times the whole matrix is priced")
+    parser.add_argument("--soak", action="store_true",
+                        help="Run a constant mixed workload for --duration (default 1h) and flag leaks")
+    parser.add_argument("--soak-window", type=float, default=60.0, help="Seconds per soak reporting window")
+    parser.add_argument("--soak-ws-clients", type=int, default=50, help="WebSocket subscribers held open during the soak")
+    parser.add_argument("--session-count-command",
+                        help="Shell command printing the session-store size, e.g. "
+                             "\"psql $DATABASE_URL -tAc 'select count(*) from sessions'\"")
+    parser.add_argument("--chat-bench", action="store_true", help="Run the chat throughput and read-after-write benchmark")
+    parser.add_argument("--chat-conversations", type=int, default=1000, help="Conversations the messages are spread over")
+    parser.add_argument("--chat-writers", type=int, default=50, help="Concurrent /chat/send loops")
+    parser.add_argument("--chat-readers", type=int, default=20, help="Concurrent polling readers")
+    parser.add_argument("--chat-skew", type=float, default=3.0,
+                        help="Power-law skew of the conversation choice; higher grows a few long histories")
+    parser.add_argument("--chat-rate", type=float, default=0.0,
+                        help="Fixed send rate in msg/s instead of --chat-writers closed loops")
+    parser.add_argument("--booking-race", action="store_true", help="Fire overlapping bookings at once and check for double-bookings")
+    parser.add_argument("--race-requests", type=int, default=200, help="Simultaneous POST /api/bookings requests")
+    parser.add_argument("--race-edits", type=int, default=20, help="Simultaneous PUT /api/bookings/:id/edit-dates requests")
+    parser.add_argument("--race-start-date", default="2032-06-01", help="First day of the contested date window")
+    parser.add_argument("--race-window-days", type=int, default=10, help="Length of the contested date window")
+    parser.add_argument("--cookies", help="Netscape cookie file with an admin session, e.g. admin_cookies.txt")
+    parser.add_argument("--credentials", help="JSON list of admin/team accounts; --load then runs logged-in admin users")
+    parser.add_argument("--session-cache", default="session_cache.json", help="Where the session pool caches cookies")
+    parser.add_argument("--session-max-age", type=float, default=3600.0,
+                        help="Log a pooled session in again after this many seconds")
+    parser.add_argument("--seed-data", action="store_true", help="Bulk-create bookings, conversations and messages")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the generated data; same seed, same data")
+    parser.add_argument("--seed-bookings", type=int, default=10000, help="Non-overlapping bookings to create")
+    parser.add_argument("--seed-conversations", type=int, default=1000, help="Chat conversations to create")
+    parser.add_argument("--seed-messages", type=int, default=50, help="Messages per seeded conversation")
+    parser.add_argument("--seed-start-date", default="2030-01-01", help="First check-in date of the seeded bookings")
+    parser.add_argument("--seed-density", help="Comma-separated target occupancy per month, cycled, e.g. 0.1,0.4,0.9")
+    parser.add_argument("--seed-state", help="Checkpoint file for resuming (default: seed_state_<seed>.json)")
+    parser.add_argument("--records", help="Stream one row per request to this file (.csv, .ndjson, optionally .gz, "
+                                          "or .parquet with pyarrow)")
+    parser.add_argument("--summary", help="Write a JSON run summary (throughput, p50-p99 per route) to this file")
+    parser.add_argument("--baseline", help="Summary JSON of a previous run; fail on p95/throughput regressions")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="Allowed relative regression against --baseline (0.1 = 10%%)")
+    parser.add_argument("--server-pid", type=int, help="PID of a locally running server to sample memory from")
+    parser.add_argument("--launch-server", help="Command that starts the server under test, e.g. 'npm run dev'; "
+                                                "it is stopped when the run ends")
+    parser.add_argument("--sample-interval", type=float, default=0.0,
+                        help="Sample server resources and windowed latency every N seconds during --load/--scenarios")
+    parser.add_argument("--resource-log", help="Write the resource samples to this CSV file")
+    args = parser.parse_args(argv)
+    if args.calendar_repeats < 1:
+        parser.error("--calendar-repeats must be at least 1")
+    mode = selected_mode(args)
+    flag, honors = (f"--{mode[0].replace('_', '-')}", mode[2]) if mode else ("the functional tests", ("export",))
+    for option, (needs, given) in SHARED_OPTIONS.items():
+        if given(args) and needs not in honors:
+            parser.error(f"{option} is not supported by {flag}")
+    if args.sample_interval and args.processes != 1:
+        parser.error("--sample-interval needs a single load process (--processes 1)")
+    return args
+
+def main():
+    """Main function to run tests"""
+    args = parse_args()
+    export = ResultsExport(args.records, args.summary, args.baseline, args.tolerance)
+    
+    server_pid = args.server_pid
+    if args.launch_server:
+        try:
+            server = launch_server(args.launch_server, args.base_url)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        atexit.register(stop_server, server)
+        server_pid = server.pid
+    sampler = None
+    if args.sample_interval:
+        sampler = ResourceSampler(args.base_url, interval=args.sample_interval, pid=server_pid,
+                                  cookies=load_cookie_file(args.cookies) if args.cookies else None,
+                                  log_path=args.resource_log)
+    
+    mode = selected_mode(args)
+    if mode and aiohttp is None:
+        print("❌ Load modes require aiohttp (pip install aiohttp)")
+        sys.exit(1)
+    
+    if mode:
+        _, notice, _, start = mode
+        try:
+            outcome = start(args, server_pid, export, sampler)
+            success = asyncio.run(outcome) if asyncio.iscoroutine(outcome) else outcome
+            sys.exit(0 if success else 1)
+        except KeyboardInterrupt:
+            print(f"\n\n⚠️ {notice}")
+            sys.exit(1)
+    
+    tester = BackendTester(args.base_url, keep_alive=not args.no_keep_alive)
     
     print("Backend API Testing Script")
-    print("Testing server at: http://localhost:3000")
+    print(f"Testing server at: {args.base_url}")
     print("Make sure the server is running before starting tests.\n")
     
     try:
+        export.attach(tester.metrics)
+        started = time.perf_counter()
         success = tester.run_all_tests()
+        success = export.finish(tester.metrics, time.perf_counter() - started) and success
         sys.exit(0 if success else 1)
     except KeyboardInterrupt:
         print("\n\n⚠️ Tests interrupted by user")
@@ -0,0 +1,921 @@
+#!/usr/bin/env python3
+"""
+Mock API server for the backend test harness.
+
+Implements the /api/chat/*, /api/booking-lookup/*, /api/bookings*, /api/pricing,
+/api/promo-codes/validate, /api/vouchers/validate, /api/webhooks/stripe, /api/hero-images*,
+/api/property-images, /api/auth/*, /api/admin/auth/* and /ws/chat contracts of the Node
+server on top of an in-memory store, with optional injected latency and error rates,
+so backend_test.py can be run and benchmarked without the Node/Postgres stack:
+
+    python3 mock_server.py --port 3000 --latency-ms 5 --jitter-ms 2 --error-rate 0.01
+    python3 backend_test.py --load --users 200
+"""
+
+import argparse
+import asyncio
+import base64
+import concurrent.futures
+import datetime
+import hashlib
+import hmac
+import struct
+import json
+import random
+import string
+import sys
+import time
+from typing import Dict, List, Optional
+
+try:
+    from aiohttp import web, WSMsgType
+except ImportError:
+    print("❌ mock_server.py requires aiohttp (pip install aiohttp)")
+    sys.exit(1)
+
+NIGHTLY_RATE = 110.0
+CLEANING_FEE = 25.0
+SERVICE_FEE = 15.0
+PET_FEE = 35.0
+CITY_TAX_PER_GUEST_NIGHT = 4.0
+MAX_NIGHTS = 15
+STRIPE_TOLERANCE = 300
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+ADMIN_ACCOUNT = {"email": "admin@loadtest.local", "password": "AdminLoad2024", "totpSecret": "JBSWY3DPEHPK3PXP"}
+BLOCKING_STATUSES = ("confirmed", "checked_in")
+PROMO_CODES = {
+    "SUMMER15": {"discountType": "percentage", "discountValue": 15, "minOrderAmount": None, "maxDiscountAmount": None},
+    "FLAT40": {"discountType": "fixed", "discountValue": 40, "minOrderAmount": None, "maxDiscountAmount": None},
+    "BIG30": {"discountType": "percentage", "discountValue": 30, "minOrderAmount": None, "maxDiscountAmount": "50.00"},
+    "LONG10": {"discountType": "percentage", "discountValue": 10, "minOrderAmount": "600.00", "maxDiscountAmount": None},
+}
+VOUCHERS = {
+    "WELCOME20": {"discountType": "percentage", "discountValue": 20, "minBookingAmount": 0, "maxDiscountAmount": 60},
+    "GIFT25": {"discountType": "fixed", "discountValue": 25, "minBookingAmount": 0, "maxDiscountAmount": None},
+}
+
+
+def now_iso() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def weak_etag(body: bytes) -> str:
+    """Weak ETag in the format Express's res.json sends (the etag package)"""
+    digest = base64.b64encode(hashlib.sha1(body).digest()).decode()[:27]
+    return f'W/"{len(body):x}-{digest}"'
+
+
+def totp_codes(secret: str, window: int = 1, step: int = 30) -> List[str]:
+    """RFC 6238 codes for the current time step +/- `window`, like speakeasy's verify"""
+    key = base64.b32decode(secret + "=" * (-len(secret) % 8))
+    codes = []
+    for offset in range(-window, window + 1):
+        digest = hmac.new(key, struct.pack(">Q", int(time.time() // step) + offset), hashlib.sha1).digest()
+        value = struct.unpack(">I", digest[digest[-1] & 0x0F:(digest[-1] & 0x0F) + 4])[0] & 0x7FFFFFFF
+        codes.append(str(value % 10 ** 6).zfill(6))
+    return codes
+
+
+def json_error(status: int, message: str, **extra) -> web.Response:
+    return web.json_response({"message": message, **extra}, status=status)
+
+
+class MockStore:
+    """In-memory bookings, conversations, messages and images, shaped like the Drizzle rows the server returns"""
+    def __init__(self):
+        self.bookings: Dict[int, Dict] = {}
+        self.bookings_by_code: Dict[str, Dict] = {}
+        self.conversations: Dict[int, Dict] = {}
+        self.messages: Dict[int, List[Dict]] = {}
+        self.hero_images: Dict[int, Dict] = {}
+        self.property_images: Dict[int, Dict] = {}
+        self.users: Dict[str, Dict] = {}
+        self.sessions: Dict[str, Dict] = {}
+        self.next_booking_id = 1
+        self.next_conversation_id = 1
+        self.next_message_id = 1
+        self.next_image_id = 1
+
+    def confirmation_code(self) -> str:
+        while True:
+            code = "ARCO" + "".join(random.choices(string.ascii_uppercase + string.digits, k=6))
+            if code not in self.bookings_by_code:
+                return code
+
+    def is_available(self, check_in: str, check_out: str, exclude_id: int = None) -> bool:
+        return not any(
+            b["status"] in BLOCKING_STATUSES and b["id"] != exclude_id
+            and b["checkInDate"] < check_out and b["checkOutDate"] > check_in
+            for b in self.bookings.values()
+        )
+
+    @staticmethod
+    def code_discount(rule: Dict, amount: float) -> float:
+        """Discount a promo code or voucher rule gives on `amount`"""
+        if rule["discountType"] == "fixed":
+            return float(rule["discountValue"])
+        discount = amount * rule["discountValue"] / 100
+        return min(discount, float(rule["maxDiscountAmount"])) if rule["maxDiscountAmount"] else discount
+
+    def pricing(self, check_in: str, check_out: str, guests: int, has_pet: bool, promo_code: str = None,
+                voucher_code: str = None) -> Dict:
+        nights = (datetime.date.fromisoformat(check_out[:10]) - datetime.date.fromisoformat(check_in[:10])).days
+        before_discount = NIGHTLY_RATE * nights
+        discount_percent = 10 if nights >= 7 else 5 if nights >= 3 else 0
+        discount = round(before_discount * discount_percent / 100, 2)
+        pet_fee = PET_FEE if has_pet else 0.0
+        city_tax = CITY_TAX_PER_GUEST_NIGHT * guests * min(nights, 5)
+        promo_code, voucher_code = (promo_code or "").upper(), (voucher_code or "").upper()
+        promo = PROMO_CODES.get(promo_code)
+        if promo and promo["minOrderAmount"] and before_discount < float(promo["minOrderAmount"]):
+            promo = None
+        promo_discount = self.code_discount(promo, before_discount) if promo else 0.0
+        voucher = VOUCHERS.get(voucher_code)
+        voucher_discount = self.code_discount(voucher, before_discount) if voucher else 0.0
+        total = (before_discount - discount - promo_discount - voucher_discount + CLEANING_FEE + SERVICE_FEE + pet_fee
+                 + city_tax)
+        all_discounts = discount + promo_discount + voucher_discount
+        return {
+            "basePrice": NIGHTLY_RATE,
+            "totalNights": nights,
+            "priceBeforeDiscount": before_discount,
+            "lengthOfStayDiscount": discount,
+            "lengthOfStayDiscountPercent": discount_percent,
+            "priceAfterDiscount": before_discount - discount,
+            "cleaningFee": CLEANING_FEE,
+            "serviceFee": SERVICE_FEE,
+            "petFee": pet_fee,
+            "cityTax": city_tax,
+            "referralCredit": 0,
+            "promoCodeDiscount": promo_discount,
+            "promoCodeDiscountPercent": promo["discountValue"] if promo and promo["discountType"] == "percentage" else 0,
+            "appliedPromoCode": promo_code if promo else None,
+            "voucherDiscount": voucher_discount,
+            "appliedVoucher": voucher_code if voucher else None,
+            "totalPrice": round(max(total, 0), 2),
+            "promotionDiscount": 0,
+            "promotionDiscountPercent": 0,
+            "activePromotion": None,
+            "totalDiscountAmount": all_discounts,
+            "originalPrice": round(max(total, 0) + all_discounts, 2)
+        }
+
+    def create_booking(self, data: Dict) -> Dict:
+        pricing = self.pricing(data["checkInDate"], data["checkOutDate"], int(data["guests"]), bool(data.get("hasPet")))
+        payment_method = data.get("paymentMethod", "online")
+        booking = {
+            "id": self.next_booking_id,
+            "confirmationCode": self.confirmation_code(),
+            "guestFirstName": data["guestFirstName"],
+            "guestLastName": data["guestLastName"],
+            "guestEmail": data["guestEmail"],
+            "guestCountry": data["guestCountry"],
+            "guestPhone": data["guestPhone"],
+            "checkInDate": data["checkInDate"][:10],
+            "checkOutDate": data["checkOutDate"][:10],
+            "checkInTime": "15:00",
+            "checkOutTime": "10:00",
+            "guests": int(data["guests"]),
+            "hasPet": bool(data.get("hasPet")),
+            "paymentMethod": payment_method,
+            "paymentStatus": "pending",
+            "status": "confirmed" if payment_method == "property" else "pending",
+            "bookingSource": data.get("bookingSource", "direct"),
+            "createdBy": data.get("createdBy", "guest"),
+            "createdAt": now_iso(),
+            "updatedAt": now_iso(),
+            **{key: value for key, value in pricing.items() if key not in ("priceBeforeDiscount", "priceAfterDiscount")}
+        }
+        self.next_booking_id += 1
+        self.bookings[booking["id"]] = booking
+        self.bookings_by_code[booking["confirmationCode"]] = booking
+        return booking
+
+    def start_conversation(self, data: Dict) -> tuple:
+        conversation = {
+            "id": self.next_conversation_id,
+            "userId": None,
+            "guestName": data.get("guestName"),
+            "guestEmail": data.get("guestEmail"),
+            "subject": data.get("subject") or "New Chat",
+            "status": "active",
+            "priority": "medium",
+            "assignedTo": None,
+            "isArchived": False,
+            "lastMessageAt": now_iso(),
+            "createdAt": now_iso()
+        }
+        self.next_conversation_id += 1
+        self.conversations[conversation["id"]] = conversation
+        self.messages[conversation["id"]] = []
+        first = self.add_message(conversation["id"], {
+            "senderName": data.get("guestName") or "Guest",
+            "senderEmail": data.get("guestEmail") or "guest@example.com",
+            "content": data["message"],
+            "isFromAdmin": False
+        })
+        return conversation, first
+
+    def add_message(self, conversation_id: int, data: Dict) -> Dict:
+        message = {
+            "id": self.next_message_id,
+            "conversationId": conversation_id,
+            "senderId": data.get("senderId"),
+            "senderName": data["senderName"],
+            "senderEmail": data["senderEmail"],
+            "content": data["content"],
+            "messageType": data.get("messageType", "text"),
+            "isFromAdmin": data["isFromAdmin"],
+            "isRead": False,
+            "createdAt": now_iso()
+        }
+        self.next_message_id += 1
+        self.messages[conversation_id].append(message)
+        self.conversations[conversation_id]["lastMessageAt"] = message["createdAt"]
+        return message
+
+
+class ConnectionHub:
+    """The WebSocketManager fan-out rules: admins, per-user notifications and typing broadcasts"""
+    def __init__(self):
+        self.connections: Dict[str, Dict] = {}
+
+    def add(self, ws: web.WebSocketResponse, user_id: Optional[str], is_admin: bool) -> str:
+        connection_id = "".join(random.choices(string.ascii_lowercase + string.digits, k=13)) + format(
+            int(time.time() * 1000), "x")
+        self.connections[connection_id] = {"ws": ws, "userId": user_id, "isAdmin": is_admin}
+        return connection_id
+
+    def remove(self, connection_id: str):
+        self.connections.pop(connection_id, None)
+
+    def send(self, connection: Dict, payload: Dict):
+        if not connection["ws"].closed:
+            asyncio.ensure_future(self.deliver(connection["ws"], json.dumps(payload)))
+
+    async def deliver(self, ws: web.WebSocketResponse, text: str):
+        try:
+            await ws.send_str(text)
+        except (ConnectionError, RuntimeError):
+            pass  # the client went away between the check and the write, as ws.send() is a no-op there
+
+    def notify_user(self, user_id: str, kind: str, data: Dict):
+        delivered = False
+        for connection in list(self.connections.values()):
+            if connection["userId"] == user_id:
+                self.send(connection, {"type": kind, "data": data, "timestamp": now_iso()})
+                delivered = True
+        if delivered and kind == "new_message" and data.get("message", {}).get("id"):
+            asyncio.get_running_loop().call_later(0.1, self.status_update, data["message"]["id"], "delivered")
+
+    def notify_admins(self, kind: str, data: Dict):
+        for connection in list(self.connections.values()):
+            if connection["isAdmin"]:
+                self.send(connection, {"type": kind, "data": data, "timestamp": now_iso()})
+
+    def broadcast(self, kind: str, data: Dict):
+        for connection in list(self.connections.values()):
+            self.send(connection, {"type": kind, "data": data, "timestamp": now_iso()})
+
+    def status_update(self, message_id: int, status: str):
+        for connection in list(self.connections.values()):
+            self.send(connection, {"type": "message_status", "messageId": message_id, "status": status,
+                                   "timestamp": now_iso()})
+
+    def typing(self, sender_id: str, data: Dict):
+        sender = self.connections[sender_id]
+        for connection_id, connection in list(self.connections.items()):
+            if connection_id != sender_id:
+                self.send(connection, {"type": "typing", "userId": sender["userId"], "isAdmin": sender["isAdmin"],
+                                       "isTyping": data.get("isTyping"), "conversationId": data.get("conversationId"),
+                                       "timestamp": now_iso()})
+
+    def stats(self) -> Dict:
+        admins = sum(1 for connection in self.connections.values() if connection["isAdmin"])
+        return {"totalConnections": len(self.connections), "adminConnections": admins,
+                "userConnections": len(self.connections) - admins}
+
+
+class MockServer:
+    """aiohttp application serving the mocked routes with injected latency and failures"""
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 pdf_kb: int = 40, stripe_webhook_secret: str = "whsec_loadtest", stall_every: float = 0.0,
+                 stall_ms: float = 0.0, hash_iterations: int = 100_000, seed: int = None):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.stall_every = stall_every
+        self.stall = stall_ms / 1000
+        self.started = time.monotonic()
+        self.error_rate = error_rate
+        self.pdf_kb = pdf_kb
+        self.stripe_webhook_secret = stripe_webhook_secret
+        self.hash_iterations = hash_iterations
+        self.hash_pool = concurrent.futures.ThreadPoolExecutor(4)  # libuv's default threadpool runs bcrypt
+        self.rng = random.Random(seed)
+        self.store = MockStore()
+        self.hub = ConnectionHub()
+        self.requests = 0
+        self.injected_errors = 0
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self.inject_faults, self.conditional_get], client_max_size=16 * 1024 * 1024)
+        app.router.add_post("/api/chat/start", self.chat_start)
+        app.router.add_post("/api/chat/send", self.chat_send)
+        app.router.add_get(r"/api/chat/conversation/{id:\d+}", self.chat_conversation)
+        app.router.add_post("/api/chat/guest-conversation", self.chat_guest_conversation)
+        app.router.add_get("/api/chat/unread-count", self.chat_unread_count)
+        app.router.add_get("/api/chat/admin/conversations", self.chat_admin_conversations)
+        app.router.add_patch(r"/api/chat/admin/conversation/{id:\d+}/status", self.chat_admin_status)
+        app.router.add_patch(r"/api/chat/admin/conversation/{id:\d+}/archive", self.chat_admin_archive)
+        app.router.add_delete(r"/api/chat/admin/conversation/{id:\d+}", self.chat_admin_delete)
+        app.router.add_post("/api/booking-lookup/find", self.lookup_find)
+        app.router.add_post("/api/booking-lookup/download-confirmation", self.lookup_download)
+        app.router.add_get("/api/bookings", self.bookings_list)
+        app.router.add_post("/api/bookings", self.bookings_create)
+        app.router.add_post("/api/bookings/calculate-pricing", self.bookings_pricing)
+        app.router.add_get("/api/bookings/dates", self.bookings_dates)
+        app.router.add_get(r"/api/bookings/calendar/{year:\d+}/{month:\d+}", self.bookings_calendar)
+        app.router.add_get("/api/bookings/confirmation/{code}", self.bookings_by_code)
+        app.router.add_get(r"/api/bookings/{id:\d+}", self.bookings_get)
+        app.router.add_put(r"/api/bookings/{id:\d+}/edit-dates", self.bookings_edit_dates)
+        app.router.add_get("/api/pricing", self.pricing_settings)
+        app.router.add_post("/api/promo-codes/validate", self.promo_validate)
+        app.router.add_post("/api/vouchers/validate", self.voucher_validate)
+        app.router.add_post("/api/webhooks/stripe", self.stripe_webhook)
+        app.router.add_get("/api/hero-images", self.hero_images_list)
+        app.router.add_post("/api/hero-images/upload", self.hero_images_upload)
+        app.router.add_put("/api/hero-images/reorder", self.hero_images_reorder)
+        app.router.add_delete(r"/api/hero-images/{id:\d+}", self.hero_images_delete)
+        app.router.add_get("/api/property-images", self.property_images_list)
+        app.router.add_post("/api/property-images", self.property_images_create)
+        app.router.add_delete(r"/api/property-images/{id:\d+}", self.property_images_delete)
+        app.router.add_post("/api/auth/signup", self.auth_signup)
+        app.router.add_post("/api/auth/login", self.auth_login)
+        app.router.add_post("/api/auth/logout", self.auth_logout)
+        app.router.add_post("/api/admin/auth/login", self.admin_login)
+        app.router.add_post("/api/admin/auth/verify-totp", self.admin_verify_totp)
+        app.router.add_get("/mock/sessions", self.session_count)
+        app.router.add_get("/api/health", self.health)
+        app.router.add_get("/api/ws/health", self.ws_health)
+        app.router.add_get("/ws/chat", self.ws_chat)
+        return app
+
+    @web.middleware
+    async def inject_faults(self, request: web.Request, handler):
+        if not request.path.startswith("/api/") or request.path in ("/api/health", "/api/ws/health"):
+            return await handler(request)
+        self.requests += 1
+        if self.stall_every:
+            phase = (time.monotonic() - self.started) % self.stall_every
+            if phase < self.stall:
+                await asyncio.sleep(self.stall - phase)
+        delay = self.latency + (self.rng.uniform(-self.jitter, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.injected_errors += 1
+            return json_error(500, "Injected failure")
+        return await handler(request)
+
+    @web.middleware
+    async def conditional_get(self, request: web.Request, handler):
+        """Tag GET JSON responses and answer a matching If-None-Match with 304, like Express's fresh check"""
+        response = await handler(request)
+        if request.method != "GET" or response.status != 200 or not isinstance(response, web.Response) \
+                or response.body is None:
+            return response
+        etag = weak_etag(response.body)
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return response
+
+    async def read_json(self, request: web.Request) -> Dict:
+        try:
+            data = await request.json()
+        except (ValueError, UnicodeDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    # Chat
+
+    async def chat_start(self, request: web.Request) -> web.Response:
+        data = await self.read_json(request)
+        if not data.get("message"):
+            return web.json_response({"success": False, "message": [{"path": ["message"], "message": "Required"}]},
+                                     status=400)
+        conversation, first = self.store.start_conversation(data)
+        self.hub.notify_admins("new_conversation", {"conversation": conversation, "message": first})
+        return web.json_response({"success": True, "conversationId": conversation["id"],
+                                  "conversation": conversation, "message": first})
+
+    async def chat_send(self, request: web.Request) -> web.Response:
+        data = await self.read_json(request)
+        conversation = self.store.conversations.get(data.get("conversationId"))
+        if not data.get("content") or conversation is None:
+            return web.json_response({"success": False, "message": "Failed to send message"}, status=400)
+
+        # Mirrors development mode: a message without sender details comes from the admin dashboard
+        from_admin = not (data.get("senderName") and data.get("senderEmail"))
+        message = self.store.add_message(conversation["id"], {
+            "senderName": "Admin" if from_admin else data["senderName"],
+            "senderEmail": "admin@allarco.com" if from_admin else data["senderEmail"],
+            "content": data["content"],
+            "messageType": data.get("messageType", "text"),
+            "isFromAdmin": from_admin
+        })
+        notification = {"conversationId": conversation["id"], "message": message, "conversation": conversation}
+        if from_admin and conversation["guestEmail"]:
+            self.hub.notify_user(f"guest_{conversation['guestEmail']}", "new_message", notification)
+        elif not from_admin:
+            self.hub.notify_admins("new_message", notification)
+        return web.json_response({"success": True, "message": message})
+
+    async def chat_conversation(self, request: web.Request) -> web.Response:
+        conversation = self.store.conversations.get(int(request.match_info["id"]))
+        if conversation is None:
+            return json_error(404, "Conversation not found")
+        messages = self.store.messages[conversation["id"]]
+        unread = [message for message in messages if message["isFromAdmin"] and not message["isRead"]]
+        for message in unread:
+            message["isRead"] = True
+            asyncio.get_running_loop().call_later(0.2, self.hub.broadcast, "message_status",
+                                                  {"messageId": message["id"], "status": "read"})
+        return web.json_response({"success": True, "conversation": conversation, "messages": messages,
+                                  "participants": []})
+
+    async def chat_guest_conversation(self, request: web.Request) -> web.Response:
+        email = (await self.read_json(request)).get("email")
+        if not email:
+            return json_error(400, "Email is required")
+        for conversation in reversed(list(self.store.conversations.values())):
+            if conversation["guestEmail"] == email:
+                return web.json_response({"success": True, "conversation": conversation,
+                                          "messages": self.store.messages[conversation["id"]], "participants": []})
+        return json_error(404, "No conversation found")
+
+    async def chat_unread_count(self, request: web.Request) -> web.Response:
+        count = sum(1 for messages in self.store.messages.values() for message in messages
+                    if not message["isFromAdmin"] and not message["isRead"])
+        return web.json_response({"success": True, "count": count})
+
+    async def chat_admin_conversations(self, request: web.Request) -> web.Response:
+        query = request.query
+        limit, offset = int(query.get("limit", 50)), int(query.get("offset", 0))
+        matches = [c for c in self.store.conversations.values()
+                   if (not query.get("status") or c["status"] == query["status"])
+                   and (not query.get("priority") or c["priority"] == query["priority"])
+                   and (not query.get("search") or query["search"].lower() in
+                        f"{c['guestName']} {c['guestEmail']} {c['subject']}".lower())]
+        matches.sort(key=lambda c: c["lastMessageAt"], reverse=True)
+        page = []
+        for conversation in matches[offset:offset + limit]:
+            messages = self.store.messages[conversation["id"]]
+            page.append({**conversation, "messageCount": len(messages),
+                         "unreadCount": sum(1 for m in messages if not m["isFromAdmin"] and not m["isRead"]),
+                         "lastMessage": messages[-1] if messages else None})
+        return web.json_response({"success": True, "conversations": page, "total": len(matches)})
+
+    async def chat_admin_status(self, request: web.Request) -> web.Response:
+        conversation_id = int(request.match_info["id"])
+        data = await self.read_json(request)
+        conversation = self.store.conversations.get(conversation_id)
+        if conversation is not None:
+            conversation["status"] = data.get("status", conversation["status"])
+            conversation["assignedTo"] = data.get("assignedTo", conversation["assignedTo"])
+        if data.get("status") == "closed":
+            self.hub.broadcast("conversation_ended", {"conversationId": conversation_id, "status": "closed"})
+        return web.json_response({"success": True, "message": "Conversation status updated"})
+
+    async def chat_admin_archive(self, request: web.Request) -> web.Response:
+        conversation = self.store.conversations.get(int(request.match_info["id"]))
+        if conversation is not None:
+            conversation["isArchived"] = True
+            conversation["status"] = "archived"
+        return web.json_response({"success": True, "message": "Conversation archived"})
+
+    async def chat_admin_delete(self, request: web.Request) -> web.Response:
+        conversation_id = int(request.match_info["id"])
+        self.store.conversations.pop(conversation_id, None)
+        self.store.messages.pop(conversation_id, None)
+        return web.json_response({"success": True, "message": "Conversation deleted"})
+
+    # Booking lookup
+
+    def find_reservation(self, data: Dict) -> tuple:
+        """Return (booking, error response) for a {confirmationCode, email} lookup"""
+        if not data.get("confirmationCode") or not data.get("email"):
+            return None, web.json_response({"success": False, "message": "Invalid input data", "errors": []},
+                                           status=400)
+        booking = self.store.bookings_by_code.get(data["confirmationCode"])
+        if booking is None:
+            return None, web.json_response({"success": False, "message": "Reservation not found. Please check your "
+                                            "confirmation code and try again."}, status=404)
+        if booking["guestEmail"].lower() != data["email"].lower():
+            return None, web.json_response({"success": False, "message": "Email address doesn't match our records. "
+                                            "Please check and try again."}, status=404)
+        return booking, None
+
+    async def lookup_find(self, request: web.Request) -> web.Response:
+        booking, error = self.find_reservation(await self.read_json(request))
+        if error is not None:
+            return error
+        details = {key: value for key, value in booking.items() if key not in ("id", "bookingSource", "createdBy")}
+        return web.json_response({"success": True, "booking": details, "message": "Reservation found successfully"})
+
+    async def lookup_download(self, request: web.Request) -> web.StreamResponse:
+        booking, error = self.find_reservation(await self.read_json(request))
+        if error is not None:
+            return error
+        response = web.StreamResponse(headers={
+            "Content-Type": "application/pdf",
+            "Content-Disposition": f'attachment; filename="AllArco-Confirmation-{booking["confirmationCode"]}.pdf"'
+        })
+        await response.prepare(request)
+        await response.write(b"%PDF-1.3\n")
+        chunk = (f"% {booking['confirmationCode']} {booking['checkInDate']} {booking['checkOutDate']}\n" * 64).encode()
+        for _ in range(max(1, self.pdf_kb * 1024 // len(chunk))):
+            await response.write(chunk)
+        await response.write(b"%%EOF\n")
+        await response.write_eof()
+        return response
+
+    # Bookings
+
+    async def bookings_create(self, request: web.Request) -> web.Response:
+        data = await self.read_json(request)
+        required = ("guestFirstName", "guestLastName", "guestEmail", "guestCountry", "guestPhone",
+                    "checkInDate", "checkOutDate", "guests")
+        if not all(data.get(field) for field in required):
+            return json_error(400, "Missing required booking information")
+        if not self.store.is_available(data["checkInDate"][:10], data["checkOutDate"][:10]):
+            return json_error(400, "Selected dates are not available")
+        nights = (datetime.date.fromisoformat(data["checkOutDate"][:10]) -
+                  datetime.date.fromisoformat(data["checkInDate"][:10])).days
+        if nights > MAX_NIGHTS:
+            return json_error(400, "Maximum booking length is 15 days")
+        if nights < 1:
+            return json_error(400, "Invalid booking dates")
+        if not 1 <= int(data["guests"]) <= 5:
+            return json_error(400, "Guest count must be between 1 and 5")
+        booking = self.store.create_booking(data)
+        self.hub.notify_admins("new_booking", booking)
+        return web.json_response(booking, status=201)
+
+    async def bookings_pricing(self, request: web.Request) -> web.Response:
+        data = await self.read_json(request)
+        if not data.get("checkInDate") or not data.get("checkOutDate") or not data.get("guests"):
+            return json_error(400, "Missing required fields")
+        return web.json_response(self.store.pricing(data["checkInDate"], data["checkOutDate"], int(data["guests"]),
+                                                    bool(data.get("hasPet")), data.get("promoCode"),
+                                                    data.get("voucherCode")))
+
+    async def promo_validate(self, request: web.Request) -> web.Response:
+        data = await self.read_json(request)
+        if not data.get("code"):
+            return web.json_response({"valid": False, "message": "Promo code is required"}, status=400)
+        code = data["code"].upper()
+        promo = PROMO_CODES.get(code)
+        if promo is None:
+            return web.json_response({"valid": False, "message": "Invalid promo code"})
+        return web.json_response({"valid": True, "promoCode": {"code": code, "description": None, **promo},
+                                  "message": "discount applied"})
+
+    async def voucher_validate(self, request: web.Request) -> web.Response:
+        """Voucher discount on the nightly subtotal of the stay, matching what calculate-pricing applies"""
+        data = await self.read_json(request)
+        if not data.get("code") or not isinstance(data.get("bookingAmount"), (int, float)) \
+                or not data.get("checkInDate") or not data.get("checkOutDate"):
+            return json_error(400, "Invalid request format")
+        voucher = VOUCHERS.get(data["code"].upper())
+        if voucher is None:
+            return json_error(404, "Voucher not found")
+        if data["bookingAmount"] < voucher["minBookingAmount"]:
+            return json_error(400, f"Minimum booking amount of €{voucher['minBookingAmount']} required")
+        nights = (datetime.date.fromisoformat(data["checkOutDate"][:10]) -
+                  datetime.date.fromisoformat(data["checkInDate"][:10])).days
+        discount = self.store.code_discount(voucher, NIGHTLY_RATE * nights)
+        return web.json_response({"valid": True, "voucher": {"code": data["code"].upper(), **voucher},
+                                  "discountAmount": discount, "finalAmount": data["bookingAmount"] - discount})
+
+    async def bookings_list(self, request: web.Request) -> web.Response:
+        status = request.query.get("status")
+        return web.json_response([b for b in self.store.bookings.values() if not status or b["status"] == status])
+
+    async def bookings_dates(self, request: web.Request) -> web.Response:
+        dates = set()
+        for booking in self.store.bookings.values():
+            if booking["status"] != "confirmed":
+                continue
+            day = datetime.date.fromisoformat(booking["checkInDate"])
+            end = datetime.date.fromisoformat(booking["checkOutDate"])
+            while day < end:
+                dates.add(day.isoformat())
+                day += datetime.timedelta(days=1)
+        return web.json_response(sorted(dates))
+
+    async def bookings_calendar(self, request: web.Request) -> web.Response:
+        year, month = int(request.match_info["year"]), int(request.match_info["month"])
+        start = datetime.date(year, month, 1).isoformat()
+        end = (datetime.date(year + month // 12, month % 12 + 1, 1)).isoformat()
+        return web.json_response([b for b in self.store.bookings.values()
+                                  if b["status"] != "cancelled" and b["checkInDate"] < end and b["checkOutDate"] > start])
+
+    async def pricing_settings(self, request: web.Request) -> web.Response:
+        return web.json_response({"basePrice": NIGHTLY_RATE, "cleaningFee": CLEANING_FEE, "petFee": PET_FEE,
+                                  "discountWeekly": 10, "discountMonthly": 10})
+
+    async def bookings_by_code(self, request: web.Request) -> web.Response:
+        booking = self.store.bookings_by_code.get(request.match_info["code"])
+        return web.json_response(booking) if booking else json_error(404, "Booking not found")
+
+    async def bookings_get(self, request: web.Request) -> web.Response:
+        booking = self.store.bookings.get(int(request.match_info["id"]))
+        return web.json_response(booking) if booking else json_error(404, "Booking not found")
+
+    async def bookings_edit_dates(self, request: web.Request) -> web.Response:
+        booking = self.store.bookings.get(int(request.match_info["id"]))
+        data = await self.read_json(request)
+        if booking is None:
+            return json_error(404, "Booking not found")
+        if not data.get("newCheckInDate") or not data.get("newCheckOutDate"):
+            return json_error(400, "New check-in and check-out dates are required")
+        if not self.store.is_available(data["newCheckInDate"], data["newCheckOutDate"], exclude_id=booking["id"]):
+            return json_error(400, "Selected dates are not available")
+        booking.update(self.store.pricing(data["newCheckInDate"], data["newCheckOutDate"], booking["guests"],
+                                          booking["hasPet"]))
+        booking["checkInDate"], booking["checkOutDate"] = data["newCheckInDate"][:10], data["newCheckOutDate"][:10]
+        booking["updatedAt"] = now_iso()
+        return web.json_response(booking)
+
+    # Stripe
+
+    def verify_stripe_signature(self, payload: bytes, header: str) -> Optional[str]:
+        """Error message stripe.webhooks.constructEvent would throw for this payload, or None if it verifies"""
+        parts = [part.split("=", 1) for part in header.split(",") if "=" in part]
+        timestamps = [value for key, value in parts if key == "t"]
+        signatures = [value for key, value in parts if key == "v1"]
+        if not timestamps or not signatures:
+            return "Unable to extract timestamp and signatures from header"
+        expected = hmac.new(self.stripe_webhook_secret.encode(), timestamps[0].encode() + b"." + payload,
+                            hashlib.sha256).hexdigest()
+        if not any(hmac.compare_digest(expected, signature) for signature in signatures):
+            return "No signatures found matching the expected signature for payload"
+        if abs(time.time() - int(timestamps[0])) > STRIPE_TOLERANCE:
+            return "Timestamp outside the tolerance zone"
+        return None
+
+    async def stripe_webhook(self, request: web.Request) -> web.Response:
+        """Like the server: verify, confirm the booking on a full_payment success, acknowledge everything else.
+        No event-id deduplication, so a redelivered success confirms the booking again."""
+        payload = await request.read()
+        error = self.verify_stripe_signature(payload, request.headers.get("Stripe-Signature", ""))
+        if error:
+            return web.Response(status=400, text=f"Webhook Error: {error}")
+        event = json.loads(payload)
+        if event.get("type") == "payment_intent.succeeded":
+            metadata = event["data"]["object"].get("metadata", {})
+            booking = self.store.bookings.get(int(metadata.get("bookingId") or 0))
+            if metadata.get("type") == "full_payment" and booking:
+                booking.update(status="confirmed", paymentStatus="paid", updatedAt=now_iso())
+        return web.json_response({"received": True})
+
+    # Images
+
+    async def hero_images_list(self, request: web.Request) -> web.Response:
+        return web.json_response(sorted(self.store.hero_images.values(), key=lambda image: image["displayOrder"]))
+
+    async def hero_images_upload(self, request: web.Request) -> web.Response:
+        """Read the multipart body part by part like multer, counting the image bytes instead of writing them"""
+        fields, size = {}, None
+        reader = await request.multipart()
+        async for part in reader:
+            if part.name != "image":
+                fields[part.name] = await part.text()
+                continue
+            if not part.headers.get("Content-Type", "").startswith("image/"):
+                return json_error(500, "Only image files are allowed")
+            size = 0
+            while True:
+                chunk = await part.read_chunk(65536)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    return json_error(500, "File too large")
+        if size is None:
+            return json_error(400, "No image file uploaded")
+        if not fields.get("title") or not fields.get("alt") or not fields.get("position"):
+            return json_error(400, "Title, alt text, and position are required")
+        image = {
+            "id": self.store.next_image_id,
+            "url": f"/uploads/{''.join(random.choices(string.hexdigits.lower(), k=32))}.jpg",
+            "title": fields["title"],
+            "alt": fields["alt"],
+            "position": fields["position"],
+            "isActive": fields.get("isActive") == "true",
+            "displayOrder": int(fields.get("displayOrder") or 0),
+            "createdAt": now_iso(),
+            "updatedAt": now_iso()
+        }
+        self.store.next_image_id += 1
+        self.store.hero_images[image["id"]] = image
+        return web.json_response(image)
+
+    async def hero_images_reorder(self, request: web.Request) -> web.Response:
+        updates = (await self.read_json(request)).get("updates")
+        if not isinstance(updates, list):
+            return json_error(400, "Updates must be an array")
+        for update in updates:
+            image = self.store.hero_images.get(update.get("id"))
+            if image and isinstance(update.get("displayOrder"), int):
+                image.update(displayOrder=update["displayOrder"], updatedAt=now_iso())
+        return web.json_response({"message": "Image order updated successfully"})
+
+    async def hero_images_delete(self, request: web.Request) -> web.Response:
+        self.store.hero_images.pop(int(request.match_info["id"]), None)
+        return web.json_response({"message": "Hero image deleted successfully"})
+
+    async def property_images_list(self, request: web.Request) -> web.Response:
+        return web.json_response(sorted(self.store.property_images.values(), key=lambda image: image["displayOrder"]))
+
+    async def property_images_create(self, request: web.Request) -> web.Response:
+        data = await self.read_json(request)
+        if not data.get("url"):
+            return json_error(400, "url: Required")
+        image = {"id": self.store.next_image_id, "url": data["url"], "alt": data.get("alt"),
+                 "isPrimary": bool(data.get("isPrimary")), "displayOrder": int(data.get("displayOrder") or 0),
+                 "createdAt": now_iso()}
+        self.store.next_image_id += 1
+        self.store.property_images[image["id"]] = image
+        return web.json_response(image)
+
+    async def property_images_delete(self, request: web.Request) -> web.Response:
+        self.store.property_images.pop(int(request.match_info["id"]), None)
+        return web.json_response({"success": True})
+
+    # Auth
+
+    async def password_hash(self, password: str, salt: bytes) -> bytes:
+        """Stand-in for bcrypt: a CPU-bound hash on a 4-thread pool, so concurrent logins queue like on libuv"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self.hash_pool, hashlib.pbkdf2_hmac, "sha256", password.encode(), salt, self.hash_iterations)
+
+    async def check_password(self, email: str, password: str) -> Optional[Dict]:
+        user = self.store.users.get(email)
+        if user is None:
+            return None
+        return user if hmac.compare_digest(await self.password_hash(password, user["salt"]), user["hash"]) else None
+
+    def session(self, request: web.Request) -> tuple:
+        sid = request.cookies.get("connect.sid")
+        return sid, self.store.sessions.get(sid)
+
+    def start_session(self, response: web.Response, data: Dict) -> web.Response:
+        sid = "".join(random.choices(string.ascii_letters + string.digits, k=32))
+        self.store.sessions[sid] = data
+        response.set_cookie("connect.sid", sid, httponly=True, samesite="Lax")
+        return response
+
+    async def ensure_admin(self):
+        if ADMIN_ACCOUNT["email"] not in self.store.users:
+            salt = random.randbytes(16)
+            self.store.users[ADMIN_ACCOUNT["email"]] = {
+                "id": "admin-loadtest", "email": ADMIN_ACCOUNT["email"], "role": "admin", "salt": salt,
+                "hash": await self.password_hash(ADMIN_ACCOUNT["password"], salt),
+                "totpSecret": ADMIN_ACCOUNT["totpSecret"]}
+
+    async def auth_signup(self, request: web.Request) -> web.Response:
+        data = await self.read_json(request)
+        if not all(data.get(field) for field in ("firstName", "lastName", "email", "password")) \
+                or data["password"] != data.get("confirmPassword"):
+            return json_error(400, "Validation error")
+        if data["email"] in self.store.users:
+            return json_error(400, "User with this email already exists")
+        salt = random.randbytes(16)
+        user = {"id": f"local-{len(self.store.users) + 1}", "email": data["email"], "firstName": data["firstName"],
+                "lastName": data["lastName"], "role": "guest", "salt": salt,
+                "hash": await self.password_hash(data["password"], salt)}
+        self.store.users[data["email"]] = user
+        public = {key: value for key, value in user.items() if key not in ("salt", "hash")}
+        return self.start_session(web.json_response({"message": "Account created successfully", "user": public},
+                                                    status=201), {"userId": user["id"]})
+
+    async def auth_login(self, request: web.Request) -> web.Response:
+        data = await self.read_json(request)
+        user = await self.check_password(data.get("email", ""), data.get("password", ""))
+        if user is None or user["role"] == "admin":
+            return json_error(401, "Invalid email or password")
+        public = {key: value for key, value in user.items() if key not in ("salt", "hash")}
+        return self.start_session(web.json_response({"message": "Login successful", "user": public}),
+                                  {"userId": user["id"]})
+
+    async def auth_logout(self, request: web.Request) -> web.Response:
+        sid, _ = self.session(request)
+        self.store.sessions.pop(sid, None)
+        response = web.json_response({"message": "Logout successful", "cleared": True, "sessionCleared": True})
+        response.del_cookie("connect.sid")
+        return response
+
+    async def admin_login(self, request: web.Request) -> web.Response:
+        await self.ensure_admin()
+        data = await self.read_json(request)
+        if not data.get("email") or not data.get("password"):
+            return json_error(400, "Email and password are required")
+        user = await self.check_password(data["email"], data["password"])
+        if user is None:
+            return json_error(401, "Invalid credentials")
+        if user["role"] != "admin":
+            return json_error(403, "Admin access required")
+        return self.start_session(web.json_response({"success": True, "requiresTOTP": True,
+                                                     "message": "TOTP verification required"}),
+                                  {"adminUserId": user["email"], "pendingAdminLogin": True})
+
+    async def admin_verify_totp(self, request: web.Request) -> web.Response:
+        _, session = self.session(request)
+        if not session or not session.get("pendingAdminLogin"):
+            return json_error(403, "No pending admin login found")
+        code = (await self.read_json(request)).get("code")
+        if not code:
+            return json_error(400, "Verification code is required")
+        if code not in totp_codes(self.store.users[session["adminUserId"]]["totpSecret"]):
+            return json_error(400, "Invalid verification code")
+        session.update(adminAuthenticated=True, pendingAdminLogin=False)
+        return web.json_response({"success": True, "message": "Authentication successful"})
+
+    async def session_count(self, request: web.Request) -> web.Response:
+        """Mock-only: the session-store size, for --session-count-command"""
+        return web.Response(text=str(len(self.store.sessions)))
+
+    # WebSocket
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok", "timestamp": now_iso()})
+
+    async def ws_health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "healthy", "connections": 0, "chatConnections": self.hub.stats(),
+                                  "timestamp": now_iso()})
+
+    async def ws_chat(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        connection_id = self.hub.add(ws, request.query.get("userId"), request.query.get("isAdmin") == "true")
+        await ws.send_str(json.dumps({"type": "connected", "connectionId": connection_id, "timestamp": now_iso()}))
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    data = json.loads(message.data)
+                except ValueError:
+                    continue
+                if data.get("type") == "ping":
+                    await ws.send_str(json.dumps({"type": "pong", "timestamp": now_iso()}))
+                elif data.get("type") == "join_conversation":
+                    await ws.send_str(json.dumps({"type": "joined_conversation",
+                                                  "conversationId": data.get("conversationId"),
+                                                  "timestamp": now_iso()}))
+                elif data.get("type") == "typing":
+                    self.hub.typing(connection_id, data)
+        finally:
+            self.hub.remove(connection_id)
+        return ws
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="In-memory mock of the All'Arco API for the test harness")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=3000, help="Port to listen on")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Injected latency added to every /api request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter around --latency-ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of /api requests answered with a 500")
+    parser.add_argument("--pdf-kb", type=int, default=40, help="Approximate size of the confirmation PDF body")
+    parser.add_argument("--stripe-webhook-secret", default="whsec_loadtest",
+                        help="Secret /api/webhooks/stripe verifies Stripe-Signature against")
+    parser.add_argument("--stall-every", type=float, default=0.0,
+                        help="Every this many seconds, hold all /api requests for --stall-ms (a server pause)")
+    parser.add_argument("--stall-ms", type=float, default=0.0, help="Length of each injected stall")
+    parser.add_argument("--hash-iterations", type=int, default=100_000,
+                        help="PBKDF2 rounds standing in for bcrypt on signup and login")
+    parser.add_argument("--seed", type=int, help="Seed for the latency/error injection")
+    return parser.parse_args(argv)
+
+
+def main():
+    """Run the mock server until interrupted"""
+    args = parse_args()
+    server = MockServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                        pdf_kb=args.pdf_kb, stripe_webhook_secret=args.stripe_webhook_secret,
+                        stall_every=args.stall_every, stall_ms=args.stall_ms, hash_iterations=args.hash_iterations,
+                        seed=args.seed)
+    print(f"🧪 Mock server on http://{args.host}:{args.port} "
+          f"(latency {args.latency_ms:g}±{args.jitter_ms:g}ms, error rate {args.error_rate:.1%})")
+    try:
+        web.run_app(server.build_app(), host=args.host, port=args.port, print=None)
+    except KeyboardInterrupt:
+        pass
+    print(f"\n🧪 Served {server.requests} API requests ({server.injected_errors} injected errors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3259,6 +3259,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
     res.json({ 
       status: 'healthy',
       connections: adminConnections?.size || 0,
+      chatConnections: WebSocketManager.getConnectionStats(),
       timestamp: new Date().toISOString()
     });
   });
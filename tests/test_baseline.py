@@ -0,0 +1,47 @@
+from backend_test import compare_to_baseline
+
+
+def summary(throughput, **endpoints):
+    return {"throughput": throughput,
+            "endpoints": {key.replace("_", " "): {"p95_ms": p95, "throughput": rate}
+                          for key, (p95, rate) in endpoints.items()}}
+
+
+def test_no_regressions_within_tolerance(capsys):
+    baseline = summary(100.0, GET_chat=(10.0, 50.0))
+    current = summary(95.0, GET_chat=(10.9, 46.0))
+    assert compare_to_baseline(current, baseline, 0.1) == []
+    assert "GET chat" in capsys.readouterr().out
+
+
+def test_p95_growth_beyond_tolerance_regresses():
+    regressions = compare_to_baseline(summary(100.0, GET_chat=(12.0, 50.0)),
+                                      summary(100.0, GET_chat=(10.0, 50.0)), 0.1)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("GET chat: p95 10.0ms -> 12.0ms")
+
+
+def test_throughput_drop_regresses_per_route_and_overall():
+    regressions = compare_to_baseline(summary(70.0, GET_chat=(10.0, 35.0)),
+                                      summary(100.0, GET_chat=(10.0, 50.0)), 0.1)
+    assert any(r.startswith("GET chat: throughput 50.0 -> 35.0") for r in regressions)
+    assert any(r.startswith("overall throughput 100.0 -> 70.0") for r in regressions)
+
+
+def test_improvements_do_not_regress():
+    assert compare_to_baseline(summary(200.0, GET_chat=(5.0, 100.0)),
+                               summary(100.0, GET_chat=(10.0, 50.0)), 0.1) == []
+
+
+def test_routes_only_on_one_side_are_listed_not_compared(capsys):
+    regressions = compare_to_baseline(summary(100.0, POST_new=(900.0, 1.0)),
+                                      summary(100.0, GET_old=(1.0, 100.0)), 0.1)
+    out = capsys.readouterr().out
+    assert regressions == []
+    assert "(only in this run)" in out
+    assert "(only in baseline)" in out
+
+
+def test_zero_baseline_values_do_not_divide_by_zero():
+    assert compare_to_baseline(summary(None, GET_chat=(1.0, None)),
+                               summary(0.0, GET_chat=(0.0, 0.0)), 0.1) == []
@@ -0,0 +1,56 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from backend_test import BookingRace
+
+BOOKINGS = [
+    {"id": 1, "status": "confirmed", "bookingSource": "direct",
+     "checkInDate": "2032-06-02", "checkOutDate": "2032-06-04"},
+    {"id": 2, "status": "checked_in", "bookingSource": "direct",
+     "checkInDate": "2032-06-05", "checkOutDate": "2032-06-07"},
+    {"id": 3, "status": "pending", "bookingSource": "blocked",
+     "checkInDate": "2032-06-08", "checkOutDate": "2032-06-09"},
+]
+
+
+def verify(bookings, dates):
+    async def calendar(request):
+        return web.json_response(bookings if request.match_info["month"] == "6" else [])
+
+    async def blocked_dates(request):
+        return web.json_response(dates)
+
+    async def scenario():
+        app = web.Application()
+        app.router.add_get("/api/bookings/calendar/{year}/{month}", calendar)
+        app.router.add_get("/api/bookings/dates", blocked_dates)
+        async with TestServer(app) as server:
+            race = BookingRace(str(server.make_url("")).rstrip("/"), start_date="2032-06-01", window_days=10)
+            await race.client.start()
+            try:
+                return await race.verify()
+            finally:
+                await race.client.close()
+
+    return asyncio.run(scenario())
+
+
+def test_only_confirmed_nights_must_appear_in_blocked_dates():
+    # /bookings/dates expands confirmed bookings only, so checked-in stays and blocks are not "missing"
+    assert verify(BOOKINGS, ["2032-06-02", "2032-06-03"]) == ([], [], [])
+
+
+def test_confirmed_nights_absent_from_blocked_dates_are_missing():
+    assert verify(BOOKINGS, ["2032-06-02"]) == ([], [], ["2032-06-03"])
+
+
+def test_checked_in_and_blocked_stays_still_count_for_double_bookings():
+    overlapping = BOOKINGS + [{"id": 4, "status": "confirmed", "bookingSource": "direct",
+                               "checkInDate": "2032-06-06", "checkOutDate": "2032-06-09"}]
+    overlaps, double_nights, missing = verify(overlapping, ["2032-06-02", "2032-06-03", "2032-06-06",
+                                                            "2032-06-07", "2032-06-08"])
+    assert [(a["id"], b["id"]) for a, b in overlaps] == [(2, 4), (4, 3)]
+    assert double_nights == ["2032-06-06", "2032-06-08"]
+    assert missing == []
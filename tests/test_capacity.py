@@ -0,0 +1,25 @@
+from backend_test import latency_knee
+
+
+def test_knee_is_where_latency_starts_to_climb():
+    points = [(10, 20), (20, 21), (30, 22), (40, 24), (50, 80), (60, 200)]
+    assert latency_knee(points) == (40, 24)
+
+
+def test_points_are_sorted_by_rate_first():
+    points = [(60, 200), (10, 20), (40, 24), (30, 22), (50, 80), (20, 21)]
+    assert latency_knee(points) == (40, 24)
+
+
+def test_linear_curve_has_no_knee():
+    assert latency_knee([(10, 10), (20, 20), (30, 30), (40, 40)]) is None
+
+
+def test_curve_bending_the_wrong_way_has_no_knee():
+    assert latency_knee([(10, 10), (20, 80), (30, 95), (40, 100)]) is None
+
+
+def test_degenerate_inputs():
+    assert latency_knee([(10, 10), (20, 50)]) is None
+    assert latency_knee([(10, 50), (20, 40), (30, 30)]) is None
+    assert latency_knee([(10, 10), (10, 20), (10, 30)]) is None
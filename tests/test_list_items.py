@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+pytest.importorskip("ijson")
+
+from backend_test import count_json_items
+
+
+def test_counts_items_and_keeps_top_level_scalars():
+    body = json.dumps({"success": True, "total": 3, "conversations": [{"id": 1, "tags": ["a"]}, {"id": 2}, {"id": 3}],
+                       "meta": {"page": 1}}).encode()
+    fields, count = count_json_items(body, "conversations")
+    assert count == 3
+    assert fields == {"success": True, "total": 3}
+
+
+def test_counts_scalar_and_nested_array_items():
+    assert count_json_items(b'{"ids": [1, "two", null, false, [3, 4]]}', "ids")[1] == 5
+
+
+def test_empty_and_missing_arrays():
+    assert count_json_items(b'{"success": true, "conversations": []}', "conversations") == ({"success": True}, 0)
+    assert count_json_items(b'{"success": false, "message": "Unauthorized"}', "conversations") == (
+        {"success": False, "message": "Unauthorized"}, None)
+
+
+def test_invalid_json_yields_nothing():
+    assert count_json_items(b'<html>Bad gateway</html>', "conversations") == ({}, None)
+    assert count_json_items(b'{"conversations": [1, 2', "conversations") == ({}, None)
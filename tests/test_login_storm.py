@@ -0,0 +1,25 @@
+import asyncio
+
+from aiohttp.test_utils import TestServer
+
+from backend_test import LoginStorm
+from mock_server import MockServer
+
+
+def test_signup_sessions_are_logged_out():
+    mock = MockServer(hash_iterations=1000)
+
+    async def scenario():
+        async with TestServer(mock.build_app()) as server:
+            storm = LoginStorm(str(server.make_url("")).rstrip("/"), accounts=6)
+            await storm.client.start()
+            try:
+                await storm.create_accounts()
+            finally:
+                await storm.client.close()
+        return storm
+
+    storm = asyncio.run(scenario())
+    assert storm.created == 6
+    assert not storm.failures
+    assert len(mock.store.sessions) == 0
@@ -0,0 +1,79 @@
+import math
+import random
+
+from backend_test import Histogram, route_template
+
+
+def test_small_values_get_exact_buckets():
+    histogram = Histogram()
+    for value in range(2 * Histogram.SUB_BUCKETS):
+        assert histogram._index(value) == value
+
+
+def test_bucket_index_is_monotonic_and_bounds_the_value():
+    histogram = Histogram()
+    previous = -1
+    for value in list(range(5000)) + [10 ** 6, 10 ** 9, (1 << Histogram.MAX_BITS) - 1]:
+        index = histogram._index(value)
+        assert index >= previous
+        assert index < len(histogram.counts)
+        assert value <= histogram._upper_bound(index) <= value * (1 + 1 / Histogram.SUB_BUCKETS)
+        previous = index
+
+
+def test_percentile_within_bucket_precision():
+    rng = random.Random(7)
+    values = sorted(rng.randint(100, 2_000_000) for _ in range(10000))
+    histogram = Histogram()
+    for value in values:
+        histogram.record(value)
+    for percent in (50, 90, 99, 99.9):
+        exact = values[math.ceil(len(values) * percent / 100) - 1]
+        assert exact <= histogram.percentile(percent) <= exact * (1 + 1 / Histogram.SUB_BUCKETS)
+    assert histogram.percentile(100) == values[-1] == histogram.max
+
+
+def test_percentile_of_empty_histogram_is_zero():
+    assert Histogram().percentile(99) == 0
+
+
+def test_record_clamps_out_of_range_values():
+    histogram = Histogram()
+    histogram.record(-5)
+    histogram.record(1 << 50)
+    assert histogram.total == 2
+    assert histogram.percentile(1) == 0
+    assert histogram.max == (1 << Histogram.MAX_BITS) - 1
+
+
+def test_merge_sparse_matches_recording_everything_in_one_histogram():
+    first, second, combined = Histogram(), Histogram(), Histogram()
+    for value in range(0, 100000, 7):
+        first.record(value)
+        combined.record(value)
+    for value in range(50, 3000000, 997):
+        second.record(value)
+        combined.record(value)
+
+    merged = Histogram()
+    merged.merge_sparse(first.to_sparse())
+    merged.merge_sparse(second.to_sparse())
+    assert merged.counts == combined.counts
+    assert merged.total == combined.total
+    assert merged.max == combined.max
+    assert merged.percentile(95) == combined.percentile(95)
+
+
+def test_route_template_collapses_numeric_ids():
+    assert route_template("/chat/conversation/42") == "/chat/conversation/:id"
+    assert route_template("/chat/admin/conversation/7/status") == "/chat/admin/conversation/:id/status"
+    assert route_template("/chat/unread-count") == "/chat/unread-count"
+
+
+def test_route_template_drops_query_string():
+    assert route_template("/chat/conversation/42?limit=50") == "/chat/conversation/:id"
+
+
+def test_route_template_uses_named_express_parameters():
+    assert route_template("/bookings/calendar/2034/6") == "/bookings/calendar/:year/:month"
+    assert route_template("/bookings/confirmation/ARCO123456") == "/bookings/confirmation/:code"
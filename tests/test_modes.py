@@ -0,0 +1,166 @@
+"""End-to-end runs of each load mode against the in-process mock server, with tiny parameters"""
+import asyncio
+import json
+import re
+
+import pytest
+from aiohttp.test_utils import TestServer
+
+from backend_test import ResultsExport, parse_args, selected_mode
+from mock_server import MockServer
+
+
+def run_mode(*argv, **mock_options):
+    """Start the mode `argv` selects the way main() does, against a fresh mock, and return its result"""
+    async def scenario():
+        mock = MockServer(hash_iterations=mock_options.pop("hash_iterations", 1000), **mock_options)
+        async with TestServer(mock.build_app()) as server:
+            args = parse_args(["--base-url", str(server.make_url("")).rstrip("/"), *argv])
+            _, _, _, start = selected_mode(args)
+            # starters may block (multi-process modes), so keep the loop free to serve them
+            outcome = await asyncio.get_running_loop().run_in_executor(
+                None, start, args, None, ResultsExport.from_options(vars(args)), None)
+            return await outcome if asyncio.iscoroutine(outcome) else outcome
+
+    return asyncio.run(scenario())
+
+
+@pytest.fixture
+def cookie_file(tmp_path):
+    path = tmp_path / "admin_cookies.txt"
+    path.write_text("# Netscape HTTP Cookie File\n"
+                    "127.0.0.1\tFALSE\t/\tFALSE\t0\tconnect.sid\ts%3Atest-session\n")
+    return str(path)
+
+
+@pytest.fixture
+def scenario_file(tmp_path):
+    """A two-journey mix without think times, so every session finishes within the run"""
+    path = tmp_path / "scenarios.json"
+    path.write_text(json.dumps({"scenarios": [
+        {"name": "browse", "weight": 2, "steps": [{"path": "/pricing"}, {"path": "/bookings/dates"}]},
+        {"name": "chat", "steps": [
+            {"method": "POST", "path": "/chat/start", "json": {"message": "Hi", "guestName": "Load {session}",
+                                                              "guestEmail": "{email}"},
+             "save": {"conversationId": "conversationId"}},
+            {"method": "POST", "path": "/chat/send", "json": {"conversationId": "{conversationId}", "content": "Ok"}}
+        ]}
+    ]}))
+    return str(path)
+
+
+def test_load(tmp_path):
+    summary = tmp_path / "summary.json"
+    assert run_mode("--load", "--users", "3", "--duration", "1", "--summary", str(summary))
+    data = json.loads(summary.read_text())
+    assert data["requests"] > 0 and data["errors"] == 0
+    assert data["checks"]["Chat Start (Guest)"]["failed"] == 0
+
+
+def test_load_across_processes():
+    assert run_mode("--load", "--users", "2", "--duration", "1", "--processes", "2")
+
+
+def test_scenarios(scenario_file):
+    assert run_mode("--scenarios", "--scenario-file", scenario_file, "--rate", "20", "--duration", "1")
+
+
+def test_booking_race():
+    assert run_mode("--booking-race", "--race-requests", "10", "--race-edits", "2")
+
+
+def test_booking_race_across_processes():
+    assert run_mode("--booking-race", "--race-requests", "10", "--race-edits", "2", "--processes", "2")
+
+
+def test_webhook_storm():
+    assert run_mode("--webhook-storm", "--stripe-webhook-secret", "whsec_loadtest", "--webhook-bookings", "5",
+                    "--webhook-rate", "100")
+
+
+def test_webhook_storm_with_wrong_secret_fails():
+    assert not run_mode("--webhook-storm", "--stripe-webhook-secret", "whsec_wrong", "--webhook-bookings", "3",
+                        "--webhook-rate", "100")
+
+
+def test_login_storm():
+    assert run_mode("--login-storm", "--login-accounts", "5", "--login-concurrency", "1,2",
+                    "--login-step-duration", "0.5")
+
+
+def test_ws_storm():
+    assert run_mode("--ws-storm", "--ws-clients", "20", "--ws-storm-rates", "20", "--duration", "1")
+
+
+def test_pdf_bench():
+    assert run_mode("--pdf-bench", "--concurrency", "2", "--duration", "1", pdf_kb=4)
+
+
+def test_seed_data(tmp_path):
+    state = tmp_path / "seed_state.json"
+    assert run_mode("--seed-data", "--seed-bookings", "20", "--seed-conversations", "5", "--seed-messages", "2",
+                    "--seed-state", str(state))
+
+
+def test_calendar_bench():
+    assert run_mode("--calendar-bench", "--calendar-months", "2", "--calendar-repeats", "1", "--concurrency", "2")
+
+
+def test_pricing_matrix():
+    assert run_mode("--pricing-matrix", "--pricing-repeats", "1", "--concurrency", "2")
+
+
+def test_chat_bench():
+    assert run_mode("--chat-bench", "--chat-conversations", "10", "--chat-writers", "2", "--chat-readers", "2",
+                    "--duration", "1")
+
+
+def test_chat_bench_rate_is_open_loop(capsys):
+    # 50ms per send: awaiting each one inline would cap the stream at 20 msg/s
+    assert run_mode("--chat-bench", "--chat-conversations", "5", "--chat-readers", "1", "--chat-rate", "100",
+                    "--duration", "1", latency_ms=50)
+    sent = re.search(r"Messages: (\d+) sent", capsys.readouterr().out)
+    assert int(sent.group(1)) >= 80
+
+
+def test_open_loop(tmp_path):
+    summary = tmp_path / "summary.json"
+    assert run_mode("--open-loop", "--open-loop-rate", "20", "--open-loop-duration", "1", "--summary", str(summary))
+    assert json.loads(summary.read_text())["requests"] == 20
+
+
+def test_soak():
+    assert run_mode("--soak", "--users", "2", "--soak-ws-clients", "2", "--duration", "2", "--soak-window", "1")
+
+
+def test_find_capacity(scenario_file):
+    assert run_mode("--find-capacity", "--scenario-file", scenario_file, "--capacity-start", "5",
+                    "--capacity-max", "10", "--capacity-step-duration", "1")
+
+
+def test_connection_bench():
+    assert run_mode("--connection-bench", "--connection-repeats", "3", "--connection-endpoints", "/chat/unread-count")
+
+
+def test_list_bench():
+    pytest.importorskip("ijson")
+    assert run_mode("--list-bench", "--list-repeats", "1")
+
+
+def test_upload_bench(cookie_file):
+    assert run_mode("--upload-bench", "--cookies", cookie_file, "--upload-sizes", "20,100", "--upload-count", "2",
+                    "--upload-concurrency", "2")
+
+
+def test_replay_log(tmp_path):
+    log = tmp_path / "server.log"
+    log.write_text("10:00:00 AM [express] GET /api/chat/unread-count 200 in 2ms\n"
+                   "10:00:00 AM [express] POST /api/booking-lookup/find 404 in 3ms\n"
+                   "10:00:01 AM [express] GET /api/chat/unread-count 200 in 1ms\n")
+    assert run_mode("--replay-log", str(log), "--replay-speed", "0")
+
+
+def test_unsupported_shared_options_are_rejected(capsys):
+    with pytest.raises(SystemExit):
+        parse_args(["--chat-bench", "--records", "out.csv"])
+    assert "--records is not supported by --chat-bench" in capsys.readouterr().err
@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from backend_test import AsyncHttpClient, open_loop_schedule
+
+
+def test_constant_schedule_is_evenly_spaced():
+    schedule = open_loop_schedule(100, 3)
+    assert len(schedule) == 300
+    assert schedule[0] == 0.0
+    assert schedule[-1] == pytest.approx(2.99)
+    assert all(b - a == pytest.approx(0.01) for a, b in zip(schedule, schedule[1:]))
+
+
+@pytest.mark.parametrize("rate, duration, sends", [(10, 1, 10), (7, 2, 14), (3, 0.3, 1), (0.5, 10, 5)])
+def test_constant_schedule_has_rate_times_duration_sends(rate, duration, sends):
+    assert len(open_loop_schedule(rate, duration)) == sends
+
+
+def test_poisson_schedule_is_reproducible_and_near_the_rate():
+    schedule = open_loop_schedule(200, 20, poisson=True, seed=3)
+    assert schedule == open_loop_schedule(200, 20, poisson=True, seed=3)
+    assert schedule != open_loop_schedule(200, 20, poisson=True, seed=4)
+    assert list(schedule) == sorted(schedule)
+    assert schedule[-1] < 20
+    assert len(schedule) == pytest.approx(4000, rel=0.05)
+
+
+def test_intended_start_counts_towards_latency_but_not_ttfb():
+    async def health(request):
+        return web.json_response({"status": "ok"})
+
+    async def scenario():
+        app = web.Application()
+        app.router.add_get("/api/health", health)
+        async with TestServer(app) as server:
+            client = AsyncHttpClient(str(server.make_url("")).rstrip("/"), pool_size=1)
+            await client.start()
+            try:
+                await client.request("GET", "/health", intended=time.perf_counter() - 0.5)
+            finally:
+                await client.close()
+        return client.metrics.endpoints["GET /health"]
+
+    metrics = asyncio.run(scenario())
+    assert metrics.wall_us.max >= 500_000
+    assert metrics.ttfb_us.max < 250_000
@@ -0,0 +1,84 @@
+import asyncio
+import gzip
+
+import pytest
+from aiohttp.test_utils import TestServer
+
+from backend_test import LogReplay, parse_access_log
+from mock_server import MockServer
+
+
+def write_log(tmp_path, lines, name="server.log"):
+    path = tmp_path / name
+    text = "\n".join(lines) + "\n"
+    if name.endswith(".gz"):
+        with gzip.open(path, "wt") as f:
+            f.write(text)
+    else:
+        path.write_text(text)
+    return str(path)
+
+
+def test_parses_express_lines_and_skips_the_rest(tmp_path):
+    path = write_log(tmp_path, [
+        "🚀 About to start server on port 3000",
+        "8:53:17 PM [express] GET /api/pricing 200 in 12ms :: {\"total\":100}",
+        "Some unrelated console output",
+        "8:53:19 PM [express] POST /api/chat/start 201 in 500ms",
+        "8:53:19 PM [express] serving on port 3000",
+    ])
+    entries = list(parse_access_log(path))
+    assert [entry[1:] for entry in entries] == [("GET", "/api/pricing", 200, 12),
+                                                ("POST", "/api/chat/start", 201, 500)]
+    assert entries[0][0] == 0.0
+    assert entries[1][0] == pytest.approx(2 - 0.5 + 0.012)
+
+
+def test_offsets_never_run_backwards(tmp_path):
+    path = write_log(tmp_path, [
+        "10:00:00 AM [express] GET /api/a 200 in 1ms",
+        "10:00:01 AM [express] GET /api/slow 200 in 3000ms",
+        "10:00:01 AM [express] GET /api/b 200 in 2ms",
+    ])
+    offsets = [entry[0] for entry in parse_access_log(path)]
+    assert offsets == sorted(offsets)
+    assert offsets[1] == offsets[0]
+
+
+def test_midnight_rollover(tmp_path):
+    path = write_log(tmp_path, [
+        "11:59:59 PM [express] GET /api/a 200 in 0ms",
+        "12:00:01 AM [express] GET /api/b 200 in 0ms",
+    ])
+    assert [entry[0] for entry in parse_access_log(path)] == [0.0, 2.0]
+
+
+def test_concurrently_prefix_and_gzip(tmp_path):
+    path = write_log(tmp_path, [
+        "[0] 1:00:00 PM [express] DELETE /api/chat/admin/conversation/4 404 in 7ms",
+        "[0] 1:00:03 PM [express] GET /api/bookings/calendar/2034/6?x=1 200 in 0ms",
+    ], name="server.log.gz")
+    entries = list(parse_access_log(path))
+    assert entries[0][1:] == ("DELETE", "/api/chat/admin/conversation/4", 404, 7)
+    assert entries[1][2] == "/api/bookings/calendar/2034/6?x=1"
+    assert entries[1][0] == pytest.approx(3.007)
+
+
+def test_replay_waits_for_a_slot_instead_of_dropping_lines(tmp_path):
+    # one-second log resolution: every line shares a timestamp, so nothing yields between them
+    path = write_log(tmp_path, ["10:00:00 AM [express] GET /api/chat/unread-count 200 in 1ms"] * 60)
+
+    async def scenario():
+        async with TestServer(MockServer(latency_ms=2).build_app()) as server:
+            replay = LogReplay(str(server.make_url("")).rstrip("/"), path, speed=0, max_in_flight=5)
+            await replay.client.start()
+            try:
+                await replay.replay()
+            finally:
+                await replay.client.close()
+        return replay
+
+    replay = asyncio.run(scenario())
+    assert replay.sent == 60
+    assert not replay.skipped
+    assert replay.client.metrics.endpoints["GET /chat/unread-count"].count == 60
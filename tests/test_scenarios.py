@@ -0,0 +1,36 @@
+from backend_test import extract_path, render_template
+
+
+def test_bare_placeholder_keeps_the_variable_type():
+    assert render_template("{conversationId}", {"conversationId": 42}) == 42
+    assert render_template("{flags}", {"flags": [1, 2]}) == [1, 2]
+
+
+def test_embedded_placeholders_are_formatted_as_strings():
+    assert render_template("/chat/conversation/{id}/status", {"id": 7}) == "/chat/conversation/7/status"
+    assert render_template("{a}-{b}", {"a": 1, "b": "x"}) == "1-x"
+
+
+def test_unknown_placeholders_are_left_alone():
+    assert render_template("{missing}", {}) == "{missing}"
+    assert render_template("/x/{missing}/{id}", {"id": 3}) == "/x/{missing}/3"
+
+
+def test_lists_and_dicts_are_rendered_recursively():
+    body = {"conversationId": "{id}", "tags": ["{tag}", "fixed"], "nested": {"email": "{email}"}, "count": 3}
+    assert render_template(body, {"id": 5, "tag": "vip", "email": "a@b.c"}) == {
+        "conversationId": 5, "tags": ["vip", "fixed"], "nested": {"email": "a@b.c"}, "count": 3}
+
+
+def test_extract_path_follows_dicts_and_list_indexes():
+    data = {"booking": {"confirmationCode": "ARCO1", "guests": [{"name": "Ada"}, {"name": "Bo"}]}}
+    assert extract_path(data, "booking.confirmationCode") == "ARCO1"
+    assert extract_path(data, "booking.guests.1.name") == "Bo"
+
+
+def test_extract_path_returns_none_for_missing_parts():
+    data = {"booking": {"guests": [{"name": "Ada"}]}}
+    assert extract_path(data, "booking.missing") is None
+    assert extract_path(data, "booking.guests.5.name") is None
+    assert extract_path(data, "booking.guests.name") is None
+    assert extract_path("not json", "anything") is None
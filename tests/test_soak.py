@@ -0,0 +1,37 @@
+import pytest
+
+from backend_test import rising_trend
+
+
+def test_steady_climb_is_a_trend_with_its_slope():
+    slope, rising = rising_trend([100, 102, 104, 106, 108, 110, 112])
+    assert slope == pytest.approx(2.0)
+    assert rising == 1.0
+
+
+def test_a_few_dips_still_count_as_rising():
+    values = [100, 105, 110, 108, 115, 120, 125, 130, 135, 140, 145]
+    slope, rising = rising_trend(values)
+    assert rising == pytest.approx(0.9)
+    assert slope > 0
+
+
+def test_flat_or_noisy_series_are_not_trends():
+    assert rising_trend([100, 100, 100, 100, 100]) is None
+    assert rising_trend([100, 120, 90, 130, 95, 125, 92]) is None
+
+
+def test_growth_below_min_growth_is_ignored():
+    assert rising_trend([100, 101, 102, 103, 104, 105]) is None
+    assert rising_trend([100, 101, 102, 103, 104, 105], min_growth=0.01) is not None
+
+
+def test_too_few_values_or_missing_samples():
+    assert rising_trend([1, 2, 3]) is None
+    assert rising_trend([1, None, 2, None, 3]) is None
+    assert rising_trend([10, None, 20, 30, None, 40]) is not None
+
+
+def test_series_starting_at_zero_trends_on_any_growth():
+    slope, _ = rising_trend([0, 1, 2, 3, 4])
+    assert slope == pytest.approx(1.0)
@@ -0,0 +1,29 @@
+from backend_test import totp_code
+
+# RFC 6238 appendix B, SHA-1 secret "12345678901234567890"
+RFC_SECRET = "GEZDGNBVGY3TQOJQGEZDGNBVGY3TQOJQ"
+
+
+def test_rfc6238_vectors():
+    assert totp_code(RFC_SECRET, at=59, digits=8) == "94287082"
+    assert totp_code(RFC_SECRET, at=1111111109, digits=8) == "07081804"
+    assert totp_code(RFC_SECRET, at=1234567890, digits=8) == "89005924"
+
+
+def test_default_is_six_digits_with_leading_zeros():
+    assert totp_code(RFC_SECRET, at=1111111109) == "081804"
+
+
+def test_code_is_stable_within_a_step():
+    assert totp_code(RFC_SECRET, at=1111111080) == totp_code(RFC_SECRET, at=1111111109)
+    assert totp_code(RFC_SECRET, at=1111111109) != totp_code(RFC_SECRET, at=1111111110)
+
+
+def test_secret_spacing_and_case_are_ignored():
+    spaced = "gezd gnbv gy3t qojq gezd gnbv gy3t qojq"
+    assert totp_code(spaced, at=59) == totp_code(RFC_SECRET, at=59)
+
+
+def test_unpadded_secret_is_accepted():
+    # 26 base32 characters need six '=' of padding that authenticator apps leave out
+    assert len(totp_code("GEZDGNBVGY3TQOJQGEZDGNBVGY", at=59)) == 6
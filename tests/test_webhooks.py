@@ -0,0 +1,29 @@
+import hashlib
+import hmac
+import time
+
+from backend_test import stripe_signature
+from mock_server import MockServer
+
+PAYLOAD = b'{"id":"evt_1","type":"checkout.session.completed"}'
+
+
+def test_header_format_and_digest():
+    header = stripe_signature("whsec_test", PAYLOAD, timestamp=1700000000)
+    expected = hmac.new(b"whsec_test", b"1700000000." + PAYLOAD, hashlib.sha256).hexdigest()
+    assert header == f"t=1700000000,v1={expected}"
+
+
+def test_defaults_to_the_current_time():
+    before = int(time.time())
+    timestamp = int(stripe_signature("whsec_test", PAYLOAD).split(",")[0][2:])
+    assert before <= timestamp <= int(time.time())
+
+
+def test_mock_server_accepts_fresh_signatures_only():
+    server = MockServer(stripe_webhook_secret="whsec_test")
+    assert server.verify_stripe_signature(PAYLOAD, stripe_signature("whsec_test", PAYLOAD)) is None
+    assert server.verify_stripe_signature(PAYLOAD, stripe_signature("whsec_other", PAYLOAD)) is not None
+    assert server.verify_stripe_signature(PAYLOAD + b" ", stripe_signature("whsec_test", PAYLOAD)) is not None
+    stale = stripe_signature("whsec_test", PAYLOAD, timestamp=int(time.time()) - 3600)
+    assert server.verify_stripe_signature(PAYLOAD, stale) == "Timestamp outside the tolerance zone"